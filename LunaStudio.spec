@@ -6,7 +6,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('config', 'config'), ('Assets', 'Assets'), ('src\\render\\model', 'src/render/model')],
-    hiddenimports=[],
+    # Optional imports (requirements-optional.txt), bundled when installed
+    hiddenimports=['sounddevice', 'websockets', 'websockets.asyncio.server', 'psutil'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,112 @@
+"""
+Animated background cost on the render thread: streamed versus inline.
+
+Opens a hidden GL window at the display size from config and plays a
+video or animated image for a few seconds at 60 fps in two ways:
+
+- streamed: AnimatedImage (decoder thread, frame ring or cache, PBO uploads)
+- inline: decode on the render thread and glTexSubImage2D straight from
+  client memory, the simplest possible player
+
+Prints the render thread's Draw() cost (mean / p99 / max) for both and
+the AnimatedImage decode and upload statistics.
+
+Usage: python -m benchmarks.background_stream <file> [seconds]
+"""
+
+from src.render.image.animated import AnimatedImage, VideoSource, SequenceSource
+from src.render.image.animated import VIDEO_EXTENSIONS
+from src.render.image.image import Image
+from src.render.image.opengl_function import create_stream_texture
+from src.utils import Config
+from pathlib import Path
+import OpenGL.GL as GL
+import numpy as np
+import pygame, sys, time
+
+
+def _report(name: str, costs: list):
+    ms = np.asarray(costs) * 1000
+    print(
+        f"{name:8s} draw mean {ms.mean():6.3f} ms  "
+        f"p99 {np.percentile(ms, 99):6.3f} ms  max {ms.max():6.3f} ms"
+    )
+
+
+def _play(draw, seconds: float) -> list:
+    costs = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        draw()
+        GL.glFinish()
+        costs.append(time.perf_counter() - start)
+        pygame.display.flip()
+        time.sleep(max(0.0, 1 / 60 - (time.perf_counter() - start)))
+    return costs
+
+
+class InlineImage(Image):
+    """Decodes and uploads on the calling thread, without PBOs."""
+
+    def __init__(self, path: str, size: tuple):
+        self.size = size
+        self.path = path
+        super().__init__(path)
+
+    def _load_texture(self, imagePath: str, pixels: tuple = None) -> int:
+        width, height = self.size
+        video = Path(imagePath).suffix.lower() in VIDEO_EXTENSIONS
+        self.source = (VideoSource if video else SequenceSource)(imagePath, self.size)
+        self.frame = np.empty((height, width, 4), dtype=np.uint8)
+        self.due = 0.0
+        self.clock = None
+        return create_stream_texture(width, height, "inline")
+
+    def Draw(self) -> None:
+        now = time.perf_counter()
+        self.clock = self.clock or now
+        if now - self.clock >= self.due:
+            duration = self.source.read(self.frame)
+            if duration is None:
+                self.source.rewind()
+                duration = self.source.read(self.frame)
+            self.due += duration
+            GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
+            GL.glTexSubImage2D(
+                GL.GL_TEXTURE_2D,
+                0,
+                0,
+                0,
+                self.size[0],
+                self.size[1],
+                GL.GL_RGBA,
+                GL.GL_UNSIGNED_BYTE,
+                self.frame,
+            )
+            GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+        super().Draw()
+
+
+def main(path: str, seconds: float = 5.0):
+    settings = Config().user()
+    size = tuple(settings.get("display", (800, 900)))
+    pygame.init()
+    pygame.display.set_mode(size, pygame.OPENGL | pygame.DOUBLEBUF | pygame.HIDDEN)
+    try:
+        streamed = AnimatedImage(path, size, settings.get("AnimatedBackground", {}))
+        _report("streamed", _play(streamed.Draw, seconds))
+        print(f"  {streamed.stats()}")
+        streamed.release()
+
+        inline = InlineImage(path, size)
+        _report("inline", _play(inline.Draw, seconds))
+        inline.release()
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        raise SystemExit(__doc__)
+    main(sys.argv[1], float(sys.argv[2]) if len(sys.argv) > 2 else 5.0)
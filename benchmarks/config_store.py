@@ -0,0 +1,85 @@
+"""
+Write-behind config store versus synchronous read-merge-write.
+
+Several threads save settings in bursts (like calibration sliders or
+hotkey edits) against a copy of config/usercfg.json in a temp directory.
+Prints per-call latency for both approaches and the store's updates
+versus file writes, then checks that the file on disk parses and matches
+memory after flush.
+
+Usage: python -m benchmarks.config_store [updates threads]
+"""
+
+from src.utils.config import Config
+import numpy as np
+import json, os, shutil, sys, tempfile, threading, time
+
+
+def _sync_update(path, new_data, key, lock):
+    # The previous Config.update: re-read, merge, rewrite in place
+    with lock:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        data.setdefault(key, {}).update(new_data)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
+
+
+def _burst(update, updates, threads):
+    latencies = [[] for _ in range(threads)]
+
+    def worker(index):
+        for i in range(updates // threads):
+            start = time.perf_counter()
+            update({f"slider{index}": i}, "calibration")
+            latencies[index].append(time.perf_counter() - start)
+            if i % 50 == 49:
+                time.sleep(0.3)  # pause between bursts
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    us = np.concatenate([np.asarray(l) for l in latencies]) * 1e6
+    return time.perf_counter() - start, us
+
+
+def main(updates=2000, threads=4):
+    root = os.getcwd()
+    directory = tempfile.mkdtemp()
+    try:
+        os.makedirs(os.path.join(directory, "config"))
+        path = os.path.join(directory, "config", "usercfg.json")
+        shutil.copy(os.path.join(root, "config", "usercfg.json"), path)
+        os.chdir(directory)
+
+        lock = threading.Lock()
+        _, us = _burst(lambda d, k: _sync_update(path, d, k, lock), updates, threads)
+        print(
+            f"synchronous: mean {us.mean():8.1f} us  p99 {np.percentile(us, 99):8.1f} us"
+            f"  ({updates} writes)"
+        )
+
+        config = Config()
+        _, us = _burst(config.update, updates, threads)
+        config.flush()
+        print(
+            f"write-behind: mean {us.mean():7.1f} us  p99 {np.percentile(us, 99):8.1f} us"
+        )
+        stats = config.stats()["usercfg.json"]
+        print(f"store: {stats}")
+
+        with open(path, "r", encoding="utf-8") as file:
+            on_disk = json.load(file)
+        assert on_disk == config.recv(), "file on disk differs from memory"
+        assert not os.path.exists(path + ".tmp")
+        print("OK: file parses and matches memory")
+    finally:
+        os.chdir(root)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:3]])
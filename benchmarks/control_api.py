@@ -0,0 +1,142 @@
+"""
+Throughput of the WebSocket control API and its cost on the render loop.
+
+Starts a ControlServer on localhost and a 60 Hz stand-in render loop that
+runs the same mapping, apply_inputs and apply steps as
+ModelMixin._update_parameters. N clients then send InjectParameterData
+batches back to back, each waiting for its response as VTube Studio
+plugins do. The script prints server messages/sec and the render-side
+cost per frame, idle vs. under load.
+
+Needs the optional 'websockets' package.
+
+Usage: python -m benchmarks.control_api [clients seconds port]
+"""
+
+from src.render.control import ControlServer, API_NAME
+from src.render.module.mapping import MappingPipeline, DEFAULT_MODEL_MAPPINGS
+from src.render.module.param import Params
+import numpy as np
+import asyncio, json, threading, time, sys
+import websockets
+
+
+class _Model:
+    def __init__(self):
+        self.calls = 0
+
+    def SetParameterValue(self, pid, value, weight):
+        self.calls += 1
+
+    def AddParameterValue(self, pid, value):
+        self.calls += 1
+
+
+class _App:
+    running = True
+    frame_interval = 1 / 60
+    power_state = "active"
+    expressions = None
+    config_internal = {"ModelList": {}}
+
+    def __init__(self):
+        self.params = Params()
+        with open("config/parameter.json", "r", encoding="utf-8") as file:
+            data = json.load(file)
+        self.model_mapping = MappingPipeline(
+            data.get("MODEL_MAPPINGS", DEFAULT_MODEL_MAPPINGS), data
+        )
+
+
+def _batch(i: int) -> str:
+    t = i * 0.01
+    values = [
+        {"id": "AngleX", "value": 20 * np.sin(t)},
+        {"id": "AngleY", "value": 10 * np.cos(t)},
+        {"id": "MouthOpenY", "value": 0.5 + 0.5 * np.sin(3 * t), "weight": 0.8},
+        {"id": "EyeLOpen", "value": 1.0},
+        {"id": "EyeROpen", "value": 1.0},
+        {"id": "ParamCheek", "value": 1.0},
+        {"id": "ParamHairFront", "value": np.sin(t), "weight": 0.5},
+        {"id": "ParamBodyAngleX", "value": 2.0},
+    ]
+    return json.dumps(
+        {
+            "apiName": API_NAME,
+            "apiVersion": "1.0",
+            "requestID": str(i),
+            "messageType": "InjectParameterDataRequest",
+            "data": {"parameterValues": values},
+        }
+    )
+
+
+async def _client(url: str, until: float, counts: list, n: int) -> None:
+    async with websockets.connect(url) as socket:
+        i = 0
+        while time.perf_counter() < until:
+            await socket.send(_batch(i))
+            reply = json.loads(await socket.recv())
+            assert reply["messageType"] == "InjectParameterDataResponse", reply
+            i += 1
+        counts[n] = i
+
+
+def _render(app, control, model, until: float) -> list:
+    costs = []
+    mapping = app.model_mapping
+    frame = 0
+    start = time.perf_counter()
+    while time.perf_counter() < until:
+        t0 = time.perf_counter()
+        mapping.load_attrs(app.params)
+        control.apply_inputs(mapping, t0)
+        for param, value in zip(mapping.targets, mapping.evaluate().tolist()):
+            model.SetParameterValue(param, value, 1)
+        control.apply(model, t0)
+        costs.append(time.perf_counter() - t0)
+        frame += 1
+        time.sleep(max(0.0, start + frame / 60 - time.perf_counter()))
+    return costs
+
+
+def main(clients=12, seconds=5.0, port=8012):
+    app = _App()
+    control = ControlServer(app, {"port": port})
+    threading.Thread(target=control.run, daemon=True).start()
+    time.sleep(0.5)
+    model = _Model()
+
+    idle = _render(app, control, model, time.perf_counter() + 2.0)
+
+    counts = [0] * clients
+    until = time.perf_counter() + seconds
+
+    async def flood():
+        url = f"ws://127.0.0.1:{port}"
+        await asyncio.gather(*(_client(url, until, counts, n) for n in range(clients)))
+
+    flooder = threading.Thread(target=asyncio.run, args=(flood(),))
+    flooder.start()
+    loaded = _render(app, control, model, until)
+    flooder.join()
+    app.running = False
+
+    idle_us = np.asarray(idle) * 1e6
+    loaded_us = np.asarray(loaded) * 1e6
+    total = sum(counts)
+    print(
+        f"{clients} clients: {total} batches in {seconds:.1f} s -> {total / seconds:,.0f} msg/s"
+    )
+    print(f"server stats: {control.stats()}")
+    print(
+        f"render step: idle mean {idle_us.mean():.1f} us p95 {np.percentile(idle_us, 95):.1f} us | "
+        f"loaded mean {loaded_us.mean():.1f} us p95 {np.percentile(loaded_us, 95):.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    port = int(sys.argv[3]) if len(sys.argv) > 3 else 8012
+    main(clients, seconds, port)
@@ -0,0 +1,83 @@
+"""
+Compare the landmark-geometry and blendshape feature sources.
+
+Runs the face landmarker over a video file with blendshapes enabled and,
+for every detected frame, times both paths from landmarker result to
+mapped Params targets. Jitter is the standard deviation of frame-to-frame
+deltas of each output channel.
+
+Usage: python -m benchmarks.feature_source <video> [max_frames]
+"""
+
+from src.render.parameter import ParameterManager
+from src.render.recording import track_video
+from src.render.module.param import Params
+from src.utils import Config
+from types import SimpleNamespace
+import numpy as np
+import time, sys
+
+CHANNELS = (
+    "EyeLOpen",
+    "EyeROpen",
+    "MouthOpenY",
+    "MouthForm",
+    "AngleX",
+    "AngleY",
+    "AngleZ",
+    "EyeBallX",
+)
+
+
+def run(video_path: str, max_frames: int = 0):
+    app = SimpleNamespace(running=True)
+    data = Config().parameter()
+
+    landmark_path = ParameterManager(app)
+    landmark_path.compile_mappings({**data, "FEATURE_SOURCE": "landmarks"})
+    blendshape_path = ParameterManager(app)
+    blendshape_path.compile_mappings({**data, "FEATURE_SOURCE": "blendshapes"})
+    channels = [Params.PARAMETER_KEYS.index(k) for k in CHANNELS]
+
+    costs = {"landmarks": [], "blendshapes": []}
+    series = {"landmarks": [], "blendshapes": []}
+    frames = 0
+
+    for _, _, results in track_video(video_path, True, max_frames):
+        frames += 1
+        if not results.face_landmarks:
+            continue
+
+        out = Params()
+        start = time.perf_counter_ns()
+        values = landmark_path.process_tracking_values(results.face_landmarks[0], data)
+        landmark_path.update_params(out, values, data)
+        costs["landmarks"].append(time.perf_counter_ns() - start)
+        series["landmarks"].append(out.target[channels])
+
+        out = Params()
+        start = time.perf_counter_ns()
+        blendshape_path.process_blendshape_values(results)
+        blendshape_path.update_params(out)
+        costs["blendshapes"].append(time.perf_counter_ns() - start)
+        series["blendshapes"].append(out.target[channels])
+
+    print(f"frames with a face: {len(costs['landmarks'])} / {frames}")
+    for name in costs:
+        if not costs[name]:
+            continue
+        us = np.asarray(costs[name]) / 1000
+        jitter = np.std(np.diff(np.asarray(series[name]), axis=0), axis=0)
+        print(
+            f"{name:>12}: mean {us.mean():7.1f} us  p95 {np.percentile(us, 95):7.1f} us"
+        )
+        print(
+            "              jitter "
+            + "  ".join(f"{k}={j:.3f}" for k, j in zip(CHANNELS, jitter))
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    run(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 0)
@@ -0,0 +1,132 @@
+"""
+Frame-time jitter and GC pauses of the render-side parameter path.
+
+A 60 Hz loop runs the same per-frame steps as ModelMixin._update_parameters:
+Params.update_params, MODEL_MAPPINGS evaluation and one SetParameterValue
+per output on a stand-in model. A capture thread feeds it at 30 Hz. With
+--video the thread runs the real face landmarker over the file (looping),
+otherwise it produces a MediaPipe-sized result every frame (478 landmark
+objects). Every collection is timed through GCTuner.
+
+The run fails (exit status 1) when any GC pause exceeds --pause-ms. Compare
+with the interpreter defaults using --default-gc.
+
+Usage: python -m benchmarks.frame_jitter [--seconds 600] [--video clip.mp4]
+"""
+
+from src.render.module.mapping import MappingPipeline, DEFAULT_MODEL_MAPPINGS
+from src.render.module.param import Params
+from src.utils.gctune import GCTuner
+import numpy as np
+import argparse, gc, json, math, threading, time
+
+
+class _Model:
+    def SetParameterValue(self, pid, value, weight):
+        pass
+
+
+class _Landmark:
+    __slots__ = ("x", "y", "z", "visibility", "presence")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+        self.visibility = self.presence = 1.0
+
+
+def _synthetic(running):
+    start = time.perf_counter()
+    frame = 0
+    while running[0]:
+        t = time.perf_counter() - start
+        landmarks = [
+            _Landmark(0.5 + 0.1 * math.sin(t + i), 0.5, 0.0) for i in range(478)
+        ]
+        yield t, {
+            "face_landmarks": [landmarks],
+            "yaw": 25 * math.sin(2 * math.pi * 0.3 * t),
+        }
+        frame += 1
+        time.sleep(max(0.0, start + frame / 30 - time.perf_counter()))
+
+
+def _video(running, path):
+    from src.render.recording import track_video
+
+    start = time.perf_counter()
+    while running[0]:
+        for _, _, results in track_video(path, blendshapes=False):
+            if not running[0]:
+                return
+            yaw = 0.0
+            if results.face_landmarks:
+                yaw = (results.face_landmarks[0][1].x - 0.5) * 120
+            yield time.perf_counter() - start, {"yaw": yaw}
+
+
+def _capture(params, stream):
+    keys = ["AngleX"]
+    value = np.zeros(1)
+    for _, result in stream:
+        value[0] = result["yaw"]
+        params.set_targets(keys, value, timestamp=time.perf_counter())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=600.0)
+    parser.add_argument("--fps", type=float, default=60.0)
+    parser.add_argument("--video")
+    parser.add_argument("--pause-ms", type=float, default=2.0)
+    parser.add_argument("--default-gc", action="store_true")
+    args = parser.parse_args()
+
+    with open("config/parameter.json", "r", encoding="utf-8") as file:
+        data = json.load(file)
+    params = Params(predict=True)
+    mapping = MappingPipeline(data.get("MODEL_MAPPINGS", DEFAULT_MODEL_MAPPINGS), data)
+    values = memoryview(mapping.output)
+    model = _Model()
+
+    tuner = GCTuner({"enabled": not args.default_gc, "pause_ms": args.pause_ms})
+    running = [True]
+    stream = _video(running, args.video) if args.video else _synthetic(running)
+    capture = threading.Thread(target=_capture, args=(params, stream), daemon=True)
+    capture.start()
+    time.sleep(0.5)
+    tuner.freeze("startup")
+
+    frames = np.zeros(int(args.seconds * args.fps) + 1)
+    count = 0
+    interval = 1.0 / args.fps
+    start = time.perf_counter()
+    while count < len(frames):
+        t0 = time.perf_counter()
+        params.update_params(display_time=t0 + interval)
+        mapping.load_array(params.values, params.PARAMETER_KEYS)
+        mapping.evaluate()
+        for param, value in zip(mapping.targets, values):
+            model.SetParameterValue(param, value, 1)
+        frames[count] = time.perf_counter() - t0
+        count += 1
+        tuner.idle()
+        time.sleep(max(0.0, start + count * interval - time.perf_counter()))
+    running[0] = False
+
+    ms = frames * 1000
+    stats = tuner.stats()
+    print(f"GC {'defaults' if args.default_gc else 'tuned'}: {gc.get_threshold()}")
+    print(
+        f"{count} frames: work p50 {np.percentile(ms, 50):.3f} ms, "
+        f"p99 {np.percentile(ms, 99):.3f} ms, max {ms.max():.3f} ms"
+    )
+    print(f"collections: {stats}")
+    if tuner.long_pauses:
+        print(f"FAIL: {tuner.long_pauses} GC pauses above {args.pause_ms} ms")
+        return 1
+    print(f"OK: no GC pause above {args.pause_ms} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""
+Cost of the F3 performance HUD versus re-rendering its text with pygame.
+
+Opens a hidden GL window and draws, for the same simulated 60 fps frame
+times and parameter values:
+
+- the HUD: glyph atlas + one dynamic vertex buffer + one draw call
+- the naive overlay: pygame.font renders every row each frame and the
+  resulting surface is uploaded as a texture
+
+Prints per-frame CPU cost (mean / p99 / max, after glFinish) for both and
+whether the HUD stayed inside its "budget_ms".
+
+Usage: python -m benchmarks.hud_cost [frames budget_ms]
+"""
+
+from src.render.image.hud import Hud
+from src.render.image.opengl_function import create_texture, delete_texture
+from src.render.module.param import Params
+from types import SimpleNamespace
+import OpenGL.GL as GL
+import numpy as np
+import pygame, sys, time
+
+SIZE = (800, 900)
+
+
+def _app() -> SimpleNamespace:
+    return SimpleNamespace(
+        params=Params(),
+        Capture=SimpleNamespace(scheduler=None),
+        settings=SimpleNamespace(cap_fps=SimpleNamespace(enabled=True, value=60)),
+        frame_interval=1 / 60,
+        display_size=SIZE,
+    )
+
+
+def _report(name: str, costs: list, budget_ms: float = None):
+    ms = np.asarray(costs) * 1000
+    line = (
+        f"{name:6s} mean {ms.mean():6.3f} ms  p99 {np.percentile(ms, 99):6.3f} ms"
+        f"  max {ms.max():6.3f} ms"
+    )
+    if budget_ms is not None:
+        line += f"  over {budget_ms} ms: {(ms > budget_ms).sum()}/{len(ms)}"
+    print(line)
+
+
+def hud(frames: int, budget_ms: float) -> list:
+    app = _app()
+    overlay = Hud(app, {"budget_ms": budget_ms})
+    overlay.toggle()
+    costs, now = [], 0.0
+    for i in range(frames):
+        app.params.values[:] = np.sin(i / 30 + np.arange(len(app.params.values)))
+        now += 1 / 60
+        start = time.perf_counter()
+        overlay.draw(now)
+        GL.glFinish()
+        costs.append(time.perf_counter() - start)
+    overlay.release()
+    return costs
+
+
+def pygame_text(frames: int) -> list:
+    app = _app()
+    font = pygame.font.SysFont("consolas,dejavusansmono,couriernew,monospace", 15)
+    keys, values = app.params.PARAMETER_KEYS, app.params.values
+    costs = []
+    for i in range(frames):
+        values[:] = np.sin(i / 30 + np.arange(len(values)))
+        start = time.perf_counter()
+        surface = pygame.Surface((320, 340), pygame.SRCALPHA)
+        for row, (key, value) in enumerate(zip(keys, values)):
+            text = font.render(f"{key:<10}{value:7.2f}", True, (255, 255, 255))
+            surface.blit(text, (8, 6 + row * 17))
+        pixels = pygame.image.tobytes(surface, "RGBA", True)
+        texture = create_texture("overlay", (pixels, 320, 340))
+        GL.glFinish()
+        delete_texture(texture)
+        costs.append(time.perf_counter() - start)
+    return costs
+
+
+def main(frames: int = 2000, budget_ms: float = 0.5):
+    pygame.init()
+    pygame.display.set_mode(SIZE, pygame.OPENGL | pygame.DOUBLEBUF | pygame.HIDDEN)
+    try:
+        _report("hud", hud(frames, budget_ms), budget_ms)
+        _report("pygame", pygame_text(frames))
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.5,
+    )
@@ -0,0 +1,112 @@
+"""
+Face, pose and hand tracking: every model every frame versus scheduled.
+
+Decodes a video once, then feeds the same preprocessed frames through
+three setups with fresh landmarkers:
+
+- face only (today's default)
+- all models every frame
+- scheduled: face every frame, pose every 3rd, hands every 2nd, under
+  the "Inference" budget
+
+Prints inference ms per frame (mean / p95), each model's achieved rate
+at the video's frame rate, and how often pose found a body. Pose and
+hand models are read from src/render/model/ and skipped when missing.
+
+Usage: python -m benchmarks.inference_schedule <video> [max_frames budget_ms]
+"""
+
+from src.render.capture import BODY_MODELS
+from src.render.landmarker import LandmarkerManager
+from src.render.preprocess import FramePreprocessor
+from src.render.scheduler import InferenceScheduler
+from src.utils import resource_path
+from types import SimpleNamespace
+import mediapipe as mp
+import numpy as np
+import cv2, sys, time
+
+
+def _frames(video_path: str, max_frames: int):
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = []
+    while cap.isOpened() and len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames, fps
+
+
+def _landmarkers(rates: dict) -> dict:
+    manager = LandmarkerManager(SimpleNamespace(running=True))
+    options = manager.load_model_options(
+        resource_path("src/render/model/face_landmarker.task")
+    )
+    models = {"face": (manager.create_face_landmarker(options), rates["face"])}
+    for kind, file in BODY_MODELS.items():
+        if rates.get(kind):
+            path = resource_path(f"src/render/model/{file}")
+            landmarker = manager.create_body_landmarker(kind, path)
+            if landmarker:
+                models[kind] = (landmarker, rates[kind])
+    return models
+
+
+def run(frames, fps, rates: dict, budget_ms: float):
+    scheduler = InferenceScheduler(budget_ms)
+    for name, (landmarker, every) in _landmarkers(rates).items():
+        scheduler.add(name, landmarker, every)
+    preprocessor = FramePreprocessor("pixels")
+    per_frame, bodies = [], 0
+    for index, frame in enumerate(frames):
+        rgb = preprocessor.process(frame)
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        start = time.perf_counter()
+        fresh = scheduler.run(image, int(index * 1000 / fps))
+        per_frame.append((time.perf_counter() - start) * 1000)
+        if "pose" in fresh and scheduler.result("pose").pose_landmarks:
+            bodies += 1
+    scheduler.close()
+
+    ms = np.asarray(per_frame)
+    stats = scheduler.stats()
+    print(
+        f"  inference per frame: mean {ms.mean():6.2f} ms  "
+        f"p95 {np.percentile(ms, 95):6.2f} ms  "
+        f"over budget {stats['over_budget_frames']}/{stats['frames']}"
+    )
+    for model in scheduler.models:
+        rate = model.runs / len(frames) * fps
+        report = stats[model.name]
+        print(
+            f"  {model.name:6s} {rate:5.1f} Hz  {report['mean_ms']:6.2f} ms/run  "
+            f"deferred {report['deferred']}  forced {report['forced']}"
+        )
+    if rates.get("pose"):
+        print(f"  pose found a body in {bodies} runs")
+
+
+def main(video_path: str, max_frames: int = 300, budget_ms: float = 20.0):
+    frames, fps = _frames(video_path, max_frames)
+    print(f"{len(frames)} frames at {fps:.1f} fps")
+    setups = {
+        "face only": {"face": 1},
+        "every frame": {"face": 1, "pose": 1, "hands": 1},
+        "scheduled": {"face": 1, "pose": 3, "hands": 2},
+    }
+    for name, rates in setups.items():
+        print(f"{name}:")
+        run(frames, fps, rates, budget_ms if name == "scheduled" else 1e9)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        raise SystemExit(__doc__)
+    main(
+        sys.argv[1],
+        int(sys.argv[2]) if len(sys.argv) > 2 else 300,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 20.0,
+    )
@@ -0,0 +1,87 @@
+"""
+Steady-state RSS regression check for a reference model.
+
+Record a memory report on a fixed recording with the reference model loaded:
+
+    python main.py --memory --video reference.mp4
+
+then compare it against the stored baseline:
+
+    python -m benchmarks.memory_baseline [report] [--update] [--tolerance 0.10]
+
+The script exits with status 1 when steady-state RSS exceeds the baseline
+by more than the tolerance. --update stores the report as the new baseline;
+until then there is nothing to compare and the check passes with a notice.
+The check needs the reference model and recording, so it is a manual step
+before a release rather than part of the pytest suite.
+
+Usage: python -m benchmarks.memory_baseline [LunaStudio-memory.json]
+"""
+
+from pathlib import Path
+import argparse, json, sys
+
+BASELINE = Path(__file__).with_name("memory_baseline.json")
+
+
+def load_baseline(path: Path = BASELINE) -> dict:
+    """The stored baseline; steady_rss_mb is None until one is recorded."""
+    if not path.exists():
+        return {"steady_rss_mb": None, "tolerance": 0.10}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare(summary: dict, baseline: dict, tolerance: float = None) -> tuple:
+    """
+    :param summary: The "summary" block of a memory report.
+    :return: (ok, message). ok is None when no baseline is recorded yet.
+    """
+    steady = summary.get("steady_rss_mb")
+    if steady is None:
+        return False, "Report has no steady-state samples; run longer than the warm-up."
+    if baseline.get("steady_rss_mb") is None:
+        return None, f"No baseline recorded; rerun with --update to store {steady} MB."
+    tolerance = tolerance or baseline.get("tolerance", 0.10)
+    limit = baseline["steady_rss_mb"] * (1 + tolerance)
+    ok = steady <= limit
+    return ok, (
+        f"{'OK' if ok else 'REGRESSION'}: steady RSS {steady:.1f} MB, "
+        f"baseline {baseline['steady_rss_mb']:.1f} MB (limit {limit:.1f} MB), "
+        f"GPU textures {summary.get('gpu_texture_mb')} MB"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("report", nargs="?", default="LunaStudio-memory.json")
+    parser.add_argument("--update", action="store_true", help="store as new baseline")
+    parser.add_argument("--tolerance", type=float, default=None)
+    args = parser.parse_args()
+
+    with open(args.report, "r", encoding="utf-8") as file:
+        summary = json.load(file)["summary"]
+    baseline = load_baseline()
+
+    if args.update:
+        steady = summary.get("steady_rss_mb")
+        if steady is None:
+            print(compare(summary, baseline)[1])
+            return 1
+        baseline = {
+            "steady_rss_mb": steady,
+            "tolerance": args.tolerance or baseline.get("tolerance", 0.10),
+        }
+        with open(BASELINE, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=2)
+            file.write("\n")
+        print(f"Baseline stored: {baseline}")
+        return 0
+
+    ok, message = compare(summary, baseline, args.tolerance)
+    print(message)
+    return 0 if ok is not False else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
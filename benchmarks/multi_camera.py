@@ -0,0 +1,66 @@
+"""
+Scaling of multi-camera tracking with the number of tracker processes.
+
+Tracks the same video file with 1, 2, ... N MultiCapture sources, as
+fast as each process decodes (no real-time pacing, no looping), and
+prints for every N the aggregate frames/sec, the per-process frame rate
+and CPU use, and the scaling efficiency against one source (aggregate
+rate / (N x single-source rate); 100% is linear).
+
+Usage: python -m benchmarks.multi_camera <video> [max_sources] [--no-affinity]
+"""
+
+from src.render.multicam import MultiCapture, available_cores
+from src.render.module.param import Params
+from src.utils import Config
+import threading, sys, time
+
+
+def track(video: str, count: int, data: dict, affinity: bool) -> dict:
+    capture = MultiCapture(
+        [video] * count,
+        data,
+        {"realtime": False, "loop": False, "affinity": affinity},
+    )
+    capture.start()
+    fusion = threading.Thread(target=capture.run, args=(Params(),), daemon=True)
+    fusion.start()
+    try:
+        while capture.alive:
+            time.sleep(0.2)
+    finally:
+        capture.stop()
+        fusion.join()
+        capture.close()
+    return capture.stats()
+
+
+def main(video: str, max_sources: int = 0, affinity: bool = True):
+    data = Config().parameter()
+    max_sources = max_sources or max(1, len(available_cores()) - 1)
+    single = None
+    for count in range(1, max_sources + 1):
+        stats = track(video, count, data, affinity)
+        slots = [v for k, v in stats.items() if isinstance(v, dict) and "fps" in v]
+        total = sum(slot["fps"] for slot in slots)
+        single = single or total
+        print(
+            f"{count:2d} sources  {total:7.1f} frames/sec  "
+            f"efficiency {total / (count * single) * 100:5.1f}%  "
+            + "  ".join(
+                f"[{slot['fps']:.0f} fps {slot['cpu_pct']:.0f}% cpu "
+                f"cores {slot['cores']}]"
+                for slot in slots
+            )
+        )
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        raise SystemExit(__doc__)
+    main(
+        args[0],
+        int(args[1]) if len(args) > 1 else 0,
+        "--no-affinity" not in sys.argv,
+    )
@@ -0,0 +1,53 @@
+"""
+Offline video tracking: one pass versus segmented on a process pool.
+
+Tracks the same video with track_stream() (frame after frame, like
+--replay used to) and track_parallel() for each worker count, and
+prints wall time, frames/sec, speed relative to real time and the
+largest difference from the sequential stream. The difference should
+be small: it comes only from the warm-up at each segment boundary.
+
+Usage: python -m benchmarks.offline_tracking <video> [workers,...] [segment_s]
+"""
+
+from src.render.recording import track_stream, track_parallel
+from src.utils import Config
+import numpy as np
+import os, sys, time
+
+
+def main(video: str, workers: list, segment_seconds: float = 30.0):
+    data = Config().parameter()
+    start = time.perf_counter()
+    reference = track_stream(video, data)
+    elapsed = time.perf_counter() - start
+    frames = len(reference["t"])
+    duration = reference["t"][-1] if frames else 0.0
+    print(
+        f"sequential   {elapsed:7.1f} s  {frames / elapsed:7.0f} frames/sec  "
+        f"{duration / elapsed:5.1f}x real time"
+    )
+    for count in workers:
+        start = time.perf_counter()
+        stream = track_parallel(video, data, count, segment_seconds)[video]
+        elapsed = time.perf_counter() - start
+        diff = np.abs(stream["values"] - reference["values"]).max()
+        print(
+            f"{count:2d} workers   {elapsed:7.1f} s  {frames / elapsed:7.0f} frames/sec  "
+            f"{duration / elapsed:5.1f}x real time  max diff {diff:.4f}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        raise SystemExit(__doc__)
+    cores = os.cpu_count() or 1
+    main(
+        sys.argv[1],
+        (
+            [int(v) for v in sys.argv[2].split(",")]
+            if len(sys.argv) > 2
+            else sorted({1, max(1, cores // 2), cores})
+        ),
+        float(sys.argv[3]) if len(sys.argv) > 3 else 30.0,
+    )
@@ -0,0 +1,104 @@
+"""
+Replay a tracking stream through Params with and without extrapolation.
+
+Samples are released to the renderer after their inference delay, and a
+simulated render loop smooths and optionally extrapolates them to each
+frame's display time. The displayed AngleX curve is compared with the
+true motion. Lag is the time shift that best aligns the two.
+
+Usage: python -m benchmarks.prediction [video] [--render-fps 60]
+Without a video a synthetic head sway (30 fps, 35 ms inference) is used.
+"""
+
+from src.render.module.param import Params
+import numpy as np
+import argparse
+
+CHANNEL = "AngleX"
+
+
+def synthetic_stream(seconds: float = 20.0, fps: float = 30.0, delay: float = 0.035):
+    """Head sway of mixed frequencies with sensor noise."""
+    rng = np.random.default_rng(0)
+    t = np.arange(0.0, seconds, 1.0 / fps)
+    x = 18 * np.sin(2 * np.pi * 0.4 * t) + 8 * np.sin(2 * np.pi * 1.1 * t + 1.0)
+    x += rng.normal(0.0, 0.3, len(t))
+    return t, x, np.full(len(t), delay)
+
+
+def video_stream(video_path: str):
+    """AngleX samples tracked from a video file."""
+    from benchmarks.feature_source import track_video
+    from src.render.parameter import ParameterManager
+    from src.utils import Config
+    from types import SimpleNamespace
+
+    data = Config().parameter()
+    manager = ParameterManager(SimpleNamespace(running=True))
+    manager.compile_mappings({**data, "FEATURE_SOURCE": "landmarks"})
+    out = Params()
+    index = Params.PARAMETER_KEYS.index(CHANNEL)
+
+    times, values, delays = [], [], []
+    for timestamp, inference, results in track_video(video_path, False):
+        if not results.face_landmarks:
+            continue
+        values_dict = manager.process_tracking_values(results.face_landmarks[0], data)
+        manager.update_params(out, values_dict, data)
+        times.append(timestamp)
+        values.append(out.target[index])
+        delays.append(inference)
+    return np.asarray(times), np.asarray(values), np.asarray(delays)
+
+
+def replay(t, x, delay, predict: bool, render_fps: float):
+    """
+    Render the stream at `render_fps`.
+    :return: (display_times, displayed_values)
+    """
+    params = Params(predict=predict)
+    keys = [CHANNEL]
+    index = Params.PARAMETER_KEYS.index(CHANNEL)
+    available = t + delay
+    frame = 1.0 / render_fps
+
+    shown_t, shown_x = [], []
+    next_sample = 0
+    now = t[0]
+    while now < t[-1]:
+        while next_sample < len(t) and available[next_sample] <= now:
+            params.set_targets(keys, x[next_sample : next_sample + 1], t[next_sample])
+            next_sample += 1
+        display_time = now + frame
+        params.update_params(display_time=display_time)
+        shown_t.append(display_time)
+        shown_x.append(getattr(params, Params.PARAMETER_KEYS[index]))
+        now += frame
+    return np.asarray(shown_t), np.asarray(shown_x)
+
+
+def measure(t, x, shown_t, shown_x):
+    """Return (rms_error, lag_seconds) of the displayed curve vs truth."""
+    truth = np.interp(shown_t, t, x)
+    rms = float(np.sqrt(np.mean((shown_x - truth) ** 2)))
+    shifts = np.arange(0.0, 0.3, 0.001)
+    errors = [np.mean((shown_x - np.interp(shown_t - s, t, x)) ** 2) for s in shifts]
+    return rms, float(shifts[int(np.argmin(errors))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("video", nargs="?")
+    parser.add_argument("--render-fps", type=float, default=60.0)
+    args = parser.parse_args()
+
+    t, x, delay = video_stream(args.video) if args.video else synthetic_stream()
+    print(f"samples: {len(t)}  mean inference delay: {delay.mean() * 1000:.1f} ms")
+    for predict in (False, True):
+        rms, lag = measure(t, x, *replay(t, x, delay, predict, args.render_fps))
+        label = "prediction" if predict else "baseline"
+        print(f"{label:>10}: lag {lag * 1000:6.1f} ms  rms error {rms:6.3f}")
+
+
+if __name__ == "__main__":
+    main()
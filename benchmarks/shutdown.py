@@ -0,0 +1,102 @@
+"""
+Worker lifecycle: readiness latency, failure propagation, bounded shutdown.
+
+Runs the Supervisor with synthetic workers, no camera or window needed:
+
+- startup: a loader becomes ready after a random delay; compares how long
+  a consumer waiting on the ready event notices versus the previous
+  100 ms polling loop
+- failure: a worker raises; measures how long until every other worker
+  has seen the stop
+- shutdown: one worker ignores the stop; checks shutdown still returns
+  within the budget and names the late worker
+
+Usage: python -m benchmarks.shutdown [trials]
+"""
+
+from src.utils.supervisor import Supervisor
+import numpy as np
+import random, sys, threading, time
+
+
+def _startup(trials):
+    event_ms, poll_ms = [], []
+    for _ in range(trials):
+        delay = random.uniform(0.05, 0.3)
+        ready = threading.Event()
+        state = {}
+
+        def load():
+            time.sleep(delay)
+            state["ready_at"] = time.perf_counter()
+            ready.set()
+
+        threading.Thread(target=load).start()
+        ready.wait()
+        event_ms.append((time.perf_counter() - state["ready_at"]) * 1000)
+
+        state.clear()
+        threading.Thread(target=load).start()
+        while "ready_at" not in state:
+            time.sleep(0.1)
+        poll_ms.append((time.perf_counter() - state["ready_at"]) * 1000)
+    return np.asarray(event_ms), np.asarray(poll_ms)
+
+
+def _failure():
+    supervisor = Supervisor(budget=1.0)
+    seen = []
+
+    def waiter():
+        supervisor.stopping.wait()
+        seen.append(time.perf_counter())
+
+    def failing():
+        time.sleep(0.1)
+        state["raised_at"] = time.perf_counter()
+        raise RuntimeError("synthetic failure")
+
+    state = {}
+    for i in range(4):
+        supervisor.start(f"Waiter{i}", waiter)
+    supervisor.start("Failing", failing)
+    supervisor.stopping.wait()
+    report = supervisor.shutdown()
+    assert supervisor.failure and supervisor.failure[0] == "Failing"
+    return (max(seen) - state["raised_at"]) * 1000, report
+
+
+def _bounded(budget):
+    supervisor = Supervisor(budget=budget)
+    stop = threading.Event()
+    order = []
+
+    supervisor.start("Camera", stop.wait, stage="camera", stop=stop.set)
+    supervisor.start("Stuck", time.sleep, 10, stage="workers", timeout=5.0)
+    for stage in ("camera", "landmarker", "gl", "pygame"):
+        supervisor.at_teardown(stage, lambda stage=stage: order.append(stage))
+
+    start = time.perf_counter()
+    report = supervisor.shutdown()
+    elapsed = time.perf_counter() - start
+    assert report["late"] == ["Stuck"], report
+    assert order == ["camera", "landmarker", "gl", "pygame"], order
+    assert elapsed < budget + 0.1, elapsed
+    return elapsed * 1000, report
+
+
+def main(trials=20):
+    event_ms, poll_ms = _startup(trials)
+    print(f"ready event: mean {event_ms.mean():6.2f} ms  max {event_ms.max():6.2f} ms")
+    print(f"100 ms poll: mean {poll_ms.mean():6.2f} ms  max {poll_ms.max():6.2f} ms")
+
+    propagation, report = _failure()
+    print(f"failure seen by all workers after {propagation:.2f} ms ({report})")
+
+    elapsed, report = _bounded(budget=1.0)
+    print(f"shutdown with a stuck worker: {elapsed:.0f} ms ({report})")
+    print("OK: teardown ran camera -> landmarker -> gl -> pygame within budget")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,83 @@
+"""
+VMC sender -> receiver loopback over localhost UDP.
+
+A VMCSender streams a synthetic head turn at 60 Hz to a VMCReceiver on
+its own thread. Datagrams are dropped and delayed at random to imitate
+Wi-Fi. The receiver's per-source counters are printed, and the script checks
+that the played-out targets follow the sender.
+
+Usage: python -m benchmarks.vmc_loopback [seconds loss jitter_ms port]
+"""
+
+from src.render.vmc import VMCReceiver, VMCSender
+from src.render.module.param import Params
+import numpy as np
+import threading, time, sys, random
+
+
+class _App:
+    running = True
+    power = None
+
+
+class _LossySender(VMCSender):
+    def __init__(self, settings, loss, jitter):
+        super().__init__(settings)
+        self.loss = loss
+        self.jitter = jitter
+        self.dropped = 0
+        self._sendto = self.socket.sendto
+        self.socket = self
+
+    def sendto(self, datagram, address):
+        if random.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = random.uniform(0, self.jitter)
+        threading.Timer(delay, self._sendto, (datagram, address)).start()
+
+
+def main(seconds=5.0, loss=0.05, jitter_ms=20.0, port=39541):
+    app = _App()
+    params = Params()
+    receiver = VMCReceiver(
+        app, {"listen": "127.0.0.1", "port": port, "delay": 0.05}, {}
+    )
+    thread = threading.Thread(target=receiver.run, args=(params,), daemon=True)
+    thread.start()
+    time.sleep(0.2)
+
+    sender = _LossySender({"host": "127.0.0.1", "port": port}, loss, jitter_ms / 1000)
+    values = np.zeros(len(Params.PARAMETER_KEYS))
+    angle_x = Params.PARAMETER_KEYS.index("AngleX")
+    errors = []
+    start = time.perf_counter()
+    frame = 0
+    while time.perf_counter() - start < seconds:
+        now = time.perf_counter()
+        values[angle_x] = 30 * np.sin(2 * np.pi * 0.5 * (now - start))
+        sender.send(values, now)
+        # Compare against what the sender produced one buffer delay ago
+        expected = 30 * np.sin(2 * np.pi * 0.5 * (now - start - 0.05))
+        if now - start > 0.5:
+            errors.append(abs(float(params.target[angle_x]) - expected))
+        frame += 1
+        time.sleep(max(0.0, start + frame / 60 - time.perf_counter()))
+
+    time.sleep(0.2)
+    app.running = False
+    thread.join()
+
+    for source, stats in receiver.stats().items():
+        print(f"{source}: {stats}")
+    print(f"sent {sender.frames} frames, dropped {sender.dropped} on the wire")
+    errors = np.asarray(errors)
+    print(
+        f"AngleX tracking error: mean {errors.mean():.2f} deg, p95 {np.percentile(errors, 95):.2f} deg"
+    )
+
+
+if __name__ == "__main__":
+    args = [float(a) for a in sys.argv[1:4]]
+    port = int(sys.argv[4]) if len(sys.argv) > 4 else 39541
+    main(*args, port=port)
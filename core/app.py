@@ -1,17 +1,48 @@
-from src import Logger, Config, LayerManager, Params, Capture
-import pygame, time, gc, threading, sys
+from src import Logger, Config, LayerManager, Params, Capture, Supervisor
+import pygame, time, threading, logging, sys
 import live2d.v3 as live2d
 
 from core.capture import CaptureMixin
 from core.render import RenderMixin
 from core.model import ModelMixin
 from core.setup import AppSetup
+from core.power import PowerMixin
+from core.expression import ExpressionMixin
+from core.settings import SettingsMixin
 
 
-class Live2DApp(AppSetup, CaptureMixin, ModelMixin, RenderMixin):
-    def __init__(self, debugL2D=False):
+class Live2DApp(
+    AppSetup,
+    SettingsMixin,
+    CaptureMixin,
+    ModelMixin,
+    RenderMixin,
+    PowerMixin,
+    ExpressionMixin,
+):
+    def __init__(
+        self,
+        debugL2D=False,
+        video=None,
+        latency=None,
+        audio=None,
+        memory=None,
+        recorder=None,
+        sources=None,
+    ):
+        """
+        :param debugL2D: Enable Live2D core logging.
+        :param video: Track this video file instead of a camera.
+        :param latency: LatencyTracker to record motion-to-photon latency.
+        :param audio: Lip-sync from this WAV file (or "mic"), overriding config.
+        :param memory: MemoryTracker to sample and report memory use.
+        :param recorder: ParameterRecorder saving the shown parameters for --export.
+        :param sources: Cameras or videos tracked by one process each,
+            overriding "MultiCamera" in config.json.
+        """
         self.LayerManager = LayerManager()
         self.logger = Logger("Live2DApp")
+        self.supervisor = Supervisor(budget=2.0)
         self.Capture = Capture(app=self)
         self.config_internal = {}
         self.display_size = None
@@ -20,36 +51,103 @@ class Live2DApp(AppSetup, CaptureMixin, ModelMixin, RenderMixin):
         self.params = Params()
         self.config = Config()
         self.config_data = {}
+        self.config_watcher = None
+        self.settings = None
+        self._background_pixels = None
         self.running = True
         self.model = None
+        self.frame_interval = 1 / 30
+        self.video = video
+        self.latency = latency
+        self.audio = audio
+        self.memory = memory
+        self.recorder = recorder
+        self.gc_tuner = None
+        self.vmc_sender = None
+        self.control = None
+        self.model_key = None
+        self.power = None
+        self.power_state = None
+        self.expressions = None
+        self.hotkeys = {}
+        self.hud = None
+        self.profiler = None
+        self.model_watcher = None
+        self.sources = sources
+        self.MultiCapture = None
+
+    @property
+    def running(self) -> bool:
+        return not self.supervisor.stopping.is_set()
+
+    @running.setter
+    def running(self, value: bool):
+        # Any thread clearing the flag stops every worker; the app never restarts
+        if not value:
+            self.supervisor.request_stop(threading.current_thread().name)
 
     def run(self):
         try:
             self.app_init()
             self.start_capture()
             clock = pygame.time.Clock()
-            gc.collect()
+            self.gc_tuner.freeze("startup")
+            last = time.perf_counter()
 
             while self.running:
                 self._handle_events()
-                self._update_parameters()
-                self._render_frame()
+                self._update_settings()
+                self._apply_model_changes()
+                if self._update_power() != self.power.HIDDEN:
+                    self._update_parameters()
+                    self._render_frame()
+                self.gc_tuner.idle()
+                self._wait_frame(clock)
 
-                if self.config_data["CapFPS"]["capFps"]:
-                    clock.tick(self.config_data["CapFPS"]["CapFpsValue"])
-                else:
-                    time.sleep(0.005)
+                now = time.perf_counter()
+                self.frame_interval += (now - last - self.frame_interval) * 0.1
+                last = now
+                if self.memory:
+                    self.memory.sample(now)
         except Exception as e:
             self.logger.LogExit("run", e)
             self.running = False
 
         finally:
-            print("[Main] Threads before exit:", threading.enumerate())
-            print("[Main] running flag: ", self.running)
+            log = self.logger.logging
+            debug = log.isEnabledFor(logging.DEBUG)
+            if debug:
+                log.debug("Threads before exit: %s", threading.enumerate())
+                log.debug("running flag: %s", self.running)
             self.running = False
-            live2d.dispose()
-            pygame.quit()
-            print("[Main] dispose complete")
-            print("[Main] running flag: ", self.running)
-            print("[Main] Threads after exit:", threading.enumerate())
-            sys.exit(0)
+            self.supervisor.shutdown()
+            self.config.flush()
+            self.logger.logging.info("Config writes: %s", self.config.stats())
+            if self.latency:
+                self.latency.report()
+            if self.memory:
+                self.memory.report()
+            if self.recorder:
+                self.recorder.save()
+            if self.gc_tuner:
+                self.logger.logging.info("GC: %s", self.gc_tuner.stats())
+            if self.power:
+                self.logger.logging.info("Power states: %s", self.power.stats())
+            if self.expressions:
+                self.logger.logging.info(
+                    "Expression trigger latency: %s", self.expressions.stats()
+                )
+            if self.control:
+                self.logger.logging.info("Control API: %s", self.control.stats())
+            if hasattr(self.background, "stats"):
+                self.logger.logging.info("Background: %s", self.background.stats())
+            if self.model_watcher:
+                self.logger.logging.info("Hot reload: %s", self.model_watcher.stats())
+            if self.MultiCapture:
+                self.logger.logging.info("Multi-camera: %s", self.MultiCapture.stats())
+            if self.hud:
+                self.logger.logging.info("HUD cost: %s", self.hud.stats())
+            if debug:
+                log.debug("dispose complete, running flag: %s", self.running)
+                log.debug("Threads after exit: %s", threading.enumerate())
+            sys.exit(1 if self.supervisor.failure else 0)
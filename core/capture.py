@@ -1,15 +1,73 @@
-import threading
+from src import AudioSource, MultiCapture, VMCReceiver, VMCSender
 
 
 class CaptureMixin:
     def start_capture(self):
         try:
-            threading.Thread(
-                target=self.Capture.start_capture,
-                args=(self.params,),
-                name="CaptureThread",
-                daemon=True,
-            ).start()
+            audio = dict(self.config_data.get("Audio", {}))
+            if self.audio:
+                audio.update(enabled=True, source=self.audio)
+
+            if audio.get("enabled"):
+                self.AudioSource = AudioSource(app=self, settings=audio)
+                self.supervisor.start("AudioThread", self.AudioSource.run, self.params)
+                if self.AudioSource.mode == "only":
+                    return
+
+            vmc = self.config_data.get("VMC", {})
+            if vmc.get("mode") == "receive":
+                # A remote tracker drives the model; the local camera stays off
+                self.VMCReceiver = VMCReceiver(self, vmc, self.settings.parameter)
+                self.supervisor.start("VMCThread", self.VMCReceiver.run, self.params)
+                return
+            if vmc.get("mode") == "send":
+                self.vmc_sender = VMCSender(vmc)
+
+            multi = self.config_data.get("MultiCamera", {})
+            sources = self.sources or (
+                multi.get("sources") if multi.get("enabled") else None
+            )
+            if sources:
+                self._start_multi_capture(list(sources), multi, vmc)
+                return
+
+            # The camera is released by its own thread; the landmarker closes
+            # only after that thread stops using it
+            worker = self.supervisor.start(
+                "CaptureThread",
+                self.Capture.start_capture,
+                self.params,
+                stage="camera",
+            )
+            self.supervisor.at_teardown(
+                "landmarker", self.Capture.close_landmarker, after=worker
+            )
         except Exception as e:
             self.logger.LogExit("start_capture", e)
             self.running = False
+
+    def _start_multi_capture(self, sources: list, settings, vmc) -> None:
+        """
+        One tracker process per source instead of the Capture thread.
+        :param settings: The "MultiCamera" block of config.json.
+        """
+        # Plain dicts: the config snapshot is read-only and goes to other processes
+        self.MultiCapture = MultiCapture(
+            sources,
+            self.config.parameter(),
+            dict(settings),
+            dict(self.config_data.get("Tracking", {})),
+            dict(vmc),
+        )
+        self.MultiCapture.start()
+        worker = self.supervisor.start(
+            "CaptureThread",
+            self.MultiCapture.run,
+            self.params,
+            self.vmc_sender,
+            self.power,
+            self.supervisor,
+            stage="camera",
+            stop=self.MultiCapture.stop,
+        )
+        self.supervisor.at_teardown("landmarker", self.MultiCapture.close, after=worker)
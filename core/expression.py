@@ -0,0 +1,44 @@
+from src import ExpressionLibrary, ExpressionPlayer
+from pathlib import Path
+import pygame, time
+
+
+class ExpressionMixin:
+    def _load_expressions(self, model_entry: dict, model_path: Path):
+        try:
+            library = ExpressionLibrary()
+            library.load(model_path.parent, model_entry.get("extensions", {}))
+            self.expressions = ExpressionPlayer(
+                library, self.config_internal.get("triggers", [])
+            )
+
+            self.hotkeys = {}
+            for key_name, name in self.config_internal.get("keyboard", {}).items():
+                try:
+                    self.hotkeys[pygame.key.key_code(key_name)] = name
+                except ValueError:
+                    self.logger.LogExit(
+                        "_load_expressions", f"Unknown hotkey {key_name!r}", custom=True
+                    )
+
+            # Base values for Multiply blends come from the model mapping
+            index = {t: i for i, t in enumerate(self.model_mapping.targets)}
+            output = self.model_mapping.output
+            self._expression_base = lambda p: (
+                float(output[index[p]]) if p in index else None
+            )
+        except Exception as e:
+            self.logger.LogExit("_load_expressions", e)
+            self.expressions = None
+
+    def _handle_key(self, event):
+        name = self.hotkeys.get(event.key) if self.expressions else None
+        if name:
+            self.expressions.trigger(name, time.perf_counter())
+
+    def _apply_expressions(self):
+        if not self.expressions:
+            return
+        now = time.perf_counter()
+        self.expressions.check_triggers(self.params, now)
+        self.expressions.apply(self.model, now, self._expression_base)
@@ -1,57 +1,119 @@
-from live2d.v3.params import StandardParams
+from src import MappingPipeline, DEFAULT_MODEL_MAPPINGS, ModelWatcher
+from src import tracked_model_mappings
 from live2d.v3 import LAppModel
 from pathlib import Path
+import time
 
 
 class ModelMixin:
-    def _load_model(self):
+    def _load_model(self, key: str = None):
+        """
+        :param key: ModelList entry to load; the first one when None. When
+            switching models at runtime, a failed load keeps the current model.
+        """
         try:
             model_list = self.config_internal.get("ModelList", {})
-            first_model_key = next(iter(model_list))
-            full_path = Path("media") / model_list[first_model_key]["FullPath"]
-
-            self.model = LAppModel()
-            self.model.LoadModelJson(str(full_path))
-            self.model.Resize(*self.display_size)
-            self.model.SetAutoBreathEnable(self.config_data.get("Auto Breath", True))
-            self.model.SetAutoBlinkEnable(self.config_data.get("Auto Blink", True))
+            key = key if key is not None else next(iter(model_list))
+            model_entry = model_list[key]
+            full_path = Path("media") / model_entry["FullPath"]
+
+            model = self._create_model(full_path)
+            self.model, self.model_key = model, key
+            if self.memory:
+                self.memory.track_model(full_path)
+
+            data = self.config.parameter()
+            spec = data.get("MODEL_MAPPINGS", DEFAULT_MODEL_MAPPINGS)
+            if self.config_data.get("VMC", {}).get("mode") != "receive":
+                # A VMC tracker may send any Params key; local tracking may not
+                spec = tracked_model_mappings(spec, data)
+            self.model_mapping = MappingPipeline(spec, data)
+            self._model_values = memoryview(self.model_mapping.output)
+            self._load_expressions(model_entry, full_path)
+            self._watch_model(full_path)
         except Exception as e:
             self.logger.LogExit("_load_model", e)
-            self.running = False
+            if self.model is None:
+                self.running = False
 
-    def _update_parameters(self):
+    def _create_model(self, full_path: Path) -> LAppModel:
+        model = LAppModel()
+        model.LoadModelJson(str(full_path))
+        model.Resize(*self.display_size)
+        idle = self.power and self.power_state == self.power.IDLE
+        model.SetAutoBreathEnable(idle or self.settings.auto_breath)
+        model.SetAutoBlinkEnable(idle or self.settings.auto_blink)
+        return model
+
+    def _watch_model(self, full_path: Path):
+        settings = self.config_data.get("HotReload", {})
+        watcher = self.model_watcher
+        if not settings.get("enabled", True):
+            return
+        if watcher and watcher.model_json == full_path:
+            return
+        if watcher:
+            watcher.stop()
+        self.model_watcher = ModelWatcher(
+            full_path, settings.get("interval", 0.5), settings.get("settle", 0.3)
+        )
+        self.supervisor.start(
+            "ModelWatcher", self.model_watcher.run, stop=self.model_watcher.stop
+        )
+
+    def _apply_model_changes(self):
+        """
+        Apply one prepared model change between frames. Expressions and
+        motions are swapped in the player; anything else needs a new
+        LoadModelJson, which must run here on the GL thread (the watcher
+        has already read the files into the OS cache). The new model
+        replaces the old one in a single frame, and the old one's textures
+        and buffers are freed right after. Params, smoothing, the mapping
+        and playing expressions carry over, and a failed reload keeps the
+        current model.
+        """
+        watcher = self.model_watcher
+        if not watcher or not watcher.pending:
+            return
+        change = watcher.pending.popleft()
+        start = time.perf_counter()
         try:
-            p, m = self.params, self.model
-            p.update_params(p)
-
-            m.SetParameterValue(StandardParams.ParamEyeLOpen, p.EyeLOpen, 1)
-            m.SetParameterValue(StandardParams.ParamEyeROpen, p.EyeROpen, 1)
-            m.SetParameterValue(StandardParams.ParamMouthOpenY, p.MouthOpenY, 1)
-            m.SetParameterValue(StandardParams.ParamMouthForm, p.MouthForm, 1)
-
-            head_params = [
-                (StandardParams.ParamAngleX, p.AngleX),
-                (StandardParams.ParamAngleY, p.AngleY),
-                (StandardParams.ParamAngleZ, p.AngleZ),
-                (StandardParams.ParamBodyAngleX, p.AngleX),
-                (StandardParams.ParamBodyAngleY, p.AngleY),
-                (StandardParams.ParamBodyAngleZ, p.AngleZ),
-                (StandardParams.ParamBustX, p.BustX),
-                (StandardParams.ParamBustY, p.BustY),
-                (StandardParams.ParamBaseX, p.BodyAngleX),
-                (StandardParams.ParamBaseY, p.BodyAngleY),
-                (StandardParams.ParamEyeBallX, p.EyeBallX),
-            ]
-            for param, value in head_params:
-                m.SetParameterValue(param, value, 1)
+            if change.full:
+                model = self._create_model(watcher.model_json)
+                old, self.model = self.model, model
+                # Last reference: frees its GL textures while the context is current
+                del old
+                if self.memory:
+                    self.memory.track_model(watcher.model_json)
+            if self.expressions:
+                for item in change.items:
+                    self.expressions.replace(item)
+            now = time.perf_counter()
+            watcher.record(change, now - start, now)
+        except Exception as e:
+            self.logger.LogExit("_apply_model_changes", e)
 
-            yaw, pitch = p.AngleX, p.AngleY
-            m.SetParameterValue("ParamBodyLeft", max(0.0, -yaw / 30), 1)
-            m.SetParameterValue("ParamBodyRight", max(0.0, yaw / 30), 1)
-            m.SetParameterValue("ParamBodyBack", max(0.0, pitch / 30), 1)
-            m.SetParameterValue("ParamBodyFront", max(0.0, -pitch / 30), 1)
+    def _update_parameters(self):
+        try:
+            p, m, mapping = self.params, self.model, self.model_mapping
+            if self.latency:
+                self.latency.mark(p.sample_id, "apply")
+            # Frame is shown at the next flip, roughly one frame interval away
+            p.update_params(display_time=time.perf_counter() + self.frame_interval)
 
-            m.SetParameterValue("Param14", 1, 1)
+            now = time.perf_counter()
+            if self.recorder:
+                self.recorder.record(p.values, now)
+            mapping.load_array(p.values, p.PARAMETER_KEYS)
+            if self.control:
+                self.control.apply_inputs(mapping, now)
+            mapping.evaluate()
+            # memoryview iteration yields floats without building a list
+            for param, value in zip(mapping.targets, self._model_values):
+                m.SetParameterValue(param, value, 1)
+            if self.control:
+                self.control.apply(m, now)
+            self._apply_expressions()
         except Exception as e:
             self.logger.LogExit("_update_parameters", e)
             self.running = False
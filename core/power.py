@@ -0,0 +1,69 @@
+from src import PowerManager
+import pygame, time
+
+# Posted by the capture thread to wake a throttled render loop
+POWER_WAKE = pygame.event.custom_type()
+
+NEUTRAL_KEYS = [
+    "AngleX",
+    "AngleY",
+    "AngleZ",
+    "EyeBallX",
+    "MouthOpenY",
+    "EyeLOpen",
+    "EyeROpen",
+]
+NEUTRAL_VALUES = [0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0]
+
+
+class PowerMixin:
+    def _init_power(self):
+        self.power = PowerManager(self.config_data.get("Power", {}))
+        self.power.wake = lambda: pygame.event.post(pygame.event.Event(POWER_WAKE))
+        # A stop requested by a worker ends a throttled wait at once
+        self.supervisor.on_stop.append(self.power.wake)
+        self.power_state = self.power.state
+
+    def _update_power(self):
+        state = self.power.update()
+        if state != self.power_state:
+            self._apply_power_state(self.power_state, state)
+            self.power_state = state
+        return state
+
+    def _apply_power_state(self, old, new):
+        try:
+            if new == PowerManager.IDLE:
+                # Idle animation: let the model breathe and blink around a neutral pose
+                self.model.SetAutoBreathEnable(True)
+                self.model.SetAutoBlinkEnable(True)
+                self.params.set_targets(NEUTRAL_KEYS, NEUTRAL_VALUES)
+            elif old == PowerManager.IDLE:
+                self.model.SetAutoBreathEnable(self.settings.auto_breath)
+                self.model.SetAutoBlinkEnable(self.settings.auto_blink)
+        except Exception as e:
+            self.logger.LogExit("_apply_power_state", e)
+
+    def _handle_window_event(self, event):
+        if event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+            self.power.on_visibility(False)
+        elif event.type in (
+            pygame.WINDOWRESTORED,
+            pygame.WINDOWSHOWN,
+            pygame.WINDOWEXPOSED,
+            pygame.WINDOWMAXIMIZED,
+        ):
+            self.power.on_visibility(True)
+
+    def _wait_frame(self, clock):
+        render_fps = self.power.profile().get("render_fps")
+        if render_fps:
+            # Sleep in the event queue so restore/wake events end the wait early
+            event = pygame.event.wait(int(1000 / render_fps))
+            if event.type != pygame.NOEVENT:
+                pygame.event.post(event)
+            clock.tick()
+        elif self.settings.cap_fps.enabled:
+            clock.tick(self.settings.cap_fps.value)
+        else:
+            time.sleep(0.005)
@@ -1,5 +1,9 @@
+from src import Hud
 import live2d.v3 as live2d
-import pygame, sys
+import pygame, time, sys
+
+# Posted by the profiler's timer; the cProfile capture ends on this thread
+PROFILE_DONE = pygame.event.custom_type()
 
 
 class RenderMixin:
@@ -9,13 +13,58 @@ class RenderMixin:
             self.background.Draw()
             self.model.Update()
             self.model.Draw()
+            if self.hud and self.hud.visible:
+                self.hud.draw(time.perf_counter())
 
             pygame.display.flip()
+            if self.expressions:
+                self.expressions.presented(time.perf_counter())
+            if self.latency:
+                p = self.params
+                self.latency.flipped(p.sample_id, getattr(p, self.latency.parameter))
         except Exception as e:
             self.logger.LogExit("_render_frame", e)
             self.running = False
 
+    def _toggle_hud(self):
+        # Built on first use; needs the GL context, so render thread only
+        if not self.hud:
+            self.hud = Hud(self, self.config_data.get("HUD", {}))
+            self.supervisor.at_teardown("gl", self.hud.release)
+        self.hud.toggle()
+
+    def _start_profile(self, seconds: float = None, mode: str = None):
+        """
+        Start a profile capture (render thread).
+        :return: Base path of the output files, or None when one is running.
+        """
+        base = self.profiler.start(
+            seconds,
+            mode,
+            on_done=lambda: pygame.event.post(
+                pygame.event.Event(PROFILE_DONE, capture=base)
+            ),
+        )
+        return base
+
     def _handle_events(self):
+        # Most frames have no events; peek avoids building an empty list
+        if not pygame.event.peek():
+            return
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F9 and self.memory:
+                    self.memory.log_top()
+                elif event.key == pygame.K_F3:
+                    self._toggle_hud()
+                elif event.key == pygame.K_F10:
+                    self._start_profile()
+                else:
+                    self._handle_key(event)
+            elif event.type == PROFILE_DONE:
+                # Only the capture that posted it; never a foreign event type
+                self.profiler.finish(getattr(event, "capture", ""))
+            else:
+                self._handle_window_event(event)
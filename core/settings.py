@@ -0,0 +1,71 @@
+from src import ConfigWatcher, load_image, open_background, is_animated
+
+
+class SettingsMixin:
+    def _init_settings(self):
+        self.config_watcher = ConfigWatcher(self.config)
+        self.settings = self.config_watcher.snapshot
+        self.config_data = self.settings.user
+        self.config_internal = self.settings.internal
+        self.params.set_smoothing(*self.settings.smoothing)
+        self.params.set_prediction(**self.settings.prediction)
+
+    def _start_settings_watcher(self):
+        self.config_watcher.listeners.append(self._prepare_settings)
+        self.supervisor.start(
+            "ConfigWatcher", self.config_watcher.run, stop=self.config_watcher.stop
+        )
+
+    def _prepare_settings(self, new, old):
+        """
+        Watcher thread: decode a changed background before the snapshot is
+        swapped in, so the render thread only uploads it.
+        """
+        path = f"Media/Assets/{new.background}"
+        if new.background != old.background and not is_animated(path):
+            pixels = load_image(path)
+            self._background_pixels = (new.background, pixels)
+
+    def _update_settings(self):
+        """
+        Apply a newer config snapshot; costs one identity check per frame.
+        """
+        new = self.config_watcher.snapshot
+        if new is self.settings:
+            return
+        old, self.settings = self.settings, new
+        try:
+            self.config_data = new.user
+            self.config_internal = new.internal
+            if new.smoothing != old.smoothing:
+                self.params.set_smoothing(*new.smoothing)
+            if new.prediction != old.prediction:
+                self.params.set_prediction(**new.prediction)
+            if new.background != old.background:
+                self._swap_background(new.background)
+            if (new.auto_breath, new.auto_blink) != (old.auto_breath, old.auto_blink):
+                if self.power_state != self.power.IDLE:
+                    self.model.SetAutoBreathEnable(new.auto_breath)
+                    self.model.SetAutoBlinkEnable(new.auto_blink)
+            if new.user.get("display") != old.user.get("display"):
+                self.logger.LogExit(
+                    "_update_settings",
+                    "display size applies after a restart",
+                    custom=True,
+                )
+        except Exception as e:
+            self.logger.LogExit("_update_settings", e)
+
+    def _swap_background(self, name: str):
+        pending = self._background_pixels
+        pixels = pending[1] if pending and pending[0] == name else None
+        background = open_background(
+            f"Media/Assets/{name}",
+            self.display_size,
+            self.config_data.get("AnimatedBackground", {}),
+            self.supervisor.stopping,
+            pixels,
+        )
+        self.background.release()
+        self.background = background
+        self._background_pixels = None
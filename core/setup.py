@@ -1,6 +1,16 @@
-from src import Notification, resource_path, Constract, Image
+from src import (
+    Notification,
+    resource_path,
+    Constract,
+    open_background,
+    ControlServer,
+    GCTuner,
+    PROFILE,
+    autotune,
+    Profiler,
+)
 from collections import namedtuple
-import pygame, shutil, sys, os, gc
+import pygame, shutil, sys, os, gc, multiprocessing
 import live2d.v3 as live2d
 
 
@@ -9,10 +19,17 @@ class AppSetup:
         try:
             self._setup_directories()
             self._check_contract()
-            self.config_data = self.config.user()
-            self.config_internal = self.config.recv()
+            self._autotune_first_run()
+            self._init_settings()
+            self.gc_tuner = GCTuner(self.config_data.get("GC", {}))
             self._init_pygame()
+            self._checkpoint("pygame")
+            self._init_profiler()
             self._init_live2d()
+            self._checkpoint("live2d")
+            self._init_power()
+            self._init_control()
+            self._start_settings_watcher()
         except Exception as e:
             self.logger.LogExit("app_init", e)
             self.running = False
@@ -53,21 +70,67 @@ class AppSetup:
             self.running = False
         contract.start()
 
+    def _autotune_first_run(self):
+        tune = self.config.user(profile=False).get("AutoTune", {})
+        if not self.running or not tune.get("first_run") or os.path.exists(PROFILE):
+            return
+        self.logger.logging.info("No profile.json yet, tuning for this machine")
+        # Own process, so the offscreen GL and Live2D state never meet the app's
+        process = multiprocessing.Process(
+            target=autotune,
+            kwargs={
+                "video": self.video,
+                "target_fps": tune.get("target_fps", 30),
+                "cpu_budget": tune.get("cpu_budget", 1.0),
+                "max_error": tune.get("max_error", 0.004),
+            },
+            name="AutoTune",
+        )
+        process.start()
+        process.join()
+
     def _init_pygame(self):
         point = namedtuple("Point", ["x", "y"])
         self.display_size = point(*self.config_data["display"])
         pygame.init()
+        self.supervisor.at_teardown("pygame", pygame.quit)
         self.screen = pygame.display.set_mode(
             self.display_size, pygame.DOUBLEBUF | pygame.OPENGL
         )
         pygame.display.set_caption("LunaStudio | By Lunaria & Community")
-        self.background = Image(f"Media/Assets/{self.config_data['background']}")
+        self.background = open_background(
+            f"Media/Assets/{self.config_data['background']}",
+            self.display_size,
+            self.config_data.get("AnimatedBackground", {}),
+            self.supervisor.stopping,
+        )
         icon = pygame.image.load(resource_path("Assets/LunaStudio.png"))
         pygame.display.set_icon(icon)
 
+    def _init_profiler(self):
+        settings = self.config_data.get("Profiler", {})
+        self.profiler = Profiler(settings)
+        self.supervisor.at_teardown("workers", self.profiler.stop)
+        if settings.get("on_start"):
+            self._start_profile()
+
+    def _checkpoint(self, name: str):
+        if self.memory:
+            self.memory.checkpoint(name)
+
+    def _init_control(self):
+        settings = self.config_data.get("API", {})
+        if not settings.get("enabled"):
+            return
+        self.control = ControlServer(app=self, settings=settings)
+        self.supervisor.start("ControlThread", self.control.run)
+
     def _init_live2d(self):
         live2d.setLogEnable(self.debugL2D)
         live2d.init()
+        self.supervisor.at_teardown("gl", live2d.dispose)
         live2d.glInit()
         self._load_model()
+        if self.config_data.get("HUD", {}).get("visible"):
+            self._toggle_hud()
         gc.collect()
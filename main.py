@@ -32,6 +32,177 @@
 
 
 from core.app import Live2DApp
+from pathlib import Path
+import multiprocessing, argparse, os
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="LunaStudio")
+    parser.add_argument("--video", help="track a video file instead of the camera")
+    parser.add_argument(
+        "--latency",
+        action="store_true",
+        help="record motion-to-photon latency into LunaStudio-latency.json",
+    )
+    parser.add_argument(
+        "--onsets",
+        help="motion onsets in video seconds: comma list or file with one per line",
+    )
+    parser.add_argument(
+        "--audio", help='lip-sync from a WAV file or "mic" (see "Audio" in config.json)'
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="sample memory use into LunaStudio-memory.json (F9 logs top allocations)",
+    )
+    parser.add_argument(
+        "--record", help="save the shown parameters to an .npz for --export"
+    )
+    parser.add_argument(
+        "--export",
+        help="render offline to a video (.mov/.webm/.mkv/.mp4) or PNG frames",
+    )
+    parser.add_argument(
+        "--replay", help="stream for --export: recorded .npz or a video to track"
+    )
+    parser.add_argument(
+        "--fps", type=float, help="--export frame rate (60), --autotune target"
+    )
+    parser.add_argument(
+        "--size", help="--export size as WIDTHxHEIGHT (default: display)"
+    )
+    parser.add_argument("--model", help="ModelList entry for --export")
+    parser.add_argument(
+        "--background", action="store_true", help="--export over the background image"
+    )
+    parser.add_argument(
+        "--autotune",
+        action="store_true",
+        help="benchmark this machine (camera or --video) and write profile.json",
+    )
+    parser.add_argument(
+        "--track",
+        nargs="+",
+        metavar="VIDEO",
+        help="track videos into parameter streams (<video>.npz) for --replay",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="--track processes (default: one per core)"
+    )
+    parser.add_argument(
+        "--sources",
+        nargs="+",
+        metavar="SOURCE",
+        help="track several cameras (numbers) or videos, one process each",
+    )
+    parser.add_argument("--debug-l2d", action="store_true", help="Live2D core logging")
+    return parser.parse_args()
+
+
+def load_onsets(value):
+    if not value:
+        return []
+    if os.path.isfile(value):
+        with open(value, "r", encoding="utf-8") as file:
+            return [float(line) for line in file if line.strip()]
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def export(args):
+    from src import Config, OfflineRenderer, load_stream
+
+    config = Config()
+    data = config.parameter()
+    settings = config.user()
+    model_list = config.recv().get("ModelList", {})
+    entry = model_list[args.model or next(iter(model_list))]
+    size = [int(v) for v in args.size.split("x")] if args.size else settings["display"]
+    background = f"Media/Assets/{settings['background']}" if args.background else None
+
+    stream = load_stream(args.replay, data)
+    renderer = OfflineRenderer(
+        str(Path("media") / entry["FullPath"]),
+        size,
+        args.fps or 60.0,
+        data,
+        settings,
+        background,
+    )
+    stats = renderer.run(stream, args.export)
+    print(f"Rendered {stats['frames']} frames at {stats['fps']} frames/sec: {stats}")
+
+
+def track(args):
+    from src import Config, track_parallel, save_stream
+
+    config = Config()
+    settings = config.user().get("OfflineTracking", {})
+    streams = track_parallel(
+        args.track,
+        config.parameter(),
+        workers=args.workers or settings.get("workers", 0),
+        segment_seconds=settings.get("segment_seconds", 60),
+        warmup_seconds=settings.get("warmup_seconds", 2),
+    )
+    for video, stream in streams.items():
+        path = str(Path(video).with_suffix(".npz"))
+        save_stream(stream, path)
+        print(f"{video}: {len(stream['t'])} frames -> {path}")
+
+
+def autotune(args):
+    from src import AutoTuner, Config
+
+    tune = Config().user(profile=False).get("AutoTune", {})
+    profile = AutoTuner(
+        video=args.video,
+        model=args.model,
+        target_fps=args.fps or tune.get("target_fps", 30),
+        cpu_budget=tune.get("cpu_budget", 1.0),
+        max_error=tune.get("max_error", 0.004),
+    ).run()
+    if profile is None:
+        raise SystemExit("Auto-tuning failed, see LunaStudio.log")
+    print(f"Profile: {profile['settings']} (estimate {profile['estimate']})")
+
 
 if __name__ == "__main__":
-    Live2DApp(debugL2D=False).run()
+    multiprocessing.freeze_support()
+    args = parse_args()
+    if args.autotune:
+        autotune(args)
+        raise SystemExit(0)
+    if args.track:
+        track(args)
+        raise SystemExit(0)
+    if args.export:
+        if not args.replay:
+            raise SystemExit("--export needs --replay <recording.npz|video>")
+        export(args)
+        raise SystemExit(0)
+    latency = None
+    if args.latency:
+        from src import LatencyTracker
+
+        latency = LatencyTracker(onsets=load_onsets(args.onsets))
+    memory = None
+    if args.memory:
+        from src import MemoryTracker
+
+        memory = MemoryTracker()
+    recorder = None
+    if args.record:
+        from src import ParameterRecorder
+
+        recorder = ParameterRecorder(args.record)
+
+    Live2DApp(
+        debugL2D=args.debug_l2d,
+        video=args.video,
+        latency=latency,
+        audio=args.audio,
+        memory=memory,
+        recorder=recorder,
+        sources=args.sources,
+    ).run()
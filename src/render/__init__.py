@@ -1,3 +1,18 @@
 from .image.image import Image
+from .image.hud import Hud
+from .image.animated import AnimatedImage, open_background, is_animated
+from .image.opengl_function import load_image
 from .capture import Capture
+from .audio import AudioSource
+from .vmc import VMCReceiver, VMCSender
+from .control import ControlServer
+from .expression import ExpressionLibrary, ExpressionPlayer
 from .module.param import Params
+from .module.mapping import MappingPipeline, DEFAULT_MODEL_MAPPINGS
+from .parameter import tracked_model_mappings
+from .recording import ParameterRecorder, load_stream, track_parallel, save_stream
+from .export import OfflineRenderer
+from .autotune import AutoTuner, autotune
+from .scheduler import InferenceScheduler
+from .hotreload import ModelWatcher
+from .multicam import MultiCapture
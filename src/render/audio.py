@@ -0,0 +1,182 @@
+# audio.py
+from ..utils import Logger
+import numpy as np
+import threading
+import time
+import wave
+
+try:
+    import sounddevice as sd
+
+    _SD_ERROR = None
+except (ImportError, OSError) as e:  # optional: microphone input
+    # OSError: sounddevice is installed but the PortAudio library is missing
+    sd, _SD_ERROR = None, e
+
+
+class AudioAnalyzer:
+    """
+    Block-wise mouth estimation from audio.
+
+    Loudness (RMS in dBFS, scaled between floor_db and ceil_db) drives
+    mouth opening with a fast attack and slower release. A windowed FFT is
+    split into low/mid/high bands with one matrix product; bright spectra
+    ("i", "e") widen the mouth form, dark ones ("o", "u") narrow it.
+    """
+
+    BANDS = ((80, 500), (500, 2000), (2000, 6000))
+
+    def __init__(
+        self,
+        rate: int,
+        block: int,
+        floor_db: float = -50.0,
+        ceil_db: float = -15.0,
+        attack: float = 0.6,
+        release: float = 0.25,
+    ):
+        self.floor_db = floor_db
+        self.ceil_db = ceil_db
+        self.attack = attack
+        self.release = release
+        self.window = np.hanning(block).astype(np.float32)
+        freqs = np.fft.rfftfreq(block, 1.0 / rate)
+        self.bands = np.stack(
+            [(freqs >= lo) & (freqs < hi) for lo, hi in self.BANDS]
+        ).astype(np.float32)
+        self._windowed = np.empty(block, dtype=np.float32)
+        self.level = 0.0  # loudness of the last block, 0 at or below floor_db
+        self.values = np.zeros(2, dtype=np.float32)  # MouthOpenY, MouthForm
+
+    def analyze(self, samples: np.ndarray) -> np.ndarray:
+        """
+        :param samples: Mono float32 block in [-1, 1].
+        :return: [MouthOpenY, MouthForm] (reused array).
+        """
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        db = 20.0 * np.log10(rms + 1e-9)
+        level = min(
+            max((db - self.floor_db) / (self.ceil_db - self.floor_db), 0.0), 1.0
+        )
+
+        self.level = level
+        prev = float(self.values[0])
+        rate = self.attack if level > prev else self.release
+        mouth_open = prev + (level - prev) * rate
+
+        np.multiply(samples, self.window, out=self._windowed)
+        spectrum = np.abs(np.fft.rfft(self._windowed)) ** 2
+        low, mid, high = self.bands @ spectrum / (float(spectrum.sum()) + 1e-12)
+        form = min(max(0.5 + (high + 0.5 * mid) - low, 0.0), 1.0)
+        if level > 0.0:
+            self.values[1] += (form - self.values[1]) * rate
+
+        self.values[0] = mouth_open
+        return self.values
+
+
+class AudioSource:
+    """
+    Streams microphone or WAV audio on its own thread and writes mouth
+    values into Params.
+
+    Modes:
+    - "blend": mixed with camera values by `weight`
+    - "override": mouth channels are reserved for audio
+    - "only": audio is the sole tracker (camera and landmarker stay off)
+    """
+
+    KEYS = ["MouthOpenY", "MouthForm"]
+
+    def __init__(self, app, settings: dict):
+        self.app = app
+        self.logger = Logger("Audio")
+        self.source = settings.get("source", "mic")
+        self.mode = settings.get("mode", "blend")
+        self.weight = (
+            float(settings.get("weight", 0.5)) if self.mode == "blend" else 1.0
+        )
+        self.block = int(settings.get("block", 512))
+        self.loop = bool(settings.get("loop", True))
+        self.settings = settings
+        self.blocks = 0
+
+    def _analyzer(self, rate: int) -> AudioAnalyzer:
+        return AudioAnalyzer(
+            rate,
+            self.block,
+            self.settings.get("floor_db", -50.0),
+            self.settings.get("ceil_db", -15.0),
+        )
+
+    def _push(self, params, analyzer: AudioAnalyzer, samples: np.ndarray) -> None:
+        values = analyzer.analyze(samples)
+        if self.mode == "blend":
+            params.set_blend(self.KEYS, values, self.weight)
+        else:
+            params.set_targets(self.KEYS, values, owner="audio")
+        self.blocks += 1
+        # Speech counts as presence: with mode "only" nothing else reports it
+        power = getattr(self.app, "power", None)
+        if power and analyzer.level > 0.0:
+            power.on_face(True)
+
+    def _run_wav(self, params) -> None:
+        with wave.open(self.source, "rb") as wav:
+            rate, channels = wav.getframerate(), wav.getnchannels()
+            width = wav.getsampwidth()
+            if width != 2:
+                raise ValueError("Only 16-bit PCM WAV files are supported")
+            analyzer = self._analyzer(rate)
+            mono = np.empty(self.block, dtype=np.float32)
+            start = time.perf_counter()
+            played = 0
+
+            while self.app.running:
+                raw = wav.readframes(self.block)
+                frames = len(raw) // (width * channels)
+                if frames == 0:
+                    if not self.loop or wav.getnframes() == 0:
+                        break
+                    wav.rewind()
+                    continue
+                pcm = np.frombuffer(raw, dtype=np.int16).reshape(frames, channels)
+                np.multiply(
+                    pcm.mean(axis=1), 1.0 / 32768.0, out=mono[:frames], casting="unsafe"
+                )
+                mono[frames:] = 0.0  # zero-pad the file's last, partial block
+                self._push(params, analyzer, mono)
+
+                # Pace to real time like a live input would
+                played += frames
+                time.sleep(max(0.0, start + played / rate - time.perf_counter()))
+
+    def _run_mic(self, params) -> None:
+        if sd is None:
+            raise RuntimeError(
+                f"Microphone input needs the 'sounddevice' package ({_SD_ERROR})"
+            )
+        rate = int(self.settings.get("rate", 16000))
+        analyzer = self._analyzer(rate)
+        with sd.InputStream(
+            samplerate=rate, blocksize=self.block, channels=1, dtype="float32"
+        ) as stream:
+            while self.app.running:
+                data, _ = stream.read(self.block)
+                self._push(params, analyzer, data[:, 0])
+
+    def run(self, params) -> None:
+        """Thread target: analyze audio until the app stops."""
+        try:
+            if self.mode == "override":
+                params.reserve(self.KEYS, "audio")
+            if self.source == "mic":
+                self._run_mic(params)
+            else:
+                self._run_wav(params)
+        except Exception as e:
+            self.logger.LogExit("run", e)
+            if self.mode == "only":
+                self.app.running = False
+        finally:
+            self.logger.logging.info("Audio blocks analyzed: %d", self.blocks)
@@ -0,0 +1,393 @@
+# autotune.py
+from ..utils import Config, Logger, resource_path
+from .recording import _Landmarker
+from .preprocess import FramePreprocessor
+from .loader import Loader
+from .module.param import Params
+from .export import OfflineRenderer
+from types import SimpleNamespace
+from pathlib import Path
+import mediapipe as mp
+import numpy as np
+import platform, time, os, cv2
+
+# Requested camera modes: (width, height, fps)
+CAMERA_MODES = (
+    (1280, 720, 30),
+    (960, 540, 30),
+    (640, 480, 60),
+    (640, 480, 30),
+    (320, 240, 30),
+)
+# Landmarker input widths; 0 feeds frames at camera size (the reference)
+INPUT_WIDTHS = (0, 640, 480, 320, 256)
+RENDER_SCALES = (1.0, 0.75, 0.5)
+FPS_STEPS = (60, 48, 30, 24, 20, 15)
+# Smoothing factors in config.json are per frame, tuned at this rate
+REFERENCE_FPS = 30
+
+
+class AutoTuner:
+    """
+    Benchmarks this machine and writes Media/Config/profile.json.
+
+    Measures camera modes (or decoding a video file), landmarker cost and
+    accuracy at several input widths, OpenCV thread counts, and the
+    model's render cost at several window sizes (offscreen). Then picks
+    the highest frame rate, and at that rate the largest window, whose
+    combined CPU time fits `cpu_budget`.
+    """
+
+    def __init__(
+        self,
+        video: str = None,
+        model: str = None,
+        target_fps: int = 30,
+        cpu_budget: float = 1.0,
+        max_error: float = 0.004,
+        frames: int = 120,
+    ):
+        """
+        :param video: Benchmark tracking on this file instead of the camera.
+        :param model: ModelList entry to render; the first one when None.
+        :param target_fps: Highest frame rate to consider.
+        :param cpu_budget: CPU time allowed, in cores (1.0 = one full core).
+        :param max_error: Largest mean landmark shift, as a fraction of the
+            frame width, accepted from a smaller landmarker input.
+        :param frames: Frames timed per measurement.
+        """
+        self.logger = Logger("AutoTune")
+        self.config = Config()
+        self.video = video
+        self.model = model
+        self.target_fps = int(target_fps)
+        self.cpu_budget = cpu_budget
+        self.max_error = max_error
+        self.frames = frames
+        self.app = SimpleNamespace(running=True)
+        self.settings = self.config.user(profile=False)
+        self.data = self.config.parameter()
+
+    # ---------- measurements ----------
+
+    def _read(self, cap, count: int):
+        """
+        :return: Frames read, delivered frames/sec and CPU ms per read.
+        """
+        frames = []
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        while len(frames) < count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        fps = len(frames) / wall if wall else 0.0
+        return frames, fps, cpu / max(len(frames), 1) * 1000
+
+    def measure_camera(self):
+        """
+        :return: Modes as delivered (size, fps, CPU ms per read) and frames
+            at the largest size for the tracking benchmarks.
+        """
+        if self.video:
+            cap = cv2.VideoCapture(self.video)
+            if not cap.isOpened():
+                raise RuntimeError(f"Cannot open {self.video}")
+            try:
+                frames, _, read_ms = self._read(cap, self.frames)
+                fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            finally:
+                cap.release()
+            if not frames:
+                raise RuntimeError(f"No frames in {self.video}")
+            height, width = frames[0].shape[:2]
+            mode = {"mode": None, "size": [width, height], "fps": fps}
+            return [{**mode, "read_ms": round(read_ms, 3)}], frames
+
+        cap = Loader(self.app).open_camera()
+        if cap is None:
+            raise RuntimeError("No camera found")
+        modes = []
+        try:
+            for width, height, fps in CAMERA_MODES:
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+                cap.set(cv2.CAP_PROP_FPS, fps)
+                self._read(cap, 5)  # let the new mode settle
+                grabbed, delivered, read_ms = self._read(cap, fps)
+                if not grabbed:
+                    continue
+                size = list(grabbed[0].shape[1::-1])
+                modes.append(
+                    {
+                        "mode": [width, height, fps],
+                        "size": size,
+                        "fps": round(delivered, 1),
+                        "read_ms": round(read_ms, 3),
+                    }
+                )
+            if not modes:
+                raise RuntimeError("The camera delivered no frames")
+            largest = max(modes, key=lambda m: (m["size"][0] * m["size"][1], m["fps"]))
+            width, height, fps = largest["mode"]
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            cap.set(cv2.CAP_PROP_FPS, fps)
+            frames, _, _ = self._read(cap, self.frames)
+        finally:
+            cap.release()
+        return modes, frames
+
+    def _track(self, frames: list, width: int):
+        """
+        Run a fresh landmarker over `frames` as the capture thread would.
+        :return: Wall and CPU ms per frame, landmarks per frame (None
+            without a face).
+        """
+        tracker = _Landmarker(self.app)
+        options = tracker.load_model_options(
+            resource_path("src/render/model/face_landmarker.task"),
+            blendshapes=self.data.get("FEATURE_SOURCE") == "blendshapes",
+        )
+        landmarker = tracker.create_face_landmarker(options)
+        preprocessor = FramePreprocessor("pixels", width)
+        points = []
+        wall = cpu = 0.0
+        try:
+            for index, frame in enumerate(frames):
+                wall_start, cpu_start = time.perf_counter(), time.process_time()
+                rgb = preprocessor.process(frame)
+                image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+                results = landmarker.detect_for_video(image, index * 33)
+                wall += time.perf_counter() - wall_start
+                cpu += time.process_time() - cpu_start
+                faces = results.face_landmarks if results else None
+                points.append(
+                    np.array([(p.x, p.y) for p in faces[0]]) if faces else None
+                )
+        finally:
+            landmarker.close()
+        count = max(len(frames), 1)
+        return wall / count * 1000, cpu / count * 1000, points
+
+    def measure_landmarker(self, frames: list) -> list:
+        """
+        :return: Per input width: wall/CPU ms per frame and the mean
+            landmark shift against camera-size input.
+        """
+        reference = None
+        results = []
+        for width in INPUT_WIDTHS:
+            if width and width >= frames[0].shape[1]:
+                continue  # would not downscale
+            wall_ms, cpu_ms, points = self._track(frames, width)
+            if reference is None:
+                reference = points
+            shifts = [
+                np.linalg.norm(p - r, axis=1).mean()
+                for p, r in zip(points, reference)
+                if p is not None and r is not None
+            ]
+            results.append(
+                {
+                    "width": width,
+                    "wall_ms": round(wall_ms, 3),
+                    "cpu_ms": round(cpu_ms, 3),
+                    "error": round(float(np.mean(shifts)), 5) if shifts else None,
+                }
+            )
+        if all(r["error"] is None for r in results):
+            self.logger.LogExit(
+                "measure_landmarker",
+                "No face found; input width is chosen by cost alone",
+                custom=True,
+            )
+        return results
+
+    def measure_threads(self, frames: list, width: int) -> list:
+        """
+        Tracking cost per OpenCV thread count (MediaPipe's own pool is not
+        configurable from Python).
+        """
+        cores = os.cpu_count() or 1
+        original = cv2.getNumThreads()
+        results = []
+        try:
+            for threads in sorted({1, 2, 4, cores}):
+                if threads > cores:
+                    continue
+                cv2.setNumThreads(threads)
+                wall_ms, cpu_ms, _ = self._track(frames, width)
+                results.append(
+                    {
+                        "threads": threads,
+                        "wall_ms": round(wall_ms, 3),
+                        "cpu_ms": round(cpu_ms, 3),
+                    }
+                )
+        finally:
+            cv2.setNumThreads(original)
+        return results
+
+    def _stream(self) -> dict:
+        """Synthetic head motion and talking, so physics has work to do."""
+        t = np.arange(0, self.frames / self.target_fps + 1.0, 1 / self.target_fps)
+        keys = list(Params.PARAMETER_KEYS)
+        values = np.tile(Params().values, (len(t), 1))
+        motion = {
+            "AngleX": 20 * np.sin(2 * np.pi * 0.5 * t),
+            "AngleY": 10 * np.sin(2 * np.pi * 0.3 * t),
+            "AngleZ": 8 * np.sin(2 * np.pi * 0.2 * t),
+            "MouthOpenY": 0.5 + 0.5 * np.sin(2 * np.pi * 2.0 * t),
+        }
+        for key, value in motion.items():
+            values[:, keys.index(key)] = value
+        return {"t": t, "values": values, "keys": keys, "smoothed": True}
+
+    def measure_render(self) -> list:
+        """Offscreen render cost of the model per window scale."""
+        model_list = self.config.recv().get("ModelList", {})
+        entry = model_list[self.model or next(iter(model_list))]
+        renderer = OfflineRenderer(
+            str(Path("media") / entry["FullPath"]),
+            self.settings["display"],
+            self.target_fps,
+            self.data,
+            self.settings,
+        )
+        return renderer.benchmark(self._stream(), RENDER_SCALES, self.frames)
+
+    # ---------- selection ----------
+
+    def pick_input(self, landmarker: list) -> dict:
+        """Cheapest input width within max_error of camera-size input."""
+        accurate = [
+            m for m in landmarker if m["error"] is None or m["error"] <= self.max_error
+        ]
+        return min(accurate or landmarker, key=lambda m: m["cpu_ms"])
+
+    def _camera_mode(self, camera: list, width: int, fps: int) -> dict:
+        wide = [m for m in camera if m["size"][0] >= width] or camera
+        fast = [m for m in wide if m["fps"] >= 0.9 * fps]
+        if fast:
+            # Smallest frames, then the lowest requested rate that keeps up
+            return min(
+                fast,
+                key=lambda m: (m["size"][0] * m["size"][1], (m["mode"] or [0] * 3)[2]),
+            )
+        return max(wide, key=lambda m: m["fps"])
+
+    def choose(self, camera: list, tracking: dict, threads: list, render: list):
+        """
+        Highest frame rate, then largest window, whose CPU time per second
+        (render + camera reads + tracking) fits the budget and whose frame
+        times fit the frame interval.
+        :return: Settings for profile.json and the estimate behind them.
+        """
+        thread = min(threads, key=lambda m: m["cpu_ms"]) if threads else tracking
+        width = tracking["width"] or max(m["size"][0] for m in camera)
+        budget = self.cpu_budget * 1000
+        steps = [self.target_fps] + [f for f in FPS_STEPS if f < self.target_fps]
+
+        choice = None
+        for fps in steps:
+            mode = self._camera_mode(camera, width, fps)
+            track_fps = min(fps, mode["fps"])
+            for scale in render:
+                cost = fps * scale["cpu_ms"] + track_fps * (
+                    thread["cpu_ms"] + mode["read_ms"]
+                )
+                if (
+                    cost <= budget
+                    and scale["wall_ms"] <= 800 / fps
+                    and thread["wall_ms"] <= 1000 / track_fps
+                ):
+                    choice = fps, mode, scale, cost
+                    break
+            if choice:
+                break
+        over_budget = choice is None
+        if over_budget:
+            fps, scale = steps[-1], render[-1]
+            mode = self._camera_mode(camera, width, fps)
+            cost = fps * scale["cpu_ms"] + min(fps, mode["fps"]) * (
+                thread["cpu_ms"] + mode["read_ms"]
+            )
+            choice = fps, mode, scale, cost
+        fps, mode, scale, cost = choice
+
+        smoothing = self.settings.get("Smoothing", {})
+        exponent = REFERENCE_FPS / fps  # same time constant at the new rate
+        tracking_settings = {
+            "input_width": tracking["width"],
+            "threads": thread.get("threads", 0),
+        }
+        if mode["mode"]:
+            tracking_settings["camera"] = mode["mode"]
+        return {
+            "settings": {
+                "CapFPS": {"capFps": True, "CapFpsValue": fps},
+                "display": scale["size"],
+                "Smoothing": {
+                    "factor": round(smoothing.get("factor", 0.5) ** exponent, 3),
+                    "bust": round(smoothing.get("bust", 0.7) ** exponent, 3),
+                },
+                "Tracking": tracking_settings,
+            },
+            "estimate": {
+                "cpu_ms_per_second": round(cost, 1),
+                "cpu_cores": round(cost / 1000, 3),
+                "render_ms": scale["wall_ms"],
+                "tracking_ms": thread["wall_ms"],
+                "over_budget": over_budget,
+            },
+        }
+
+    def run(self) -> dict:
+        """
+        Measure, choose and save profile.json.
+        :return: The profile, or None when tuning failed.
+        """
+        try:
+            start = time.perf_counter()
+            camera, frames = self.measure_camera()
+            self.logger.logging.info("Camera modes: %s", camera)
+            landmarker = self.measure_landmarker(frames)
+            self.logger.logging.info("Landmarker: %s", landmarker)
+            tracking = self.pick_input(landmarker)
+            threads = self.measure_threads(frames, tracking["width"])
+            self.logger.logging.info("Threads: %s", threads)
+            render = self.measure_render()
+            self.logger.logging.info("Render: %s", render)
+
+            profile = {
+                "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "machine": {
+                    "platform": platform.platform(),
+                    "processor": platform.processor(),
+                    "cpus": os.cpu_count(),
+                },
+                "source": self.video or "camera",
+                "target": {"fps": self.target_fps, "cpu_budget": self.cpu_budget},
+                "measurements": {
+                    "camera": camera,
+                    "landmarker": landmarker,
+                    "threads": threads,
+                    "render": render,
+                },
+                **self.choose(camera, tracking, threads, render),
+            }
+            profile["seconds"] = round(time.perf_counter() - start, 1)
+            self.config.save_profile(profile)
+            self.logger.logging.info("Profile saved: %s", profile["settings"])
+            return profile
+        except Exception as e:
+            self.logger.LogExit("run", e)
+            return None
+
+
+def autotune(**kwargs):
+    """Process target: tune and save the profile (see AutoTuner)."""
+    return AutoTuner(**kwargs).run()
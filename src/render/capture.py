@@ -1,15 +1,19 @@
 from .loader import Loader
 from .landmarker import LandmarkerManager
-from .parameter import ParameterManager
+from .parameter import ParameterManager, compile_parameter
+from .preprocess import FramePreprocessor, mirror_indices
+from .scheduler import InferenceScheduler
 from cv2_enumerate_cameras import enumerate_cameras as ec
 from ..utils import Logger, resource_path
 from typing import TYPE_CHECKING
 import cv2
-import numpy as np
 import mediapipe as mp
 import threading
 import time
 
+# Optional body models, downloaded into src/render/model/ (see readme)
+BODY_MODELS = {"pose": "pose_landmarker_lite.task", "hands": "hand_landmarker.task"}
+
 if TYPE_CHECKING:
     from .module.param import Params
 
@@ -19,14 +23,19 @@ class Capture(Loader, LandmarkerManager, ParameterManager):
         self.app = app
         self.logger = Logger("Capture")
         self.lock = threading.Lock()
+        self.landmarker = None
+        self.scheduler = None  # readable by the HUD while tracking runs
+        self.ready = threading.Event()
         self.LandmarkerManager = LandmarkerManager(app=app)
         self.ParameterManager = ParameterManager(app=app)
         self.loader = Loader(app=app)
 
     def start_capture(self, params: "Params" = None):
-
+        cap = preprocessor = scheduler = None
         try:
-            data = self.jsonloader()
+            watcher = getattr(self.app, "config_watcher", None)
+            source = watcher.snapshot.parameter if watcher else self.jsonloader()
+            data = source
             if not data:
                 self.logger.LogExit(
                     "start_capture",
@@ -34,9 +43,26 @@ class Capture(Loader, LandmarkerManager, ParameterManager):
                     custom=True,
                 )
                 self.app.running = False
+            self.compile_mappings(data)
+
+            mirror = data.get("MIRROR", "pixels")
+            if mirror == "landmarks" and self.blendshapes:
+                # Blendshape names and pose are side-specific: mirror pixels
+                mirror = "pixels"
+            tracking = watcher.snapshot.user.get("Tracking", {}) if watcher else {}
+            if tracking.get("threads"):
+                cv2.setNumThreads(int(tracking["threads"]))
+            preprocessor = FramePreprocessor(
+                mirror, int(tracking.get("input_width", 0))
+            )
+            if preprocessor.mirror == "landmarks":
+                data = mirror_indices(data)
+                self.mirror_landmarks(True)
 
             model_path = resource_path("src/render/model/face_landmarker.task")
-            options = self.load_model_options(model_path)
+            options = self.load_model_options(
+                model_path, blendshapes=self.feature_source == "blendshapes"
+            )
             if not options:
                 self.logger.LogExit(
                     "start_capture",
@@ -45,43 +71,199 @@ class Capture(Loader, LandmarkerManager, ParameterManager):
                 )
                 self.app.running = False
 
-            threading.Thread(target=self.load_landmarker_task, args=(options,)).start()
+            supervisor = getattr(self.app, "supervisor", None)
+            if supervisor:
+                supervisor.on_stop.append(self.ready.set)
+                supervisor.start(
+                    "LandmarkerLoad",
+                    self.load_landmarker_task,
+                    options,
+                    stage="landmarker",
+                    timeout=2.0,
+                )
+            else:
+                threading.Thread(
+                    target=self.load_landmarker_task, args=(options,), daemon=True
+                ).start()
 
-            cap = self.open_camera()
+            video = getattr(self.app, "video", None)
+            if video:
+                cap = self.open_video(video)
+            else:
+                cap = self.open_camera(tracking.get("camera"))
+            memory = getattr(self.app, "memory", None)
+            if memory:
+                memory.checkpoint("opencv")
             if cap is None:
                 self.logger.LogExit(
                     "start_capture", "Failed to Detect Camera.", custom=True
                 )
-                self.app.running = False
+                self._fail("Failed to Detect Camera.")
 
+            wait_start = time.perf_counter()
             landmarker = self.wait_until_ready()
+            if landmarker is None:
+                return
+            self.logger.logging.info(
+                "Landmarker ready, camera waited %.0f ms",
+                (time.perf_counter() - wait_start) * 1000,
+            )
+            settings = watcher.snapshot.user.get("Inference", {}) if watcher else {}
+            scheduler = self._build_scheduler(landmarker, settings)
+            self.scheduler = scheduler
+            self.compile_body_mappings(data, preprocessor.mirror == "landmarks")
+            self.apply_limits(params)
+            if memory:
+                memory.checkpoint("mediapipe")
+            gc_tuner = getattr(self.app, "gc_tuner", None)
+            if gc_tuner:
+                gc_tuner.request_freeze("landmarker")
+            latency = getattr(self.app, "latency", None)
+            power = getattr(self.app, "power", None)
+            vmc = getattr(self.app, "vmc_sender", None)
+            camera_fps = None
+            last_inference = 0.0
+            video_fps = cap.get(cv2.CAP_PROP_FPS) if video else 0
+            default_fps = cap.get(cv2.CAP_PROP_FPS) or 30
+            video_start = time.perf_counter()
+            sample_id = -1
 
             while self.app.running:
-                ret, frame = cap.read()
+                if watcher and watcher.snapshot.parameter is not source:
+                    source = watcher.snapshot.parameter
+                    data = self._reload_parameter(source, preprocessor.mirror, data)
+                    self.apply_limits(params)
+                if video_fps:
+                    # Play the file back in real time
+                    due = video_start + cap.get(cv2.CAP_PROP_POS_FRAMES) / video_fps
+                    time.sleep(max(0.0, due - time.perf_counter()))
+
+                ret, frame = cap.read(preprocessor.capture)
+                timestamp = time.perf_counter()
                 if not ret:
                     self.logger.LogExit(
                         "start_capture", "Failed to read frame", custom=True
                     )
                     self.app.running = False
                     break
+                if power:
+                    profile = power.profile()
+                    if not video and profile.get("camera_fps") != camera_fps:
+                        camera_fps = profile.get("camera_fps")
+                        cap.set(cv2.CAP_PROP_FPS, camera_fps or default_fps)
+                    inference_fps = profile.get("inference_fps")
+                    if inference_fps and timestamp - last_inference < 1 / inference_fps:
+                        continue
+                    last_inference = timestamp
+                if latency:
+                    video_time = (
+                        cap.get(cv2.CAP_PROP_POS_MSEC) / 1000 if video else None
+                    )
+                    sample_id = latency.begin(timestamp, video_time)
 
-                frame = cv2.flip(frame, 1)
-                np_frame = np.array(frame)
-                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=np_frame)
+                rgb = preprocessor.process(frame)
+                if memory and preprocessor.frames == 1:
+                    memory.account("opencv frame buffers", preprocessor.bytes_allocated)
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
 
-                results = landmarker.detect_for_video(mp_image, int(time.time() * 1000))
+                fresh = scheduler.run(mp_image, int(timestamp * 1000))
+                if latency:
+                    latency.mark(sample_id, "inference")
+                if "pose" in fresh and self.body.read_pose(scheduler.result("pose")):
+                    self.update_body_params(params, self.body.body)
+                if "hands" in fresh:
+                    self.body.read_hands(scheduler.result("hands"))
+                    self.update_body_params(params, self.body.hands)
+                results = scheduler.result("face") if "face" in fresh else None
+                if power and results is not None:
+                    power.on_face(bool(results.face_landmarks), timestamp)
 
-                if results and results.face_landmarks:
+                pushed = False
+                if self.blendshapes and results:
+                    if self.process_blendshape_values(results) and params:
+                        if latency:
+                            latency.mark(sample_id, "features")
+                        self.update_params(params, timestamp=timestamp)
+                        pushed = True
+                elif results and results.face_landmarks:
                     landmarks = results.face_landmarks[0]
                     values = self.process_tracking_values(landmarks, data)
+                    if latency:
+                        latency.mark(sample_id, "features")
                     if values and params:
-                        self.update_params(params, values, data)
+                        self.update_params(params, values, data, timestamp)
+                        pushed = True
+
+                if latency and pushed:
+                    latency.mark(sample_id, "push")
+                    params.sample_id = sample_id
+                if vmc and pushed:
+                    vmc.send(params.target, timestamp)
 
                 time.sleep(0.01)
 
         except Exception as e:
             self.logger.LogExit("start_capture", e)
-            self.app.running = False
+            self._fail(e)
         finally:
             if cap:
                 cap.release()
+            if preprocessor:
+                self.logger.logging.info("Preprocess buffers: %s", preprocessor.stats())
+            if scheduler:
+                self.scheduler = None
+                # The face landmarker is closed at teardown (close_landmarker)
+                scheduler.close(keep=("face",))
+                self.logger.logging.info("Inference: %s", scheduler.stats())
+
+    def _build_scheduler(self, landmarker, settings: dict) -> InferenceScheduler:
+        """
+        Face every `face` frames, plus pose and hands when their rate is set
+        and their model file exists.
+        :param settings: The "Inference" block of config.json.
+        """
+        scheduler = InferenceScheduler(settings.get("budget_ms", 20.0))
+        scheduler.add("face", landmarker, settings.get("face", 1))
+        for kind, file in BODY_MODELS.items():
+            every = settings.get(kind, 0)
+            if not every:
+                continue
+            model_path = resource_path(f"src/render/model/{file}")
+            body = self.create_body_landmarker(kind, model_path)
+            if body:
+                scheduler.add(kind, body, every)
+        return scheduler
+
+    def _fail(self, error) -> None:
+        """Stop the app and report the failure for the exit code."""
+        supervisor = getattr(self.app, "supervisor", None)
+        if supervisor:
+            supervisor.fail(threading.current_thread().name, error)
+        self.app.running = False
+
+    def _reload_parameter(self, data, mirror: str, current):
+        """
+        Recompile MAPPINGS and landmark indices from a reloaded parameter.json.
+        The landmarker keeps its FEATURE_SOURCE until a restart. A file that
+        fails to compile is logged and the previous mappings stay active.
+        :param current: Landmark index data in use, returned on failure.
+        """
+        try:
+            feature_source = data.get("FEATURE_SOURCE", "landmarks")
+            if feature_source != self.feature_source:
+                self.logger.LogExit(
+                    "_reload_parameter",
+                    "FEATURE_SOURCE applies after a restart",
+                    custom=True,
+                )
+                data = {**data, "FEATURE_SOURCE": self.feature_source}
+            staged, data = compile_parameter(data, mirror == "landmarks")
+            self.mapping = staged.mapping
+            self.blendshapes = staged.blendshapes
+            self.body = staged.body
+            return data
+        except Exception as e:
+            self.logger.LogExit(
+                "_reload_parameter", f"Keeping previous mappings: {e}", custom=True
+            )
+            return current
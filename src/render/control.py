@@ -0,0 +1,343 @@
+# control.py
+from ..utils import Logger
+from .module.param import Params
+from collections import deque
+import asyncio, json, math, threading, time
+
+try:
+    import websockets
+except ImportError:  # optional: control API
+    websockets = None
+
+API_NAME = "LunaStudioPublicAPI"
+API_VERSION = "1.0"
+
+
+class APIError(Exception):
+    def __init__(self, error_id: int, message: str):
+        super().__init__(message)
+        self.error_id = error_id
+
+
+class ControlServer:
+    """
+    WebSocket control API on its own asyncio thread, modeled on the
+    VTube Studio plugin API: requests are JSON objects with apiName,
+    apiVersion, requestID, messageType and data; every request gets a
+    "<type>Response" (or "APIError") echoing its requestID.
+
+    Nothing here touches the model or Params. Injected batches are merged
+    into copy-on-write override tables: one for tracking inputs (AngleX,
+    MouthOpenY, ...), overlaid on the model mapping's inputs, and one for
+    Live2D parameter ids, applied after the mapping. Expression and model commands are
+    queued. The render thread picks everything up in apply_inputs() and
+    apply(), so neither side waits on the other.
+    """
+
+    # Injected values without a refresh are dropped after this many seconds
+    HOLD = 1.0
+
+    def __init__(self, app, settings: dict):
+        self.app = app
+        self.logger = Logger("Control")
+        self.host = settings.get("host", "127.0.0.1")
+        self.port = int(settings.get("port", 8002))
+        self.hold = float(settings.get("hold", self.HOLD))
+        self._param_keys = set(Params.PARAMETER_KEYS)
+
+        # id -> (value, weight, mode, expires); replaced, never mutated in place
+        self.inputs = {}
+        self.overrides = {}
+        self._index = (None, {})
+        self.commands = deque()
+        self.clients = 0
+        self.started = time.perf_counter()
+        self.messages = 0
+        self.values = 0
+        self.errors = 0
+        self.apply_time = 0.0
+        self.apply_calls = 0
+        self._lock = threading.Lock()
+        self._handlers = {
+            "APIStateRequest": self._api_state,
+            "StatisticsRequest": self._statistics,
+            "InputParameterListRequest": self._parameter_list,
+            "InjectParameterDataRequest": self._inject,
+            "ExpressionStateRequest": self._expression_state,
+            "ExpressionActivationRequest": self._expression_activation,
+            "HotkeyTriggerRequest": self._hotkey_trigger,
+            "AvailableModelsRequest": self._available_models,
+            "ModelLoadRequest": self._model_load,
+            "ProfileCaptureRequest": self._profile_capture,
+        }
+
+    # ---------- server thread ----------
+
+    def run(self) -> None:
+        """Thread target: serve until the app stops."""
+        try:
+            if websockets is None:
+                raise RuntimeError("The control API needs the 'websockets' package")
+            asyncio.run(self._serve())
+        except Exception as e:
+            # A port in use or a missing package stops the app
+            self.logger.LogExit("run", e)
+            supervisor = getattr(self.app, "supervisor", None)
+            if supervisor:
+                supervisor.fail(threading.current_thread().name, e)
+            self.app.running = False
+
+    async def _serve(self) -> None:
+        async with websockets.serve(self._client, self.host, self.port):
+            self.logger.logging.info("Control API on ws://%s:%d", self.host, self.port)
+            supervisor = getattr(self.app, "supervisor", None)
+            if supervisor:
+                await asyncio.to_thread(supervisor.stopping.wait)
+                return
+            while self.app.running:
+                await asyncio.sleep(0.25)
+
+    async def _client(self, socket) -> None:
+        self.clients += 1
+        try:
+            async for message in socket:
+                await socket.send(self.handle(message))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clients -= 1
+
+    def handle(self, message) -> str:
+        """
+        Process one request.
+        :return: Encoded response.
+        """
+        request_id, message_type = None, "APIError"
+        try:
+            request = json.loads(message)
+            request_id = request.get("requestID")
+            if request.get("apiName") != API_NAME:
+                raise APIError(1, f"apiName must be {API_NAME!r}")
+            handler = self._handlers.get(request.get("messageType"))
+            if handler is None:
+                raise APIError(2, f"Unknown messageType {request.get('messageType')!r}")
+            data = handler(request.get("data") or {})
+            message_type = request["messageType"][: -len("Request")] + "Response"
+        except APIError as e:
+            data = {"errorID": e.error_id, "message": str(e)}
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            data = {"errorID": 3, "message": f"Malformed request: {e}"}
+
+        if message_type == "APIError":
+            self.errors += 1
+        self.messages += 1
+        return json.dumps(
+            {
+                "apiName": API_NAME,
+                "apiVersion": API_VERSION,
+                "timestamp": int(time.time() * 1000),
+                "requestID": request_id,
+                "messageType": message_type,
+                "data": data,
+            }
+        )
+
+    # ---------- request handlers ----------
+
+    def _api_state(self, data):
+        return {
+            "active": True,
+            "vTubeStudioVersion": None,
+            "currentSessionAuthenticated": True,
+        }
+
+    def _statistics(self, data):
+        stats = self.stats()
+        stats["framerate"] = round(1.0 / max(self.app.frame_interval, 1e-6), 1)
+        stats["powerState"] = self.app.power_state
+        vmc = getattr(self.app, "VMCReceiver", None)
+        if vmc:
+            stats["vmc"] = vmc.stats()
+        return stats
+
+    def _parameter_list(self, data):
+        mapping = getattr(self.app, "model_mapping", None)
+        return {
+            "inputParameters": list(Params.PARAMETER_KEYS),
+            "modelParameters": list(mapping.targets) if mapping else [],
+        }
+
+    def _inject(self, data):
+        """
+        data: {"mode": "set"|"add", "parameterValues": [{"id", "value", "weight"?}]}
+        Tracking inputs (Params keys) are overlaid on the model mapping's
+        inputs; any other id is applied to the model after the mapping.
+        """
+        mode = data.get("mode", "set")
+        if mode not in ("set", "add"):
+            raise APIError(4, f"Unknown mode {mode!r}")
+        inputs, overrides = {}, {}
+        expires = time.perf_counter() + self.hold
+        for entry in data["parameterValues"]:
+            pid, value = entry["id"], float(entry["value"])
+            weight = float(entry.get("weight", 1.0))
+            if not (math.isfinite(value) and math.isfinite(weight)):
+                raise APIError(3, f"Non-finite value for {pid!r}")
+            weight = min(max(weight, 0.0), 1.0)
+            table = inputs if pid in self._param_keys else overrides
+            table[pid] = (value, weight, mode, expires)
+
+        with self._lock:
+            if inputs:
+                self.inputs = {**self.inputs, **inputs}
+            if overrides:
+                self.overrides = {**self.overrides, **overrides}
+        self.values += len(inputs) + len(overrides)
+        return {}
+
+    def _expression_state(self, data):
+        player = self.app.expressions
+        if not player:
+            return {"expressions": [], "motions": []}
+        library = player.library
+        return {
+            "expressions": [
+                {"file": name, "active": name in player.active}
+                for name in library.expressions
+            ],
+            "motions": list(library.motions),
+        }
+
+    def _expression_activation(self, data):
+        name = data["expressionFile"]
+        if name.endswith(".exp3.json"):
+            name = name[: -len(".exp3.json")]
+        player = self.app.expressions
+        if not player or name not in player.library.expressions:
+            raise APIError(5, f"Unknown expression {name!r}")
+        self.commands.append(("expression", name, bool(data.get("active", True))))
+        return {}
+
+    def _hotkey_trigger(self, data):
+        name = data["hotkeyID"]
+        player = self.app.expressions
+        if not player or player.resolve(name) is None:
+            raise APIError(5, f"Unknown expression or motion {name!r}")
+        self.commands.append(("trigger", name, None))
+        return {"hotkeyID": name}
+
+    def _available_models(self, data):
+        models = self.app.config_internal.get("ModelList", {})
+        current = getattr(self.app, "model_key", None)
+        return {
+            "numberOfModels": len(models),
+            "availableModels": [
+                {"modelID": key, "modelName": key, "modelLoaded": key == current}
+                for key in models
+            ],
+        }
+
+    def _model_load(self, data):
+        key = data["modelID"]
+        if key not in self.app.config_internal.get("ModelList", {}):
+            raise APIError(6, f"Unknown model {key!r}")
+        self.commands.append(("model", key, None))
+        return {"modelID": key}
+
+    def _profile_capture(self, data):
+        """
+        data: {"seconds"?: float, "mode"?: "sample"|"cprofile"}
+        The capture starts on the render thread with the next frame.
+        """
+        profiler = getattr(self.app, "profiler", None)
+        if not profiler:
+            raise APIError(7, "Profiler unavailable")
+        if profiler.active:
+            raise APIError(7, "A profile capture is already running")
+        mode = data.get("mode", profiler.mode)
+        if mode not in ("sample", "cprofile"):
+            raise APIError(4, f"Unknown mode {mode!r}")
+        seconds = float(data.get("seconds", profiler.seconds))
+        self.commands.append(("profile", mode, seconds))
+        return {"mode": mode, "seconds": seconds, "directory": profiler.directory}
+
+    # ---------- render thread ----------
+
+    def _expire(self, now: float) -> None:
+        with self._lock:
+            self.inputs = {k: v for k, v in self.inputs.items() if v[3] >= now}
+            self.overrides = {k: v for k, v in self.overrides.items() if v[3] >= now}
+
+    def apply_inputs(self, mapping, now: float) -> None:
+        """
+        Overlay injected tracking inputs on the model mapping's input vector
+        (render thread, after load_attrs). Params and its smoothing state
+        are left untouched.
+        """
+        if not self.inputs:
+            return
+        if self._index[0] is not mapping:
+            self._index = (mapping, {k: i for i, k in enumerate(mapping.inputs)})
+        index, values = self._index[1], mapping.input_values
+        expired = False
+        for key, (value, weight, mode, expires) in self.inputs.items():
+            i = index.get(key)
+            if expires < now:
+                expired = True
+            elif i is None:
+                continue
+            elif mode == "add":
+                values[i] += value * weight
+            else:
+                values[i] += (value - values[i]) * weight
+        if expired:
+            self._expire(now)
+
+    def apply(self, model, now: float) -> None:
+        """
+        Run queued commands and apply Live2D overrides. Call on the render
+        thread after the model mapping has set this frame's values.
+        """
+        start = time.perf_counter()
+        while self.commands:
+            kind, name, active = self.commands.popleft()
+            player = self.app.expressions
+            if kind == "model":
+                self.app._load_model(name)
+                model = self.app.model
+            elif kind == "profile":
+                self.app._start_profile(active, name)
+            elif kind == "expression":
+                if player and (name in player.active) != active:
+                    player.trigger(name, now)
+            elif player:
+                player.trigger(name, now)
+
+        expired = False
+        for pid, (value, weight, mode, expires) in self.overrides.items():
+            if expires < now:
+                expired = True
+            elif mode == "add":
+                model.AddParameterValue(pid, value * weight)
+            else:
+                model.SetParameterValue(pid, value, weight)
+        if expired:
+            self._expire(now)
+
+        self.apply_time += time.perf_counter() - start
+        self.apply_calls += 1
+
+    def stats(self) -> dict:
+        """Message counters and render-side cost."""
+        elapsed = max(time.perf_counter() - self.started, 1e-6)
+        return {
+            "clients": self.clients,
+            "messages": self.messages,
+            "messagesPerSecond": round(self.messages / elapsed, 1),
+            "values": self.values,
+            "errors": self.errors,
+            "overrides": len(self.inputs) + len(self.overrides),
+            "applyMicroseconds": round(
+                self.apply_time / max(self.apply_calls, 1) * 1e6, 2
+            ),
+        }
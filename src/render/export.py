@@ -0,0 +1,478 @@
+# export.py
+from .image.opengl_function import create_canvas_framebuffer
+from .image.image import Image
+from .module.mapping import MappingPipeline, DEFAULT_MODEL_MAPPINGS
+from .parameter import tracked_model_mappings
+from .module.param import Params
+from ..utils import Logger
+from multiprocessing import shared_memory
+from pathlib import Path
+import multiprocessing as mp
+import numpy as np
+import OpenGL.GL as GL
+import live2d.v3 as live2d
+import pygame, subprocess, threading, ctypes, queue, shutil, time, os
+
+# Encoder arguments per container and whether the format keeps alpha
+CODECS = {
+    ".mov": (
+        ["-c:v", "prores_ks", "-profile:v", "4444", "-pix_fmt", "yuva444p10le"],
+        True,
+    ),
+    ".webm": (
+        ["-c:v", "libvpx-vp9", "-pix_fmt", "yuva420p", "-crf", "20", "-b:v", "0"],
+        True,
+    ),
+    ".mkv": (["-c:v", "ffv1", "-pix_fmt", "bgra"], True),
+    ".mp4": (["-c:v", "libx264", "-pix_fmt", "yuv420p", "-crf", "18"], False),
+}
+IMAGE_SUFFIXES = (".png", ".tif", ".tiff")
+
+
+def unpremultiply(rgba: np.ndarray) -> np.ndarray:
+    """
+    Convert premultiplied RGBA (as the Live2D renderer blends) to straight
+    alpha, in place. Fully transparent pixels stay black.
+    """
+    alpha = rgba[..., 3:4].astype(np.uint16)
+    color = rgba[..., :3].astype(np.uint16) * 255
+    color //= np.maximum(alpha, 1)
+    np.minimum(color, 255, out=color)
+    rgba[..., :3] = color
+    return rgba
+
+
+def _write_images(shm_name, shape, tasks, free, pattern):
+    """
+    Image sequence worker: flip, unpremultiply and save slots until None.
+    """
+    from PIL import Image as PILImage
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slots = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    while (task := tasks.get()) is not None:
+        slot, index = task
+        frame = unpremultiply(slots[slot][::-1].copy())
+        free.put(slot)
+        PILImage.fromarray(frame, "RGBA").save(pattern % index, compress_level=1)
+    del slots
+    shm.close()
+
+
+class ImageSequenceSink:
+    """
+    Writes frames as numbered RGBA images from worker processes.
+
+    Frames are copied into a ring of shared-memory slots; workers encode
+    and write them, so PNG compression never runs in the render process.
+    """
+
+    def __init__(self, pattern: str, width: int, height: int, workers: int = 0):
+        """
+        :param pattern: printf-style path such as "out/frame_%06d.png".
+        :param workers: Worker processes (default: CPU count - 1).
+        """
+        Path(pattern).parent.mkdir(parents=True, exist_ok=True)
+        workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        count = workers * 2
+        self.shape = (count, height, width, 4)
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=int(np.prod(self.shape))
+        )
+        self.slots = np.ndarray(self.shape, dtype=np.uint8, buffer=self.shm.buf)
+        ctx = mp.get_context("spawn")
+        self.tasks = ctx.Queue()
+        self.free = ctx.Queue()
+        for slot in range(count):
+            self.free.put(slot)
+        self.workers = [
+            ctx.Process(
+                target=_write_images,
+                args=(self.shm.name, self.shape, self.tasks, self.free, pattern),
+                daemon=True,
+            )
+            for _ in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+        self.frames = 0
+        self.wait = 0.0
+
+    def submit(self, frame: np.ndarray) -> None:
+        start = time.perf_counter()
+        slot = self.free.get()
+        self.wait += time.perf_counter() - start
+        self.slots[slot] = frame
+        self.tasks.put((slot, self.frames))
+        self.frames += 1
+
+    def close(self) -> None:
+        for _ in self.workers:
+            self.tasks.put(None)
+        for worker in self.workers:
+            worker.join()
+        del self.slots
+        self.shm.close()
+        self.shm.unlink()
+
+
+class FFmpegSink:
+    """
+    Pipes raw RGBA frames to an ffmpeg process.
+
+    A writer thread feeds the pipe from a ring of buffers, so the render
+    loop only blocks when the encoder falls behind. Flipping and
+    unpremultiplying happen inside ffmpeg.
+    """
+
+    def __init__(self, path: str, width: int, height: int, fps: float, slots: int = 4):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg not found on PATH; export to .png instead")
+        codec, alpha = CODECS.get(Path(path).suffix.lower(), CODECS[".mov"])
+        # Opaque formats keep premultiplied colour, i.e. composited over black
+        filters = "vflip,unpremultiply=inplace=1" if alpha else "vflip"
+        self.process = subprocess.Popen(
+            [ffmpeg, "-y", "-loglevel", "error"]
+            + ["-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}"]
+            + ["-r", f"{fps:g}", "-i", "-", "-vf", filters, *codec, path],
+            stdin=subprocess.PIPE,
+        )
+        self.buffers = np.empty((slots, height, width, 4), dtype=np.uint8)
+        self.free = queue.Queue()
+        self.filled = queue.Queue()
+        for slot in range(slots):
+            self.free.put(slot)
+        self.error = None
+        self.thread = threading.Thread(
+            target=self._write, name="EncoderThread", daemon=True
+        )
+        self.thread.start()
+        self.frames = 0
+        self.wait = 0.0
+
+    def _write(self) -> None:
+        stdin = self.process.stdin
+        while (slot := self.filled.get()) is not None:
+            try:
+                stdin.write(self.buffers[slot].data)
+            except OSError as e:
+                self.error = e
+            self.free.put(slot)
+
+    def submit(self, frame: np.ndarray) -> None:
+        if self.error:
+            raise RuntimeError(f"ffmpeg stopped: {self.error}")
+        start = time.perf_counter()
+        slot = self.free.get()
+        self.wait += time.perf_counter() - start
+        self.buffers[slot] = frame
+        self.filled.put(slot)
+        self.frames += 1
+
+    def close(self) -> None:
+        self.filled.put(None)
+        self.thread.join()
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode}")
+
+
+def open_sink(output: str, width: int, height: int, fps: float):
+    """
+    :param output: Video file (.mov/.webm/.mkv/.mp4), image pattern
+        ("frames/%06d.png") or directory (PNG frames inside).
+    """
+    suffix = Path(output).suffix.lower()
+    if suffix in IMAGE_SUFFIXES:
+        pattern = output if "%" in output else output[: -len(suffix)] + "_%06d" + suffix
+        return ImageSequenceSink(pattern, width, height)
+    if not suffix:
+        return ImageSequenceSink(os.path.join(output, "%06d.png"), width, height)
+    return FFmpegSink(output, width, height, fps)
+
+
+class PBOReader:
+    """
+    Asynchronous framebuffer readback through a ring of pixel buffers.
+
+    glReadPixels into a PBO returns immediately; a frame is mapped and
+    handed to the sink `count - 1` frames later, once the GPU is done with
+    it, so the render loop never stalls on the transfer.
+    """
+
+    def __init__(self, width: int, height: int, count: int = 3):
+        self.width, self.height = width, height
+        self.size = width * height * 4
+        self.pbos = [int(GL.glGenBuffers(1)) for _ in range(count)]
+        for pbo in self.pbos:
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, pbo)
+            GL.glBufferData(GL.GL_PIXEL_PACK_BUFFER, self.size, None, GL.GL_STREAM_READ)
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+        self.pending = []
+        self.next = 0
+        self.map_time = 0.0
+
+    def read(self, sink) -> None:
+        """Queue a readback of the bound framebuffer; deliver the oldest one."""
+        pbo = self.pbos[self.next]
+        self.next = (self.next + 1) % len(self.pbos)
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, pbo)
+        GL.glReadPixels(
+            0,
+            0,
+            self.width,
+            self.height,
+            GL.GL_RGBA,
+            GL.GL_UNSIGNED_BYTE,
+            ctypes.c_void_p(0),
+        )
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+        self.pending.append(pbo)
+        if len(self.pending) == len(self.pbos):
+            self._deliver(self.pending.pop(0), sink)
+
+    def finish(self, sink) -> None:
+        while self.pending:
+            self._deliver(self.pending.pop(0), sink)
+
+    def _deliver(self, pbo: int, sink) -> None:
+        start = time.perf_counter()
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, pbo)
+        address = GL.glMapBufferRange(
+            GL.GL_PIXEL_PACK_BUFFER, 0, self.size, GL.GL_MAP_READ_BIT
+        )
+        try:
+            buffer = (ctypes.c_ubyte * self.size).from_address(
+                ctypes.cast(address, ctypes.c_void_p).value
+            )
+            frame = np.frombuffer(buffer, dtype=np.uint8).reshape(
+                self.height, self.width, 4
+            )
+            self.map_time += time.perf_counter() - start
+            sink.submit(frame)
+        finally:
+            GL.glUnmapBuffer(GL.GL_PIXEL_PACK_BUFFER)
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+
+    def release(self) -> None:
+        GL.glDeleteBuffers(len(self.pbos), self.pbos)
+
+
+def resample(stream: dict, fps: float):
+    """
+    Yield one Params-ordered value row per output frame.
+
+    Recorded streams are already smoothed and are interpolated linearly.
+    Raw tracked streams go through Params smoothing once per output frame,
+    with each sample held until the next, as in the live renderer.
+    """
+    keys = list(stream["keys"])
+    t = np.asarray(stream["t"], dtype=float)
+    values = np.asarray(stream["values"], dtype=float)
+    frames = int(t[-1] * fps) + 1 if len(t) else 0
+    times = np.arange(frames) / fps
+
+    if stream["smoothed"]:
+        row = np.empty(len(keys))
+        for now in times:
+            index = min(np.searchsorted(t, now, side="right"), len(t) - 1)
+            if index == 0 or t[index] <= now:
+                np.copyto(row, values[index])
+            else:
+                w = (now - t[index - 1]) / (t[index] - t[index - 1])
+                np.subtract(values[index], values[index - 1], out=row)
+                row *= w
+                row += values[index - 1]
+            yield keys, row
+        return
+
+    params = Params()
+    sample = -1
+    for now in times:
+        index = np.searchsorted(t, now, side="right") - 1
+        if index != sample and index >= 0:
+            params.set_targets(keys, values[index])
+            sample = index
+        params.update_params()
+        yield params.PARAMETER_KEYS, params.values
+
+
+class OfflineRenderer:
+    """
+    Renders a parameter stream offscreen as fast as the GPU allows.
+
+    The model is stepped with a fixed delta of 1/fps, so physics and
+    breathing are reproducible and independent of wall-clock time.
+    Frames are drawn into an FBO with a transparent clear, read back
+    through PBOReader and handed to a sink (encoder or image workers).
+    """
+
+    def __init__(
+        self,
+        model_json: str,
+        size: tuple,
+        fps: float,
+        data: dict,
+        settings: dict = None,
+        background: str = None,
+    ):
+        """
+        :param model_json: Path to the model's .model3.json.
+        :param size: Output (width, height).
+        :param data: parameter.json contents (MODEL_MAPPINGS).
+        :param settings: config.json contents ("Auto Breath", "Auto Blink").
+        :param background: Image drawn behind the model; transparent when None.
+        """
+        self.logger = Logger("Export")
+        self.model_json = model_json
+        self.width, self.height = size
+        self.fps = fps
+        self.settings = settings or {}
+        self.background_path = background
+        self.mapping = MappingPipeline(
+            tracked_model_mappings(
+                data.get("MODEL_MAPPINGS", DEFAULT_MODEL_MAPPINGS), data
+            ),
+            data,
+        )
+
+    def _init_gl(self):
+        pygame.init()
+        pygame.display.set_mode(
+            (self.width, self.height),
+            pygame.OPENGL | pygame.DOUBLEBUF | pygame.HIDDEN,
+        )
+        live2d.init()
+        live2d.glInit()
+        self.fbo, self.texture = create_canvas_framebuffer(self.width, self.height)
+        self.background = None
+        if self.background_path:
+            self.background = Image(self.background_path)
+
+        model = live2d.Model()
+        model.LoadModelJson(self.model_json)
+        model.CreateRenderer()
+        model.Resize(self.width, self.height)
+        ids = model.GetParameterIds()
+        # Targets the model lacks are skipped, as SetParameterValue does live
+        self.indices = [
+            (ids.index(target), i)
+            for i, target in enumerate(self.mapping.targets)
+            if target in ids
+        ]
+        self.model = model
+
+    def _release_gl(self):
+        self.model.DestroyRenderer()
+        live2d.dispose()
+        pygame.quit()
+
+    def _step(self, keys: list, row: np.ndarray) -> None:
+        model, dt, mapping = self.model, 1.0 / self.fps, self.mapping
+        model.LoadParameters()
+        model.UpdateMotion(dt)
+        model.SaveParameters()
+        if self.settings.get("Auto Blink", True):
+            model.UpdateBlink(dt)
+
+        mapping.load_array(row, keys)
+        output = mapping.evaluate()
+        for index, i in self.indices:
+            model.SetParameterValue(index, float(output[i]), 1.0)
+
+        if self.settings.get("Auto Breath", True):
+            model.UpdateBreath(dt)
+        model.UpdatePhysics(dt)
+        model.UpdatePose(dt)
+
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.fbo)
+        GL.glViewport(0, 0, self.width, self.height)
+        GL.glClearColor(0.0, 0.0, 0.0, 0.0)
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+        if self.background:
+            self.background.Draw()
+        model.Draw()
+
+    def run(self, stream: dict, output: str) -> dict:
+        """
+        Render `stream` (see recording.load_stream) into `output`.
+        :return: Stats with frame count and rendered frames/sec.
+        """
+        self._init_gl()
+        sink = open_sink(output, self.width, self.height, self.fps)
+        reader = PBOReader(self.width, self.height)
+        start = time.perf_counter()
+        frames = 0
+        try:
+            for keys, row in resample(stream, self.fps):
+                self._step(keys, row)
+                reader.read(sink)
+                frames += 1
+                if frames % 300 == 0:
+                    self.logger.logging.info(
+                        "%d frames, %.1f fps",
+                        frames,
+                        frames / (time.perf_counter() - start),
+                    )
+            reader.finish(sink)
+        finally:
+            GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
+            reader.release()
+            render_end = time.perf_counter()
+            sink.close()
+            end = time.perf_counter()
+            self._release_gl()
+
+        elapsed = end - start
+        stats = {
+            "frames": frames,
+            "seconds": round(elapsed, 2),
+            "fps": round(frames / elapsed, 1) if elapsed else 0.0,
+            "render_fps": round(frames / (render_end - start), 1) if frames else 0.0,
+            "readback_ms": round(reader.map_time / max(frames, 1) * 1000, 3),
+            "sink_wait_ms": round(sink.wait / max(frames, 1) * 1000, 3),
+        }
+        self.logger.logging.info("Exported %s: %s", output, stats)
+        return stats
+
+    def benchmark(self, stream: dict, scales: tuple, frames: int = 120) -> list:
+        """
+        Time drawing `stream` at each fraction of the output size, waiting
+        for the GPU every frame (no readback or encoding).
+        :return: Per scale: size and wall/CPU milliseconds per frame.
+        """
+        self._init_gl()
+        full = (self.width, self.height)
+        results = []
+        try:
+            for scale in scales:
+                self.width = max(2, round(full[0] * scale / 2) * 2)
+                self.height = max(2, round(full[1] * scale / 2) * 2)
+                self.model.Resize(self.width, self.height)
+                wall = cpu = 0.0
+                count = 0
+                for keys, row in resample(stream, self.fps):
+                    if count == frames:
+                        break
+                    wall_start, cpu_start = time.perf_counter(), time.process_time()
+                    self._step(keys, row)
+                    GL.glFinish()
+                    if count >= 10:  # skip warm-up (shader and texture uploads)
+                        wall += time.perf_counter() - wall_start
+                        cpu += time.process_time() - cpu_start
+                    count += 1
+                measured = max(count - 10, 1)
+                results.append(
+                    {
+                        "scale": scale,
+                        "size": [self.width, self.height],
+                        "wall_ms": round(wall / measured * 1000, 3),
+                        "cpu_ms": round(cpu / measured * 1000, 3),
+                    }
+                )
+        finally:
+            GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
+            self.width, self.height = full
+            self._release_gl()
+        return results
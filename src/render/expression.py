@@ -0,0 +1,351 @@
+# expression.py
+from ..utils import Logger
+from collections import deque
+from pathlib import Path
+import numpy as np
+import json, time
+
+# Sample rate motions are baked at
+BAKE_FPS = 60
+
+BLEND_ADD, BLEND_MULTIPLY, BLEND_OVERWRITE = 0, 1, 2
+BLEND_MODES = {
+    "Add": BLEND_ADD,
+    "Multiply": BLEND_MULTIPLY,
+    "Overwrite": BLEND_OVERWRITE,
+}
+
+
+class Expression:
+    """Parsed .exp3.json: parameter ids with values and blend modes."""
+
+    __slots__ = ("name", "ids", "values", "blend", "fade_in", "fade_out")
+
+    def __init__(self, name, ids, values, blend, fade_in, fade_out):
+        self.name = name
+        self.ids = ids
+        self.values = values
+        self.blend = blend
+        self.fade_in = fade_in
+        self.fade_out = fade_out
+
+
+class Motion:
+    """Parsed .motion3.json: parameter curves baked to a BAKE_FPS table."""
+
+    __slots__ = ("name", "ids", "table", "duration", "loop", "fade_in", "fade_out")
+
+    def __init__(self, name, ids, table, duration, loop, fade_in, fade_out):
+        self.name = name
+        self.ids = ids
+        self.table = table
+        self.duration = duration
+        self.loop = loop
+        self.fade_in = fade_in
+        self.fade_out = fade_out
+
+
+def _number(value, what):
+    if not isinstance(value, (int, float)):
+        raise ValueError(f"{what} must be a number, got {value!r}")
+    return float(value)
+
+
+def parse_expression(path: Path) -> Expression:
+    """
+    Parse and validate an .exp3.json file.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+    ids, values, blend = [], [], []
+    for entry in data.get("Parameters", []):
+        if not isinstance(entry.get("Id"), str):
+            raise ValueError(f"Expression parameter without Id: {entry!r}")
+        mode = entry.get("Blend", "Add")
+        if mode not in BLEND_MODES:
+            raise ValueError(f"Unknown blend {mode!r} for {entry['Id']}")
+        ids.append(entry["Id"])
+        values.append(_number(entry.get("Value", 0.0), entry["Id"]))
+        blend.append(BLEND_MODES[mode])
+
+    return Expression(
+        name=path.name[: -len(".exp3.json")],
+        ids=tuple(ids),
+        values=np.array(values, dtype=np.float32),
+        blend=np.array(blend, dtype=np.int8),
+        fade_in=_number(data.get("FadeInTime", 1.0), "FadeInTime"),
+        fade_out=_number(data.get("FadeOutTime", 1.0), "FadeOutTime"),
+    )
+
+
+def bake_segments(segments: list, times: np.ndarray) -> np.ndarray:
+    """
+    Evaluate a motion3 segment list at `times`.
+
+    Segment types: 0 linear, 1 bezier, 2 stepped, 3 inverse stepped.
+    Values before the first point and after the last one are held.
+    """
+    out = np.full(len(times), float(segments[1]), dtype=np.float32)
+    t0, v0 = float(segments[0]), float(segments[1])
+    i = 2
+    while i < len(segments):
+        kind = int(segments[i])
+        if kind == 1:
+            c1, c2 = segments[i + 2], segments[i + 4]
+            t1, v1 = float(segments[i + 5]), float(segments[i + 6])
+            i += 7
+        elif kind in (0, 2, 3):
+            t1, v1 = float(segments[i + 1]), float(segments[i + 2])
+            i += 3
+        else:
+            raise ValueError(f"Unknown motion segment type {kind}")
+
+        mask = (times >= t0) & (times <= t1)
+        span = t1 - t0
+        u = (times[mask] - t0) / span if span > 0 else np.ones(mask.sum())
+        if kind == 0:
+            out[mask] = v0 + (v1 - v0) * u
+        elif kind == 1:
+            w = 1 - u
+            out[mask] = w**3 * v0 + 3 * w * w * u * c1 + 3 * w * u * u * c2 + u**3 * v1
+        elif kind == 2:
+            out[mask] = np.where(times[mask] < t1, v0, v1)
+        else:
+            out[mask] = np.where(times[mask] > t0, v1, v0)
+        t0, v0 = t1, v1
+
+    out[times > t0] = v0
+    return out
+
+
+def parse_motion(path: Path, logger: Logger = None) -> Motion:
+    """
+    Parse and validate a .motion3.json file, baking Parameter curves.
+    Curves targeting Model or PartOpacity are skipped.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+    meta = data.get("Meta", {})
+    duration = _number(meta.get("Duration", 0.0), "Duration")
+    if duration <= 0:
+        raise ValueError("Motion Duration must be positive")
+    times = np.arange(int(np.ceil(duration * BAKE_FPS)) + 1) / BAKE_FPS
+
+    ids, columns, skipped = [], [], 0
+    for curve in data.get("Curves", []):
+        if curve.get("Target") != "Parameter":
+            skipped += 1
+            continue
+        segments = curve.get("Segments", [])
+        if len(segments) < 2 or not isinstance(curve.get("Id"), str):
+            raise ValueError(f"Malformed curve {curve.get('Id')!r}")
+        ids.append(curve["Id"])
+        columns.append(bake_segments(segments, times))
+
+    if skipped and logger:
+        logger.logging.debug("%s: skipped %d non-parameter curves", path.name, skipped)
+
+    table = (
+        np.stack(columns, axis=1) if columns else np.zeros((len(times), 0), np.float32)
+    )
+    return Motion(
+        name=path.name[: -len(".motion3.json")],
+        ids=tuple(ids),
+        table=np.ascontiguousarray(table, dtype=np.float32),
+        duration=duration,
+        loop=bool(meta.get("Loop", False)),
+        fade_in=_number(meta.get("FadeInTime", 0.5), "FadeInTime"),
+        fade_out=_number(meta.get("FadeOutTime", 0.5), "FadeOutTime"),
+    )
+
+
+class ExpressionLibrary:
+    """
+    Parses a model's expression and motion files once at model load.
+    """
+
+    def __init__(self):
+        self.logger = Logger("Expression")
+        self.expressions = {}
+        self.motions = {}
+
+    def load(self, model_dir: Path, extensions: dict) -> None:
+        """
+        :param model_dir: Folder of the model3.json.
+        :param extensions: {"expressions": [...], "motions": [...]} relative paths.
+        """
+        for rel in extensions.get("expressions", []):
+            try:
+                expression = parse_expression(model_dir / rel)
+                self.expressions[expression.name] = expression
+            except Exception as e:
+                self.logger.LogExit(f"load {rel}", e, custom=True)
+        for rel in extensions.get("motions", []):
+            try:
+                motion = parse_motion(model_dir / rel, self.logger)
+                self.motions[motion.name] = motion
+            except Exception as e:
+                self.logger.LogExit(f"load {rel}", e, custom=True)
+        self.logger.logging.info(
+            "Cached %d expressions, %d motions",
+            len(self.expressions),
+            len(self.motions),
+        )
+
+
+class ExpressionPlayer:
+    """
+    Plays cached expressions and motions on the render thread.
+
+    Expressions toggle on and off with fades. Motions play once (or loop)
+    from their baked tables. Triggers come from hotkeys or from tracked
+    parameters held above a threshold. No file I/O happens after load.
+    """
+
+    # Trigger latencies kept for stats()
+    LATENCY_SAMPLES = 1024
+
+    def __init__(self, library: ExpressionLibrary, triggers: list = None):
+        self.logger = Logger("Expression")
+        self.library = library
+        self.active = {}  # name -> [item, start, release_time or None]
+        self.triggers = []
+        for trigger in triggers or []:
+            self.triggers.append(
+                {
+                    "param": trigger["param"],
+                    "above": float(trigger.get("above", 0.8)),
+                    "hold": float(trigger.get("hold", 1.0)),
+                    "play": trigger["play"],
+                    "since": None,
+                    "fired": False,
+                }
+            )
+        self._pending = []  # trigger timestamps awaiting their first frame
+        self.latencies = deque(maxlen=self.LATENCY_SAMPLES)
+        self.triggered = 0
+
+    def resolve(self, name: str):
+        """Find a cached item; "motion:<name>" selects a motion explicitly."""
+        if name.startswith("motion:"):
+            return self.library.motions.get(name[7:])
+        return self.library.expressions.get(name) or self.library.motions.get(name)
+
+    def replace(self, item) -> None:
+        """
+        Swap in a re-parsed expression or motion (hot reload); a playing
+        one continues from where it is with the new values.
+        """
+        library = self.library
+        table = library.motions if isinstance(item, Motion) else library.expressions
+        if item.name not in table:
+            return
+        table[item.name] = item
+        state = self.active.get(item.name)
+        if state:
+            state[0] = item
+
+    def trigger(self, name: str, now: float = None) -> None:
+        """Toggle an expression or (re)start a motion."""
+        now = now if now is not None else time.perf_counter()
+        item = self.resolve(name)
+        if item is None:
+            self.logger.logging.warning("Unknown expression or motion: %s", name)
+            return
+
+        state = self.active.get(item.name)
+        if isinstance(item, Expression) and state and state[2] is None:
+            state[2] = now  # fade out
+        else:
+            self.active[item.name] = [item, now, None]
+        self._pending.append(now)
+
+    def check_triggers(self, params, now: float) -> None:
+        """Fire triggers whose parameter stayed above threshold for `hold` s."""
+        for trigger in self.triggers:
+            if getattr(params, trigger["param"], 0.0) > trigger["above"]:
+                if trigger["since"] is None:
+                    trigger["since"] = now
+                elif not trigger["fired"] and now - trigger["since"] >= trigger["hold"]:
+                    trigger["fired"] = True
+                    self.trigger(trigger["play"], now)
+            else:
+                trigger["since"] = None
+                trigger["fired"] = False
+
+    @staticmethod
+    def _weight(item, start, release, now):
+        weight = min((now - start) / item.fade_in, 1.0) if item.fade_in > 0 else 1.0
+        if release is not None:
+            fade = 1.0 - ((now - release) / item.fade_out if item.fade_out > 0 else 1.0)
+            weight = min(weight, fade)
+        return weight
+
+    def apply(self, model, now: float, base=None) -> None:
+        """
+        Apply active expressions and motions to the model.
+        :param base: Optional callable id -> value set this frame (or None),
+            used by Multiply blends; ids without a base value are skipped.
+        """
+        if not self.active:
+            return
+        finished = []
+        for name, (item, start, release) in self.active.items():
+            if isinstance(item, Motion):
+                elapsed = now - start
+                if elapsed >= item.duration:
+                    if item.loop:
+                        elapsed %= item.duration
+                    else:
+                        finished.append(name)
+                        continue
+                if release is None and not item.loop:
+                    if item.duration - elapsed < item.fade_out:
+                        release = now - (item.fade_out - (item.duration - elapsed))
+                weight = self._weight(item, start, release, now)
+                row = item.table[min(int(elapsed * BAKE_FPS), len(item.table) - 1)]
+                for param, value in zip(item.ids, row.tolist()):
+                    model.SetParameterValue(param, value, weight)
+                continue
+
+            weight = self._weight(item, start, release, now)
+            if weight <= 0.0:
+                finished.append(name)
+                continue
+            for param, value, blend in zip(
+                item.ids, item.values.tolist(), item.blend.tolist()
+            ):
+                if blend == BLEND_OVERWRITE:
+                    model.SetParameterValue(param, value, weight)
+                elif blend == BLEND_ADD:
+                    model.AddParameterValue(param, value * weight)
+                else:
+                    # Multiply: scale the value tracking set this frame
+                    current = base(param) if base else None
+                    if current is not None:
+                        factor = 1 + (value - 1) * weight
+                        model.SetParameterValue(param, current * factor, 1)
+
+        for name in finished:
+            del self.active[name]
+
+    def presented(self, now: float) -> None:
+        """Call after a flip: closes out trigger-to-frame latencies."""
+        if self._pending:
+            self.latencies.extend(now - t for t in self._pending)
+            self.triggered += len(self._pending)
+            self._pending.clear()
+
+    def stats(self) -> dict:
+        """Trigger-to-first-frame latency summary in ms (recent samples)."""
+        if not self.latencies:
+            return {"triggers": 0}
+        ms = np.asarray(self.latencies) * 1000
+        return {
+            "triggers": self.triggered,
+            "mean_ms": round(float(ms.mean()), 2),
+            "p95_ms": round(float(np.percentile(ms, 95)), 2),
+            "max_ms": round(float(ms.max()), 2),
+        }
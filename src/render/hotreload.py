@@ -0,0 +1,227 @@
+# hotreload.py
+from ..utils import Logger
+from .expression import parse_expression, parse_motion
+from collections import deque
+from pathlib import Path
+from PIL import Image
+import json, os, threading, time
+
+# File suffix -> change kind
+KINDS = (
+    (".exp3.json", "expression"),
+    (".motion3.json", "motion"),
+    (".physics3.json", "physics"),
+    (".pose3.json", "pose"),
+    (".model3.json", "model"),
+    (".moc3", "moc"),
+    (".png", "texture"),
+)
+# Kinds the Live2D binding only picks up through a new LoadModelJson
+FULL_RELOAD = {"physics", "pose", "model", "moc", "texture"}
+PREFETCH_CHUNK = 1 << 20
+
+
+def classify(path: str) -> str:
+    """Change kind of a model file, or None for files the model never reads."""
+    name = path.lower()
+    for suffix, kind in KINDS:
+        if name.endswith(suffix):
+            return kind
+    return None
+
+
+class ModelChange:
+    def __init__(self, kinds: set, paths: list, items: list, detected: float):
+        self.kinds = kinds
+        self.paths = paths
+        self.items = items  # re-parsed Expression / Motion objects
+        self.full = bool(kinds & FULL_RELOAD)
+        self.detected = detected
+        self.prefetched = 0  # bytes read ahead for a full reload
+        self.label = "+".join(sorted(kinds))
+
+
+class ModelWatcher:
+    """
+    Watches the active model's folder and prepares reloads off the render
+    thread.
+
+    Changes are picked up by polling mtime and size, then held until the
+    folder has been quiet for `settle` seconds, since a Cubism re-export
+    writes many files. Changed files are validated (and expressions and
+    motions parsed) here; a half-written file rejects the change until
+    the next write. Prepared ModelChanges queue in `pending` for the
+    render thread, which applies them between frames and reports the
+    time taken through record().
+
+    LoadModelJson has to run on the GL thread: the binding decodes and
+    uploads textures in the same call. For a full reload every file the
+    model references is read here first, so the render thread's load
+    finds them in the OS file cache instead of waiting on the disk.
+    """
+
+    def __init__(self, model_json, interval: float = 0.5, settle: float = 0.3):
+        """
+        :param model_json: The active model's model3.json.
+        """
+        self.logger = Logger("HotReload")
+        self.model_json = Path(model_json)
+        self.folder = self.model_json.parent
+        self.interval = interval
+        self.settle = settle
+        self.pending = deque()
+        self.rejected = 0
+        self.reloads = {}  # change label -> [count, total s, max s, latency s]
+        self._textures = self._referenced_textures()
+        self._signature = self._scan()
+        self._stop = threading.Event()
+
+    def _references(self) -> dict:
+        try:
+            with open(self.model_json, "r", encoding="utf-8") as file:
+                return json.load(file).get("FileReferences", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _referenced_textures(self) -> set:
+        return {
+            os.path.normpath(self.folder / rel)
+            for rel in self._references().get("Textures", [])
+        }
+
+    def _referenced_files(self) -> list:
+        """model3.json and every file LoadModelJson reads with it."""
+        references = self._references()
+        names = [references.get(k) for k in ("Moc", "Physics", "Pose", "UserData")]
+        names += references.get("Textures", [])
+        names += [e.get("File") for e in references.get("Expressions", [])]
+        for motions in references.get("Motions", {}).values():
+            names += [m.get("File") for m in motions]
+        files = [self.model_json]
+        files += [os.path.normpath(self.folder / n) for n in names if n]
+        return files
+
+    def _prefetch(self) -> int:
+        """Read the model's files ahead of a full reload; returns bytes read."""
+        total = 0
+        for path in self._referenced_files():
+            try:
+                with open(path, "rb", buffering=0) as file:
+                    while chunk := file.read(PREFETCH_CHUNK):
+                        total += len(chunk)
+            except OSError:
+                pass  # LoadModelJson reports a missing file
+        return total
+
+    def _scan(self) -> dict:
+        files = {}
+        for root, _, names in os.walk(self.folder):
+            for name in names:
+                path = os.path.normpath(os.path.join(root, name))
+                kind = classify(path)
+                if kind is None or (kind == "texture" and path not in self._textures):
+                    continue
+                try:
+                    stat = os.stat(path)
+                    files[path] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    pass
+        return files
+
+    def poll(self) -> bool:
+        """
+        Queue a prepared change when model files changed.
+        :return: True when a change was queued.
+        """
+        current = self._scan()
+        if current == self._signature:
+            return False
+        detected = time.perf_counter()
+        while not self._stop.wait(self.settle):
+            settled = self._scan()
+            if settled == current:
+                break
+            current = settled
+        changed = sorted(p for p in current if current[p] != self._signature.get(p))
+        self._signature = current
+        if not changed:
+            return False  # only deletions
+        change = self._prepare(changed, detected)
+        if change is None:
+            return False
+        if "model" in change.kinds:
+            self._textures = self._referenced_textures()
+            self._signature = self._scan()
+        self.pending.append(change)
+        self.logger.logging.info(
+            "Model change (%s): %s",
+            change.label,
+            ", ".join(os.path.relpath(p, self.folder) for p in changed),
+        )
+        return True
+
+    def _prepare(self, paths: list, detected: float):
+        kinds, items = set(), []
+        try:
+            for path in paths:
+                kind = classify(path)
+                if kind == "expression":
+                    items.append(parse_expression(Path(path)))
+                elif kind == "motion":
+                    items.append(parse_motion(Path(path), self.logger))
+                elif kind == "moc":
+                    with open(path, "rb") as file:
+                        if file.read(4) != b"MOC3":
+                            raise ValueError(f"{path} is not a moc3 file")
+                elif kind == "texture":
+                    with Image.open(path) as image:
+                        image.verify()
+                else:
+                    with open(path, "r", encoding="utf-8") as file:
+                        json.load(file)
+                kinds.add(kind)
+        except Exception as e:
+            # Usually a file still being written; the next write retries
+            self.rejected += 1
+            self.logger.LogExit("poll", f"Model change not applied: {e}", custom=True)
+            return None
+        change = ModelChange(kinds, paths, items, detected)
+        if change.full:
+            change.prefetched = self._prefetch()
+        return change
+
+    def record(self, change: ModelChange, seconds: float, now: float) -> None:
+        """Account a change applied by the render thread."""
+        entry = self.reloads.setdefault(change.label, [0, 0.0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+        entry[3] += now - change.detected
+        self.logger.logging.info(
+            "Reloaded %s in %.1f ms (%.0f ms after the first write)",
+            change.label,
+            seconds * 1000,
+            (now - change.detected) * 1000,
+        )
+
+    def stats(self) -> dict:
+        """Reload time per change type, and rejected changes."""
+        report = {"rejected": self.rejected}
+        for label, (count, total, worst, latency) in self.reloads.items():
+            report[label] = {
+                "count": count,
+                "mean_ms": round(total / count * 1000, 1),
+                "max_ms": round(worst * 1000, 1),
+                "mean_latency_ms": round(latency / count * 1000, 1),
+            }
+        return report
+
+    def run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.LogExit("run", e)
+
+    def stop(self) -> None:
+        self._stop.set()
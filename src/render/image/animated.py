@@ -0,0 +1,347 @@
+from .image import Image
+from .opengl_function import create_stream_texture, create_pixel_buffers
+from ...utils import Logger
+from PIL import Image as PILImage
+from pathlib import Path
+import OpenGL.GL as GL
+import numpy as np
+import cv2, ctypes, queue, threading, time
+
+VIDEO_EXTENSIONS = (".mp4", ".m4v", ".webm", ".mov", ".mkv", ".avi")
+# Presentation running this far behind the clock restarts timing
+RESYNC = 0.25
+
+
+def is_animated(path: str) -> bool:
+    """Video file, or a GIF/APNG/WebP with more than one frame."""
+    if Path(path).suffix.lower() in VIDEO_EXTENSIONS:
+        return True
+    try:
+        with PILImage.open(path) as image:
+            return getattr(image, "is_animated", False)
+    except Exception:
+        return False
+
+
+def open_background(
+    path: str,
+    size: tuple,
+    settings: dict = None,
+    stopping: threading.Event = None,
+    pixels: tuple = None,
+) -> Image:
+    """
+    Image for still backgrounds, AnimatedImage for animations and video.
+    :param size: Display size; animated frames are decoded at this size.
+    :param settings: The "AnimatedBackground" block of config.json.
+    :param pixels: Pre-decoded load_image() result for a still image.
+    """
+    if is_animated(path):
+        return AnimatedImage(path, size, settings, stopping)
+    return Image(path, pixels)
+
+
+class VideoSource:
+    """Video file frames via OpenCV, scaled to RGBA bottom-up."""
+
+    def __init__(self, path: str, size: tuple):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Cannot open video {path}")
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.duration = 1 / fps if fps > 0 else 1 / 30
+        self.count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width, height = size
+        self._scaled = np.empty((height, width, 3), dtype=np.uint8)
+        self._rgba = np.empty((height, width, 4), dtype=np.uint8)
+
+    def read(self, out: np.ndarray):
+        """
+        Decode the next frame into `out`.
+        :return: Frame duration in seconds, or None at the end.
+        """
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        height, width = out.shape[:2]
+        cv2.resize(frame, (width, height), self._scaled, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._scaled, cv2.COLOR_BGR2RGBA, self._rgba)
+        cv2.flip(self._rgba, 0, out)
+        return self.duration
+
+    def rewind(self) -> None:
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def close(self) -> None:
+        self.cap.release()
+
+
+class SequenceSource:
+    """GIF, APNG and WebP frames via Pillow, scaled to RGBA bottom-up."""
+
+    def __init__(self, path: str, size: tuple):
+        self.image = PILImage.open(path)
+        self.count = getattr(self.image, "n_frames", 1)
+        self.size = tuple(size)
+        self.index = 0
+
+    def read(self, out: np.ndarray):
+        """
+        Decode the next frame into `out`.
+        :return: Frame duration in seconds, or None at the end.
+        """
+        if self.index >= self.count:
+            return None
+        self.image.seek(self.index)
+        self.index += 1
+        frame = self.image.convert("RGBA").resize(self.size, PILImage.BILINEAR)
+        out[:] = np.asarray(frame.transpose(PILImage.FLIP_TOP_BOTTOM))
+        # Browsers treat missing or near-zero GIF delays as 100 ms
+        duration = self.image.info.get("duration") or 100
+        return (duration if duration > 10 else 100) / 1000
+
+    def rewind(self) -> None:
+        self.index = 0
+
+    def close(self) -> None:
+        self.image.close()
+
+
+class AnimatedImage(Image):
+    """
+    Fullscreen background playing a video or animated image.
+
+    A decoder thread writes frames at display resolution into a small
+    ring of preallocated buffers (or, for loops that fit in `cache_mb`,
+    into a cache decoded once and then replayed). Draw() picks the newest
+    frame that is due and uploads it through one of two orphaned pixel
+    buffer objects with glTexSubImage2D. The render thread never waits:
+    with no new frame ready it redraws the current texture.
+    """
+
+    def __init__(
+        self,
+        imagePath: str,
+        size: tuple,
+        settings: dict = None,
+        stopping: threading.Event = None,
+    ):
+        """
+        :param size: Display size (width, height) frames are decoded at.
+        :param settings: The "AnimatedBackground" block of config.json.
+        :param stopping: Event that also stops decoding (app shutdown).
+        """
+        settings = settings or {}
+        self.logger = Logger("Background")
+        self.size = (int(size[0]), int(size[1]))
+        self.ring = max(2, int(settings.get("ring_frames", 4)))
+        self.cache_bytes = (
+            int(settings.get("cache_mb", 256)) << 20
+            if settings.get("cache", True)
+            else 0
+        )
+        self._stopping = stopping or threading.Event()
+        super().__init__(imagePath)
+
+    def _load_texture(self, imagePath: str, pixels: tuple = None) -> int:
+        width, height = self.size
+        if Path(imagePath).suffix.lower() in VIDEO_EXTENSIONS:
+            self.source = VideoSource(imagePath, self.size)
+        else:
+            self.source = SequenceSource(imagePath, self.size)
+        self.frame_bytes = width * height * 4
+        count = self.source.count
+        self.cached = 0 < count and count * self.frame_bytes <= self.cache_bytes
+        slots = count if self.cached else self.ring
+        self.frames = np.empty((slots, height, width, 4), dtype=np.uint8)
+        self._durations = []
+        self._free = queue.Queue()
+        if not self.cached:
+            for slot in range(slots):
+                self._free.put(slot)
+        self._ready = queue.Queue(maxsize=self.ring)
+        self._pending = None
+        self._start = None
+        self._stop = threading.Event()
+
+        texture = create_stream_texture(width, height, Path(imagePath).name)
+        self.pbos = create_pixel_buffers(2, self.frame_bytes)
+        self._pbo = 0
+
+        self.decoded = 0
+        self.decode_total = 0.0
+        self.decode_max = 0.0
+        self.uploads = 0
+        self.upload_total = 0.0
+        self.upload_max = 0.0
+        self.skipped = 0
+        self.resyncs = 0
+        self.thread = threading.Thread(
+            target=self._decode, name="BackgroundDecoder", daemon=True
+        )
+        self.thread.start()
+        return texture
+
+    # ---------- decoder thread ----------
+
+    def _stopped(self) -> bool:
+        return self._stop.is_set() or self._stopping.is_set()
+
+    def _put(self, item: tuple) -> bool:
+        while not self._stopped():
+            try:
+                self._ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _take_slot(self, index: int):
+        if self.cached:
+            return index if index < len(self.frames) else None
+        while not self._stopped():
+            try:
+                return self._free.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return None
+
+    def _decode(self):
+        pts, index, replay = 0.0, 0, False
+        try:
+            while not self._stopped():
+                if replay:
+                    # Whole loop cached: hand out the decoded frames again
+                    for slot, duration in enumerate(self._durations):
+                        if not self._put((slot, pts)):
+                            return
+                        pts += duration
+                    continue
+                slot = self._take_slot(index)
+                start = time.perf_counter()
+                duration = None if slot is None else self.source.read(self.frames[slot])
+                if duration is None:
+                    if self._stopped():
+                        return
+                    if index == 0:
+                        raise RuntimeError("no frames to decode")
+                    if self.cached:
+                        replay = True
+                        self.source.close()
+                    else:
+                        self._free.put(slot)
+                        self.source.rewind()
+                    index = 0
+                    continue
+                elapsed = time.perf_counter() - start
+                self.decoded += 1
+                self.decode_total += elapsed
+                self.decode_max = max(self.decode_max, elapsed)
+                if self.cached:
+                    self._durations.append(duration)
+                index += 1
+                if not self._put((slot, pts)):
+                    return
+                pts += duration
+        except Exception as e:
+            self.logger.LogExit("_decode", e)
+        finally:
+            if not replay:
+                self.source.close()
+
+    # ---------- render thread ----------
+
+    def _next_frame(self, now: float):
+        """Newest decoded frame due at `now`; older due frames are skipped."""
+        if self._start is None:
+            self._start = now
+        clock = now - self._start
+        newest = None
+        while True:
+            if self._pending is None:
+                try:
+                    self._pending = self._ready.get_nowait()
+                except queue.Empty:
+                    break
+            slot, pts = self._pending
+            if pts > clock:
+                break
+            if newest is not None:
+                self._release(newest[0])
+                self.skipped += 1
+            newest = self._pending
+            self._pending = None
+        if newest and clock - newest[1] > RESYNC:
+            # Decoding fell behind or the window was hidden: restart the clock
+            self._start = now - newest[1]
+            self.resyncs += 1
+        return newest[0] if newest else None
+
+    def _release(self, slot: int) -> None:
+        if not self.cached:
+            self._free.put(slot)
+
+    def _upload(self, slot: int) -> None:
+        start = time.perf_counter()
+        width, height = self.size
+        pbo = self.pbos[self._pbo]
+        self._pbo ^= 1
+        GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, pbo)
+        # Orphan the storage so the copy never waits for the previous transfer
+        GL.glBufferData(
+            GL.GL_PIXEL_UNPACK_BUFFER, self.frame_bytes, None, GL.GL_STREAM_DRAW
+        )
+        GL.glBufferSubData(
+            GL.GL_PIXEL_UNPACK_BUFFER, 0, self.frame_bytes, self.frames[slot]
+        )
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
+        GL.glTexSubImage2D(
+            GL.GL_TEXTURE_2D,
+            0,
+            0,
+            0,
+            width,
+            height,
+            GL.GL_RGBA,
+            GL.GL_UNSIGNED_BYTE,
+            ctypes.c_void_p(0),
+        )
+        GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+        GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, 0)
+        elapsed = time.perf_counter() - start
+        self.uploads += 1
+        self.upload_total += elapsed
+        self.upload_max = max(self.upload_max, elapsed)
+
+    def Draw(self) -> None:
+        """
+        Upload the frame due now, if a new one is ready, and draw.
+        """
+        slot = self._next_frame(time.perf_counter())
+        if slot is not None:
+            self._upload(slot)
+            self._release(slot)
+        super().Draw()
+
+    def stats(self) -> dict:
+        """Decode and upload cost per frame, and playback counters."""
+        return {
+            "cached": self.cached,
+            "decoded": self.decoded,
+            "decode_mean_ms": round(self.decode_total / max(self.decoded, 1) * 1000, 2),
+            "decode_max_ms": round(self.decode_max * 1000, 2),
+            "uploaded": self.uploads,
+            "upload_mean_ms": round(self.upload_total / max(self.uploads, 1) * 1000, 2),
+            "upload_max_ms": round(self.upload_max * 1000, 2),
+            "skipped": self.skipped,
+            "resyncs": self.resyncs,
+        }
+
+    def release(self) -> None:
+        """
+        Stop the decoder and free the texture, PBOs, VAO and program.
+        """
+        self._stop.set()
+        self.thread.join(timeout=1.0)
+        GL.glDeleteBuffers(len(self.pbos), self.pbos)
+        super().release()
@@ -0,0 +1,363 @@
+from .opengl_function import create_program, create_dynamic_vao, create_texture
+from .opengl_function import delete_texture
+from ...utils.memory import rss
+import OpenGL.GL as GL
+import numpy as np
+import pygame, time
+
+FIRST_CHAR, LAST_CHAR = 32, 126
+# x, y (pixels), u, v, r, g, b, a
+FLOATS = 8
+MAX_QUADS = 4096
+GRAPH_SAMPLES = 120
+TEXT_REFRESH = 0.25  # seconds between text rebuilds
+
+WHITE = (1.0, 1.0, 1.0, 1.0)
+DIM = (0.7, 0.75, 0.8, 1.0)
+PANEL = (0.0, 0.0, 0.0, 0.6)
+# Frame-time bar colors: on time, late, dropped
+BAR_COLORS = np.array(
+    [(0.3, 0.85, 0.4, 0.9), (0.95, 0.8, 0.2, 0.9), (0.95, 0.3, 0.25, 0.9)],
+    dtype=np.float32,
+)
+
+
+class GlyphAtlas:
+    """
+    Printable ASCII rasterized once with a pygame font into one RGBA
+    texture, plus a white block that solid quads sample.
+    """
+
+    def __init__(self, size: int = 15):
+        pygame.font.init()
+        font = pygame.font.SysFont("consolas,dejavusansmono,couriernew,monospace", size)
+        glyphs = [
+            font.render(chr(c), True, (255, 255, 255))
+            for c in range(FIRST_CHAR, LAST_CHAR + 1)
+        ]
+        self.height = font.get_linesize()
+        width = 512
+        rows = [[]]
+        x = 0
+        for glyph in glyphs:
+            if x + glyph.get_width() > width:
+                rows.append([])
+                x = 0
+            rows[-1].append(glyph)
+            x += glyph.get_width() + 1
+        height = (len(rows) + 1) * (self.height + 1)
+
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 0))
+        rects = []
+        for row, line in enumerate(rows):
+            x, y = 0, row * (self.height + 1)
+            for glyph in line:
+                surface.blit(glyph, (x, y))
+                rects.append((x, y, glyph.get_width(), glyph.get_height()))
+                x += glyph.get_width() + 1
+        white_y = len(rows) * (self.height + 1)
+        surface.fill((255, 255, 255, 255), (0, white_y, 4, 4))
+
+        rects = np.array(rects, dtype=np.float32)
+        self.advance = rects[:, 2].copy()
+        # Texture rows are bottom-up (flipped upload), so v runs upwards
+        self.uv = np.stack(
+            [
+                rects[:, 0] / width,
+                1.0 - rects[:, 1] / height,
+                (rects[:, 0] + rects[:, 2]) / width,
+                1.0 - (rects[:, 1] + rects[:, 3]) / height,
+            ],
+            axis=1,
+        )
+        self.white = ((1.5) / width, 1.0 - (white_y + 1.5) / height)
+        pixels = pygame.image.tobytes(surface, "RGBA", True)
+        self.texture = create_texture("hud-atlas", (pixels, width, height))
+
+
+class Hud:
+    """
+    Performance overlay drawn with GL on top of the model.
+
+    Shows render and tracking FPS, inference ms per model, a frame-time
+    graph, dropped frames, RSS, its own cost and the current parameter
+    values. Everything is one draw call: quads in pixel space sampled
+    from a GlyphAtlas, written into a preallocated vertex array and
+    uploaded to a single dynamic buffer. Graph bars are updated in place
+    every frame; text is rebuilt only every TEXT_REFRESH seconds.
+    """
+
+    def __init__(self, app, settings: dict = None):
+        """
+        :param settings: The "HUD" block of config.json.
+        """
+        settings = settings or {}
+        self.app = app
+        self.visible = False
+        self.budget = settings.get("budget_ms", 0.5) / 1000
+
+        vertex_shader = """
+        #version 330 core
+        layout(location = 0) in vec2 a_position;
+        layout(location = 1) in vec2 a_texCoord;
+        layout(location = 2) in vec4 a_color;
+        uniform vec2 u_screen;
+        out vec2 v_texCoord;
+        out vec4 v_color;
+        void main() {
+            gl_Position = vec4(
+                a_position.x * 2.0 / u_screen.x - 1.0,
+                1.0 - a_position.y * 2.0 / u_screen.y,
+                0.0,
+                1.0
+            );
+            v_texCoord = a_texCoord;
+            v_color = a_color;
+        }
+        """
+        frag_shader = """
+        #version 330 core
+        in vec2 v_texCoord;
+        in vec4 v_color;
+        uniform sampler2D tex;
+        out vec4 frag_color;
+        void main() {
+            frag_color = texture(tex, v_texCoord) * v_color;
+        }
+        """
+        self.program = create_program(vertex_shader, frag_shader)
+        self.u_screen = GL.glGetUniformLocation(self.program, "u_screen")
+        self.vao, self.vbo = create_dynamic_vao(MAX_QUADS * 6, (2, 2, 4))
+        self.atlas = GlyphAtlas(settings.get("font_size", 15))
+
+        self.vertices = np.zeros((MAX_QUADS * 6, FLOATS), dtype=np.float32)
+        self.line = self.atlas.height
+        self.width = 320
+        self.graph_height = 48
+        self._layout_static()
+
+        self.frame_times = np.zeros(GRAPH_SAMPLES, dtype=np.float32)
+        self._order = np.arange(GRAPH_SAMPLES)
+        self._ordered = np.zeros(GRAPH_SAMPLES, dtype=np.float32)
+        self._levels = np.zeros(GRAPH_SAMPLES, dtype=np.intp)
+        self._head = 0
+        self._last = None
+        self._refresh = 0.0
+        self._samples = 0
+        self._rss = 0
+        self.quads = 0
+        self.frames = 0
+        self.dropped = 0
+        self.cost = 0.0
+        self.cost_total = 0.0
+        self.cost_max = 0.0
+        self.over_budget = 0
+
+    # ---------- vertex writing ----------
+
+    def _quads(self, start, x0, y0, x1, y1, uv, color) -> int:
+        """
+        Write len(x0) quads from quad index `start`.
+        :param uv: (n, 4) u0, v_top, u1, v_bottom, or one row for all.
+        :return: Number of quads written.
+        """
+        count = len(x0)
+        q = self.vertices[start * 6 : (start + count) * 6].reshape(count, 6, FLOATS)
+        uv = np.broadcast_to(uv, (count, 4))
+        # Two triangles per quad: TL, BL, BR / TL, BR, TR
+        for corner, (xs, ys, us, vs) in enumerate(
+            (
+                (x0, y0, 0, 1),
+                (x0, y1, 0, 3),
+                (x1, y1, 2, 3),
+                (x0, y0, 0, 1),
+                (x1, y1, 2, 3),
+                (x1, y0, 2, 1),
+            )
+        ):
+            q[:, corner, 0] = xs
+            q[:, corner, 1] = ys
+            q[:, corner, 2] = uv[:, us]
+            q[:, corner, 3] = uv[:, vs]
+        q[:, :, 4:] = color
+        return count
+
+    def _solid(self):
+        u, v = self.atlas.white
+        return np.array([u, v, u, v], dtype=np.float32)
+
+    def _layout_static(self):
+        """Panel and graph bar x-positions; written once."""
+        self.text_lines = 6 + (len(self.app.params.PARAMETER_KEYS) + 1) // 2
+        self.panel_height = 12 + self.text_lines * self.line + self.graph_height + 8
+        one = np.ones(1, dtype=np.float32)
+        self._quads(
+            0,
+            0 * one,
+            0 * one,
+            self.width * one,
+            self.panel_height * one,
+            self._solid(),
+            PANEL,
+        )
+        bar = (self.width - 16) / GRAPH_SAMPLES
+        x0 = 8 + np.arange(GRAPH_SAMPLES, dtype=np.float32) * bar
+        self.graph_base = self.panel_height - 8
+        base = np.full(GRAPH_SAMPLES, self.graph_base, dtype=np.float32)
+        self._quads(1, x0, base, x0 + bar * 0.8, base, self._solid(), BAR_COLORS[0])
+        self._bars = self.vertices[6 : (1 + GRAPH_SAMPLES) * 6].reshape(
+            GRAPH_SAMPLES, 6, FLOATS
+        )
+        self.text_start = 1 + GRAPH_SAMPLES
+        self.quads = self.text_start
+
+    def _update_graph(self, target: float):
+        """Bar heights and colors for the last GRAPH_SAMPLES frame times."""
+        np.take(
+            self.frame_times,
+            (self._order + self._head) % GRAPH_SAMPLES,
+            out=self._ordered,
+        )
+        full_scale = 2 * target
+        heights = np.minimum(self._ordered / full_scale, 1.0) * self.graph_height
+        tops = self.graph_base - heights
+        for corner in (0, 3, 5):  # top vertices
+            self._bars[:, corner, 1] = tops
+        self._levels[:] = (self._ordered > target * 1.2).astype(np.intp)
+        self._levels += self._ordered > target * 1.5
+        self._bars[:, :, 4:] = BAR_COLORS[self._levels][:, None, :]
+
+    def _text_rows(self, now: float, target: float) -> list:
+        app = self.app
+        elapsed = now - self._refresh if self._refresh else 0.0
+        params = app.params
+        samples = params.samples
+        tracking_fps = (samples - self._samples) / elapsed if elapsed else 0.0
+        self._samples = samples
+        self._rss = rss()
+
+        recent = self.frame_times[self.frame_times > 0]
+        frame_ms = float(recent.mean()) * 1000 if len(recent) else 0.0
+        render_fps = 1000 / frame_ms if frame_ms else 0.0
+        inference = "-"
+        scheduler = getattr(app.Capture, "scheduler", None)
+        if scheduler:
+            inference = "  ".join(
+                f"{m.name} {m.cost * 1000:.1f}" for m in scheduler.models
+            )
+        rows = [
+            (f"Render   {render_fps:5.1f} fps  {frame_ms:5.1f} ms", WHITE),
+            (f"Tracking {tracking_fps:5.1f} fps", WHITE),
+            (f"Infer ms {inference}", WHITE),
+            (f"Dropped  {self.dropped}  (> {target * 1500:.0f} ms)", WHITE),
+            (f"RSS      {self._rss / 1048576:6.1f} MB", WHITE),
+            (f"HUD      {self.cost * 1000:5.2f} ms  over {self.over_budget}", WHITE),
+        ]
+        keys, values = params.PARAMETER_KEYS, params.values
+        for i in range(0, len(keys), 2):
+            pair = [
+                f"{k[:10]:<10}{v:7.2f}"
+                for k, v in zip(keys[i : i + 2], values[i : i + 2])
+            ]
+            rows.append(("   ".join(pair), DIM))
+        return rows
+
+    def _update_text(self, now: float, target: float):
+        """Lay out every row in one vectorized pass over the joined text."""
+        rows = self._text_rows(now, target)
+        atlas = self.atlas
+        text = "\n".join(text for text, _ in rows).encode("ascii", "replace")
+        raw = np.frombuffer(text, dtype=np.uint8)
+        newline = raw == 10
+        row = np.cumsum(newline)[~newline]
+        code = raw[~newline].astype(np.intp) - FIRST_CHAR
+        np.clip(code, 0, LAST_CHAR - FIRST_CHAR, out=code)
+        limit = MAX_QUADS - self.text_start
+        code, row = code[:limit], row[:limit]
+
+        advance = atlas.advance[code]
+        start = np.cumsum(advance) - advance
+        # x restarts per row: subtract the running width at the row's first glyph
+        first = np.ones(len(row), dtype=bool)
+        first[1:] = row[1:] != row[:-1]
+        x0 = 8 + start - np.maximum.accumulate(np.where(first, start, 0))
+        y0 = (6 + row * self.line).astype(np.float32)
+        colors = np.array([color for _, color in rows], dtype=np.float32)
+        count = self._quads(
+            self.text_start,
+            x0,
+            y0,
+            x0 + advance,
+            y0 + atlas.height,
+            atlas.uv[code],
+            colors[row][:, None, :],
+        )
+        self.quads = self.text_start + count
+
+    # ---------- per frame ----------
+
+    def toggle(self) -> None:
+        self.visible = not self.visible
+        self._last = None
+
+    def draw(self, now: float) -> None:
+        """Record this frame's time and draw the overlay (render thread)."""
+        start = time.perf_counter()
+        settings = self.app.settings
+        target = (
+            1 / settings.cap_fps.value
+            if settings and settings.cap_fps.enabled
+            else self.app.frame_interval
+        )
+        if self._last is not None:
+            dt = now - self._last
+            self.frame_times[self._head] = dt
+            self._head = (self._head + 1) % GRAPH_SAMPLES
+            self.dropped += dt > target * 1.5
+        self._last = now
+        self._update_graph(target)
+        if now - self._refresh >= TEXT_REFRESH:
+            self._update_text(now, target)
+            self._refresh = now
+
+        width, height = self.app.display_size
+        GL.glViewport(0, 0, width, height)
+        GL.glEnable(GL.GL_BLEND)
+        GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
+        GL.glUseProgram(self.program)
+        GL.glUniform2f(self.u_screen, width, height)
+        GL.glActiveTexture(GL.GL_TEXTURE0)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.atlas.texture)
+        GL.glBindVertexArray(self.vao)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        used = self.vertices[: self.quads * 6]
+        GL.glBufferSubData(GL.GL_ARRAY_BUFFER, 0, used.nbytes, used)
+        GL.glDrawArrays(GL.GL_TRIANGLES, 0, self.quads * 6)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        GL.glBindVertexArray(0)
+        GL.glUseProgram(0)
+
+        cost = time.perf_counter() - start
+        self.cost += (cost - self.cost) * 0.05
+        self.cost_total += cost
+        self.cost_max = max(self.cost_max, cost)
+        self.frames += 1
+        self.over_budget += cost > self.budget
+
+    def stats(self) -> dict:
+        """HUD cost per drawn frame (CPU side, including GL submission)."""
+        return {
+            "frames": self.frames,
+            "mean_ms": round(self.cost_total / max(self.frames, 1) * 1000, 3),
+            "max_ms": round(self.cost_max * 1000, 3),
+            "budget_ms": self.budget * 1000,
+            "over_budget": self.over_budget,
+        }
+
+    def release(self) -> None:
+        """Free the atlas texture, buffer, VAO and program."""
+        delete_texture(self.atlas.texture)
+        GL.glDeleteBuffers(1, [self.vbo])
+        GL.glDeleteVertexArrays(1, [self.vao])
+        GL.glDeleteProgram(self.program)
@@ -1,4 +1,5 @@
 from .opengl_function import create_vao, create_program, create_texture
+from .opengl_function import delete_texture
 import OpenGL.GL as GL
 import numpy as np
 
@@ -9,10 +10,11 @@ class Image:
     Loads an image as a texture and draws it fullscreen.
     """
 
-    def __init__(self, imagePath: str):
+    def __init__(self, imagePath: str, pixels: tuple = None):
         """
         Initialize the OpenGL program, VAO and texture.
         :param imagePath: Path to the image file to load.
+        :param pixels: Pre-decoded load_image() result, skipping the decode.
         """
         # Vertex shader: passes through position and texture coordinates
         vertex_shader = """
@@ -39,7 +41,7 @@ class Image:
 
         # Compile shader program and create texture
         self.program = create_program(vertex_shader, frag_shader)
-        self.texture = create_texture(imagePath)
+        self.texture = self._load_texture(imagePath, pixels)
 
         # Vertex positions (two triangles forming a rectangle)
         vertices = np.array(
@@ -82,6 +84,9 @@ class Image:
         # Create vertex array object
         self.vao = create_vao(vertices, uvs)
 
+    def _load_texture(self, imagePath: str, pixels: tuple = None) -> int:
+        return create_texture(imagePath, pixels)
+
     def Draw(self) -> None:
         """
         Draw the textured quad to the screen.
@@ -98,3 +103,11 @@ class Image:
 
         # Unbind
         GL.glBindVertexArray(0)
+
+    def release(self) -> None:
+        """
+        Free the texture, VAO and program.
+        """
+        delete_texture(self.texture)
+        GL.glDeleteVertexArrays(1, [self.vao])
+        GL.glDeleteProgram(self.program)
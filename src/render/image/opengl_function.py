@@ -1,6 +1,9 @@
 import OpenGL.GL as GL
+from ...utils.memory import track_texture, untrack_texture
 from PIL import Image
+from pathlib import Path
 import numpy as np
+import ctypes
 
 
 def compile_shader(shader_src: str, shader_type) -> int:
@@ -77,18 +80,57 @@ def create_vao(v_pos: np.ndarray, uv_coord: np.ndarray) -> int:
     return vao
 
 
-def create_texture(imagePath: str) -> int:
+def create_dynamic_vao(max_vertices: int, layout: tuple) -> tuple[int, int]:
     """
-    Load an image file into an OpenGL texture.
+    Create a VAO over one interleaved float32 vertex buffer, meant to be
+    refilled with glBufferSubData every frame.
+    :param max_vertices: Buffer capacity in vertices.
+    :param layout: Floats per attribute, e.g. (2, 2, 4) for position, UV, color.
+    :return: Tuple of (VAO ID, VBO ID).
+    """
+    stride = sum(layout) * 4
+    vao = GL.glGenVertexArrays(1)
+    vbo = GL.glGenBuffers(1)
+
+    GL.glBindVertexArray(vao)
+    GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vbo)
+    GL.glBufferData(GL.GL_ARRAY_BUFFER, max_vertices * stride, None, GL.GL_DYNAMIC_DRAW)
+    offset = 0
+    for location, size in enumerate(layout):
+        GL.glVertexAttribPointer(
+            location, size, GL.GL_FLOAT, False, stride, ctypes.c_void_p(offset)
+        )
+        GL.glEnableVertexAttribArray(location)
+        offset += size * 4
+
+    GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+    GL.glBindVertexArray(0)
+
+    return vao, vbo
+
+
+def load_image(imagePath: str) -> tuple[bytes, int, int]:
+    """
+    Decode an image file into bottom-up RGBA bytes for glTexImage2D.
+    Needs no GL context, so it can run off the render thread.
     :param imagePath: Path to image file.
-    :return: Texture ID.
+    :return: Tuple of (pixels, width, height).
     """
     image = Image.open(imagePath)
     if image.mode != "RGBA":
         image = image.convert("RGBA")
     image = image.transpose(Image.FLIP_TOP_BOTTOM)
-    image_data = image.tobytes()
-    width, height = image.size
+    return image.tobytes(), image.size[0], image.size[1]
+
+
+def create_texture(imagePath: str, pixels: tuple = None) -> int:
+    """
+    Load an image file into an OpenGL texture.
+    :param imagePath: Path to image file.
+    :param pixels: Already decoded load_image() result for imagePath.
+    :return: Texture ID.
+    """
+    image_data, width, height = pixels or load_image(imagePath)
 
     GL.glEnable(GL.GL_TEXTURE_2D)
     texture = GL.glGenTextures(1)
@@ -113,9 +155,54 @@ def create_texture(imagePath: str) -> int:
     GL.glGenerateMipmap(GL.GL_TEXTURE_2D)
 
     GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+    track_texture(texture, width, height, Path(imagePath).name, mipmaps=True)
     return texture
 
 
+def create_stream_texture(width: int, height: int, name: str) -> int:
+    """
+    Create an RGBA texture without mipmaps, meant to be overwritten with
+    glTexSubImage2D (video frames). Starts out transparent black.
+    :param name: Label for texture memory tracking.
+    :return: Texture ID.
+    """
+    texture = GL.glGenTextures(1)
+    GL.glBindTexture(GL.GL_TEXTURE_2D, texture)
+    GL.glTexImage2D(
+        GL.GL_TEXTURE_2D,
+        0,
+        GL.GL_RGBA,
+        width,
+        height,
+        0,
+        GL.GL_RGBA,
+        GL.GL_UNSIGNED_BYTE,
+        np.zeros((height, width, 4), dtype=np.uint8),
+    )
+    GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR)
+    GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+    GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, GL.GL_CLAMP_TO_EDGE)
+    GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, GL.GL_CLAMP_TO_EDGE)
+    GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+    track_texture(texture, width, height, name)
+    return texture
+
+
+def create_pixel_buffers(count: int, size: int) -> list:
+    """
+    Create pixel unpack buffers (PBOs) for asynchronous texture uploads.
+    :param count: Number of buffers, 2 for double buffering.
+    :param size: Bytes per buffer.
+    :return: List of buffer IDs.
+    """
+    buffers = [int(b) for b in np.atleast_1d(GL.glGenBuffers(count))]
+    for pbo in buffers:
+        GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, pbo)
+        GL.glBufferData(GL.GL_PIXEL_UNPACK_BUFFER, size, None, GL.GL_STREAM_DRAW)
+    GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, 0)
+    return buffers
+
+
 def create_canvas_framebuffer(width: int, height: int) -> tuple[int, int]:
     """
     Create a framebuffer object (FBO) with attached texture.
@@ -151,4 +238,14 @@ def create_canvas_framebuffer(width: int, height: int) -> tuple[int, int]:
     )
 
     GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, old_fbo)
+    track_texture(texture, width, height, "framebuffer")
     return fbo, texture
+
+
+def delete_texture(texture: int) -> None:
+    """
+    Free a texture created by create_texture or create_canvas_framebuffer.
+    :param texture: Texture ID.
+    """
+    GL.glDeleteTextures([texture])
+    untrack_texture(texture)
@@ -1,7 +1,7 @@
 # landmarker.py
 from ..utils import Logger
 import mediapipe as mp
-import time
+import threading, os
 
 
 class LandmarkerManager:
@@ -9,8 +9,9 @@ class LandmarkerManager:
         self.app = app
         self.logger = Logger("Landmarker")
         self.landmarker = None
+        self.ready = threading.Event()
 
-    def load_model_options(self, model_path):
+    def load_model_options(self, model_path, blendshapes=False):
         try:
             BaseOptions = mp.tasks.BaseOptions
             FaceLandmarkerOptions = mp.tasks.vision.FaceLandmarkerOptions
@@ -20,6 +21,8 @@ class LandmarkerManager:
                 base_options=BaseOptions(model_asset_path=model_path),
                 running_mode=VisionRunningMode.VIDEO,
                 num_faces=1,
+                output_face_blendshapes=blendshapes,
+                output_facial_transformation_matrixes=blendshapes,
             )
         except Exception as e:
             self.logger.LogExit("load_model_options", e)
@@ -33,6 +36,36 @@ class LandmarkerManager:
             self.logger.LogExit("create_face_landmarker", e)
             self.app.running = False
 
+    def create_body_landmarker(self, kind: str, model_path: str):
+        """
+        Create a pose ("pose") or hand ("hands") landmarker in VIDEO mode.
+        Body tracking is optional: a missing model file only logs.
+        :return: The landmarker, or None.
+        """
+        try:
+            if not os.path.isfile(model_path):
+                self.logger.LogExit(
+                    "create_body_landmarker",
+                    f"{model_path} not found, {kind} tracking is off",
+                    custom=True,
+                )
+                return None
+            vision = mp.tasks.vision
+            base_options = mp.tasks.BaseOptions(model_asset_path=model_path)
+            mode = vision.RunningMode.VIDEO
+            if kind == "pose":
+                options = vision.PoseLandmarkerOptions(
+                    base_options=base_options, running_mode=mode, num_poses=1
+                )
+                return vision.PoseLandmarker.create_from_options(options)
+            options = vision.HandLandmarkerOptions(
+                base_options=base_options, running_mode=mode, num_hands=2
+            )
+            return vision.HandLandmarker.create_from_options(options)
+        except Exception as e:
+            self.logger.LogExit("create_body_landmarker", e)
+            return None
+
     def load_landmarker_task(self, options):
         try:
             landmarker = self.create_face_landmarker(options)
@@ -41,10 +74,21 @@ class LandmarkerManager:
         except Exception as e:
             self.logger.LogExit("load_landmarker_task", e)
             self.app.running = False
+        finally:
+            self.ready.set()
 
     def wait_until_ready(self):
-        while True:
-            with self.lock:
-                if self.landmarker:
-                    return self.landmarker
-            time.sleep(0.1)
+        """
+        Block until load_landmarker_task finishes; wakes as soon as it does.
+        :return: The landmarker, or None if loading failed or the app stopped
+            (a stop sets `ready` too).
+        """
+        self.ready.wait()
+        with self.lock:
+            return self.landmarker if self.app.running else None
+
+    def close_landmarker(self):
+        with self.lock:
+            landmarker, self.landmarker = self.landmarker, None
+        if landmarker:
+            landmarker.close()
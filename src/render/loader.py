@@ -1,6 +1,6 @@
 # loader.py
-from ..utils import Logger, resource_path
-import json, cv2
+from ..utils import Config, Logger
+import cv2
 from cv2_enumerate_cameras import enumerate_cameras as ec
 
 
@@ -12,17 +12,42 @@ class Loader:
 
     def jsonloader(self):
         try:
-            with open(resource_path("config/parameter.json"), "rb") as file:
-                return json.load(file)
+            return Config().parameter()
         except Exception as e:
             self.logger.LogExit("jsonloader", e)
             self.app.running = False
 
-    def open_camera(self):
+    def open_video(self, path):
+        """
+        Open a video file as a stand-in for the camera.
+        """
         try:
-            for cam in ec(cv2.CAP_MSMF):
+            cap = cv2.VideoCapture(path)
+            if cap.isOpened():
+                return cap
+            self.logger.LogExit("open_video", f"Cannot open {path}", custom=True)
+            self.app.running = False
+        except Exception as e:
+            self.logger.LogExit("open_video", e)
+            self.app.running = False
+
+    def open_camera(self, mode=None, index=None):
+        """
+        :param mode: Requested [width, height, fps] (the auto-tuned camera mode).
+        :param index: Open only the nth enumerated camera (multi-camera
+            tracking) instead of the first one that opens.
+        """
+        try:
+            cameras = list(ec(cv2.CAP_MSMF))
+            if index is not None:
+                cameras = cameras[index : index + 1]
+            for cam in cameras:
                 cap = cv2.VideoCapture(cam.index)
                 if cap.isOpened():
+                    if mode:
+                        cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode[0])
+                        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode[1])
+                        cap.set(cv2.CAP_PROP_FPS, mode[2])
                     return cap
             self.app.running = False
         except Exception as e:
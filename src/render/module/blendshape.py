@@ -0,0 +1,166 @@
+from .calculation import Calculation
+import numpy as np
+
+# MediaPipe face blendshape categories, in model output order.
+BLENDSHAPE_NAMES = (
+    "_neutral",
+    "browDownLeft",
+    "browDownRight",
+    "browInnerUp",
+    "browOuterUpLeft",
+    "browOuterUpRight",
+    "cheekPuff",
+    "cheekSquintLeft",
+    "cheekSquintRight",
+    "eyeBlinkLeft",
+    "eyeBlinkRight",
+    "eyeLookDownLeft",
+    "eyeLookDownRight",
+    "eyeLookInLeft",
+    "eyeLookInRight",
+    "eyeLookOutLeft",
+    "eyeLookOutRight",
+    "eyeLookUpLeft",
+    "eyeLookUpRight",
+    "eyeSquintLeft",
+    "eyeSquintRight",
+    "eyeWideLeft",
+    "eyeWideRight",
+    "jawForward",
+    "jawLeft",
+    "jawOpen",
+    "jawRight",
+    "mouthClose",
+    "mouthDimpleLeft",
+    "mouthDimpleRight",
+    "mouthFrownLeft",
+    "mouthFrownRight",
+    "mouthFunnel",
+    "mouthLeft",
+    "mouthLowerDownLeft",
+    "mouthLowerDownRight",
+    "mouthPressLeft",
+    "mouthPressRight",
+    "mouthPucker",
+    "mouthRight",
+    "mouthRollLower",
+    "mouthRollUpper",
+    "mouthShrugLower",
+    "mouthShrugUpper",
+    "mouthSmileLeft",
+    "mouthSmileRight",
+    "mouthStretchLeft",
+    "mouthStretchRight",
+    "mouthUpperUpLeft",
+    "mouthUpperUpRight",
+    "noseSneerLeft",
+    "noseSneerRight",
+)
+
+# Head pose channels decomposed from the facial transformation matrix.
+POSE_NAMES = ("roll", "yaw", "pitch")
+
+FEATURE_NAMES = BLENDSHAPE_NAMES + POSE_NAMES
+
+# Fallback spec, mirrored in config/parameter.json ("BLENDSHAPE_MAPPINGS").
+DEFAULT_BLENDSHAPE_MAPPINGS = [
+    {
+        "input": "eyeBlinkLeft",
+        "target": "EyeLOpen",
+        "range": [0.1, 0.7],
+        "output": [1, 0],
+    },
+    {
+        "input": "eyeBlinkRight",
+        "target": "EyeROpen",
+        "range": [0.1, 0.7],
+        "output": [1, 0],
+    },
+    {"input": "jawOpen", "target": "MouthOpenY", "range": [0.0, 0.6]},
+    {
+        "input": {"mouthSmileLeft": 0.5, "mouthSmileRight": 0.5},
+        "target": "MouthForm",
+        "range": [0.0, 0.7],
+    },
+    {"input": "yaw", "target": "AngleX", "range": [-30, 30], "output": [-30, 30]},
+    {"input": "pitch", "target": "AngleY", "range": [-30, 30], "output": [-30, 30]},
+    {"input": "roll", "target": "AngleZ", "range": [-30, 30], "output": [-30, 30]},
+    {
+        "input": {
+            "eyeLookInLeft": 0.5,
+            "eyeLookOutLeft": -0.5,
+            "eyeLookOutRight": 0.5,
+            "eyeLookInRight": -0.5,
+        },
+        "target": "EyeBallX",
+        "range": [-0.6, 0.6],
+        "output": [-1, 1],
+    },
+    {
+        "input": {
+            "eyeLookUpLeft": 0.5,
+            "eyeLookUpRight": 0.5,
+            "eyeLookDownLeft": -0.5,
+            "eyeLookDownRight": -0.5,
+        },
+        "target": "EyeBallY",
+        "range": [-0.6, 0.6],
+        "output": [-1, 1],
+    },
+    {
+        "input": {"browOuterUpLeft": 1.0, "browInnerUp": 0.5, "browDownLeft": -1.0},
+        "target": "BrowLY",
+        "range": [-1, 1],
+        "output": [-1, 1],
+    },
+    {
+        "input": {"browOuterUpRight": 1.0, "browInnerUp": 0.5, "browDownRight": -1.0},
+        "target": "BrowRY",
+        "range": [-1, 1],
+        "output": [-1, 1],
+    },
+    {
+        "input": {"cheekPuff": 1.0, "cheekSquintLeft": 0.5, "cheekSquintRight": 0.5},
+        "target": "Cheek",
+        "range": [0, 1],
+    },
+]
+
+
+class BlendshapeFeatures:
+    """
+    Feature source reading MediaPipe blendshape scores and the facial
+    transformation matrix straight into a MappingPipeline input vector.
+    """
+
+    def __init__(self, mapping):
+        """
+        :param mapping: MappingPipeline compiled from BLENDSHAPE_MAPPINGS.
+        """
+        unknown = [name for name in mapping.inputs if name not in FEATURE_NAMES]
+        if unknown:
+            raise ValueError(f"Unknown blendshape inputs: {unknown}")
+
+        self.mapping = mapping
+        self.calculation = Calculation()
+        self.scores = np.zeros(len(FEATURE_NAMES), dtype=np.float32)
+        self._index = np.array(
+            [FEATURE_NAMES.index(name) for name in mapping.inputs], dtype=np.intp
+        )
+        self._pose = slice(len(BLENDSHAPE_NAMES), len(FEATURE_NAMES))
+
+    def read(self, results) -> bool:
+        """
+        Load the first face of a FaceLandmarkerResult into the pipeline.
+        :return: False when the result carries no blendshapes.
+        """
+        if not results.face_blendshapes or not results.facial_transformation_matrixes:
+            return False
+
+        categories = results.face_blendshapes[0]
+        self.scores[: len(categories)] = [c.score for c in categories]
+        self.scores[self._pose] = self.calculation.calculate_head_pose_matrix(
+            results.facial_transformation_matrixes[0]
+        )
+        np.take(self.scores, self._index, out=self.mapping.input_values)
+        return True
@@ -0,0 +1,111 @@
+from .calculation import Calculation
+import numpy as np
+
+# MediaPipe pose landmark indices
+NOSE = 0
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+
+# Fallback specs, mirrored in config/parameter.json ("BODY_MAPPINGS" / "HAND_MAPPINGS").
+DEFAULT_BODY_MAPPINGS = [
+    {
+        "input": "bodyYaw",
+        "target": "BodyAngleX",
+        "range": [-40, 40],
+        "output": [-10, 10],
+    },
+    {
+        "input": "bodyLean",
+        "target": "BodyAngleY",
+        "range": [0.3, 0.8],
+        "output": [-10, 10],
+    },
+    {
+        "input": "bodyRoll",
+        "target": "BodyAngleZ",
+        "range": [-20, 20],
+        "output": [-10, 10],
+    },
+]
+DEFAULT_HAND_MAPPINGS = [
+    {"input": "handLeftY", "target": "HandL", "range": [0.2, 0.9]},
+    {"input": "handRightY", "target": "HandR", "range": [0.2, 0.9]},
+]
+
+BODY_FEATURES = ("bodyYaw", "bodyLean", "bodyRoll")
+HAND_FEATURES = ("handLeftY", "handRightY")
+
+
+class BodyFeatures:
+    """
+    Feature source for the pose and hand landmarkers, read straight into
+    the BODY_MAPPINGS / HAND_MAPPINGS input vectors.
+
+    - bodyYaw: shoulder asymmetry around the nose (calculate_body_angle_x)
+    - bodyLean: nose height above the shoulders, in shoulder widths
+    - bodyRoll: shoulder line tilt in degrees
+    - handLeftY / handRightY: wrist height in the frame (0 bottom, 1 top),
+      0 while the hand is out of view
+    """
+
+    def __init__(self, body_mapping, hand_mapping, mirror: bool = False):
+        """
+        :param mirror: Landmarks come from an unmirrored frame (MIRROR
+            "landmarks"): flip x and swap left/right.
+        """
+        for mapping, names in (
+            (body_mapping, BODY_FEATURES),
+            (hand_mapping, HAND_FEATURES),
+        ):
+            unknown = [name for name in mapping.inputs if name not in names]
+            if unknown:
+                raise ValueError(f"Unknown body inputs: {unknown}")
+        self.body = body_mapping
+        self.hands = hand_mapping
+        self.mirror = mirror
+        self.calculation = Calculation()
+        self._body = np.zeros(len(BODY_FEATURES), dtype=np.float32)
+        self._hands = np.zeros(len(HAND_FEATURES), dtype=np.float32)
+        self._body_index = np.array(
+            [BODY_FEATURES.index(n) for n in body_mapping.inputs], dtype=np.intp
+        )
+        self._hand_index = np.array(
+            [HAND_FEATURES.index(n) for n in hand_mapping.inputs], dtype=np.intp
+        )
+
+    def read_pose(self, results) -> bool:
+        """
+        Load the first person of a PoseLandmarkerResult into BODY_MAPPINGS.
+        :return: False when nobody was found (previous values carry on).
+        """
+        if not results or not results.pose_landmarks:
+            return False
+        pose = results.pose_landmarks[0]
+        nose = pose[NOSE]
+        left, right = pose[LEFT_SHOULDER], pose[RIGHT_SHOULDER]
+        if self.mirror:
+            left, right = right, left
+        width = abs(right.x - left.x)
+        if width == 0:
+            return False
+
+        yaw = self.calculation.calculate_body_angle_x(nose.x, left, right)
+        delta_x = right.x - left.x
+        roll = np.degrees(np.arctan((right.y - left.y) / delta_x))
+        lean = ((left.y + right.y) / 2 - nose.y) / width
+        if self.mirror:
+            roll = -roll  # x -> 1 - x flips the tilt; the yaw swap covers yaw
+        self._body[:] = (yaw, lean, roll)
+        np.take(self._body, self._body_index, out=self.body.input_values)
+        return True
+
+    def read_hands(self, results) -> None:
+        """Load a HandLandmarkerResult into HAND_MAPPINGS."""
+        self._hands.fill(0.0)
+        if results and results.hand_landmarks:
+            for hand, handedness in zip(results.hand_landmarks, results.handedness):
+                left = handedness[0].category_name == "Left"
+                if self.mirror:
+                    left = not left
+                self._hands[0 if left else 1] = 1.0 - hand[0].y  # wrist
+        np.take(self._hands, self._hand_index, out=self.hands.input_values)
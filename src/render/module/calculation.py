@@ -96,6 +96,35 @@ class Calculation:
             self.logger.LogExit("calculate_head_pose", e)
             return 0.0, 0.0, 0.0
 
+    def calculate_head_pose_matrix(self, matrix):
+        """
+        Decompose a facial transformation matrix into head rotation angles.
+        :param matrix: 4x4 face-to-camera transform from the face landmarker
+        :return: (roll_angle, yaw_angle, pitch_angle) in degrees
+        """
+        try:
+            r = np.asarray(matrix, dtype=np.float64)[:3, :3]
+            r = r / np.linalg.norm(r, axis=0)  # strip scale
+
+            sy = np.hypot(r[0, 0], r[1, 0])
+            yaw_angle = np.arctan2(-r[2, 0], sy)
+            if sy > 1e-6:
+                pitch_angle = np.arctan2(r[2, 1], r[2, 2])
+                roll_angle = np.arctan2(r[1, 0], r[0, 0])
+            else:
+                # Gimbal lock: fold roll into pitch
+                pitch_angle = np.arctan2(-r[1, 2], r[1, 1])
+                roll_angle = 0.0
+
+            return (
+                np.degrees(roll_angle),
+                np.degrees(yaw_angle),
+                np.degrees(pitch_angle),
+            )
+        except Exception as e:
+            self.logger.LogExit("calculate_head_pose_matrix", e)
+            return 0.0, 0.0, 0.0
+
     def calculate_body_angle_x(self, body_center_x, left_shoulder, right_shoulder):
         """
         Calculate body rotation angle (yaw) based on shoulder positions.
@@ -0,0 +1,275 @@
+import numpy as np
+
+LUT_SIZE = 256
+
+# Fallback specs, mirrored in config/parameter.json ("MAPPINGS" / "MODEL_MAPPINGS").
+DEFAULT_MAPPINGS = [
+    {
+        "input": "lEyeOpenRatio",
+        "target": "EyeLOpen",
+        "range": ["EYE_OPENNESS_MIN", "EYE_OPENNESS_MAX"],
+        "curve": [[0, 0], [0.05, 0], [0.8, 1], [1, 1]],
+        "step": 0.1,
+    },
+    {
+        "input": "rEyeOpenRatio",
+        "target": "EyeROpen",
+        "range": ["EYE_OPENNESS_MIN", "EYE_OPENNESS_MAX"],
+        "curve": [[0, 0], [0.05, 0], [0.8, 1], [1, 1]],
+        "step": 0.1,
+    },
+    {
+        "input": "mouthOpenRatio",
+        "target": "MouthOpenY",
+        "range": ["MOUTH_OPENNESS_MIN", "MOUTH_OPENNESS_MAX"],
+        "step": 0.1,
+    },
+    {"input": "mouthForm", "target": "MouthForm", "range": [0.08, 0.14]},
+    {"input": "yaw", "target": "AngleX", "range": [-30, 30], "output": [-30, 30]},
+    {"input": "pitch", "target": "AngleY", "range": [-30, 30], "output": [-30, 30]},
+    {"input": "roll", "target": "AngleZ", "range": [-30, 30], "output": [-30, 30]},
+    {
+        "input": "eyeBallX",
+        "target": "EyeBallX",
+        "range": [-0.18, 0.18],
+        "output": [-1, 1],
+    },
+]
+
+DEFAULT_MODEL_MAPPINGS = [
+    {"input": "EyeLOpen", "target": "ParamEyeLOpen"},
+    {"input": "EyeROpen", "target": "ParamEyeROpen"},
+    {"input": "MouthOpenY", "target": "ParamMouthOpenY"},
+    {"input": "MouthForm", "target": "ParamMouthForm"},
+    {"input": "AngleX", "target": "ParamAngleX"},
+    {"input": "AngleY", "target": "ParamAngleY"},
+    {"input": "AngleZ", "target": "ParamAngleZ"},
+    {"input": "AngleX", "target": "ParamBodyAngleX"},
+    {"input": "AngleY", "target": "ParamBodyAngleY"},
+    {"input": "AngleZ", "target": "ParamBodyAngleZ"},
+    {"input": "BustX", "target": "ParamBustX"},
+    {"input": "BustY", "target": "ParamBustY"},
+    {"input": "BodyAngleX", "target": "ParamBaseX"},
+    {"input": "BodyAngleY", "target": "ParamBaseY"},
+    {"input": "EyeBallX", "target": "ParamEyeBallX"},
+    {"input": "EyeBallY", "target": "ParamEyeBallY"},
+    {"input": "BrowLY", "target": "ParamBrowLY"},
+    {"input": "BrowRY", "target": "ParamBrowRY"},
+    {"input": "Cheek", "target": "ParamCheek"},
+    {"input": "AngleX", "target": "ParamBodyLeft", "range": [-30, 0], "output": [1, 0]},
+    {"input": "AngleX", "target": "ParamBodyRight", "range": [0, 30]},
+    {"input": "AngleY", "target": "ParamBodyBack", "range": [0, 30]},
+    {
+        "input": "AngleY",
+        "target": "ParamBodyFront",
+        "range": [-30, 0],
+        "output": [1, 0],
+    },
+    {"constant": 1, "target": "Param14"},
+]
+
+CURVES = {
+    "linear": lambda t: t,
+    "smoothstep": lambda t: t * t * (3 - 2 * t),
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: 1 - (1 - t) * (1 - t),
+}
+
+
+def bake_curve(curve, gamma: float = 1.0, size: int = LUT_SIZE) -> np.ndarray:
+    """
+    Bake a response curve into a lookup table sampled over [0, 1].
+    :param curve: Curve name from CURVES, "gamma", or a list of [x, y] points.
+    :param gamma: Exponent used by the "gamma" curve.
+    :param size: Number of samples.
+    :return: float32 array of `size` samples.
+    """
+    t = np.linspace(0.0, 1.0, size)
+    if isinstance(curve, (list, tuple)):
+        points = np.asarray(curve, dtype=np.float64)
+        lut = np.interp(t, points[:, 0], points[:, 1])
+    elif curve == "gamma":
+        lut = t**gamma
+    elif curve in CURVES:
+        lut = CURVES[curve](t)
+    else:
+        raise ValueError(f"Unknown response curve: {curve!r}")
+    return lut.astype(np.float32)
+
+
+class MappingPipeline:
+    """
+    Declarative input -> target mapping compiled to NumPy arrays.
+
+    Each spec entry maps one named input to one target:
+    - input / target: source name and destination parameter ID; the input
+      may also be a {name: weight} dict, evaluated as a weighted sum
+    - range: input range normalised to [0, 1]; omitted means passthrough,
+      which takes no curve, gamma or output
+    - curve: response curve (name, "gamma" or [x, y] points), baked to a LUT
+    - output: output range for the normalised value (default [0, 1])
+    - clamp: final [lo, hi] clamp
+    - step: quantisation step (0 disables)
+    - constant: emit a fixed value instead of reading an input
+
+    Range bounds may name a top-level numeric key of parameter.json.
+    """
+
+    def __init__(self, spec: list, constants: dict = None):
+        """
+        Compile the spec.
+        :param spec: List of mapping entries.
+        :param constants: Lookup for named range bounds (parameter.json data).
+        """
+        constants = constants or {}
+        self.inputs = []
+        self.targets = []
+        count = len(spec)
+
+        weights = []
+        lo = np.zeros(count, dtype=np.float32)
+        span = np.ones(count, dtype=np.float32)
+        out_lo = np.zeros(count, dtype=np.float32)
+        out_span = np.ones(count, dtype=np.float32)
+        clamp_lo = np.full(count, -np.inf, dtype=np.float32)
+        clamp_hi = np.full(count, np.inf, dtype=np.float32)
+        step = np.zeros(count, dtype=np.float32)
+        passthrough = np.zeros(count, dtype=bool)
+        constant = np.full(count, np.nan, dtype=np.float32)
+        lut = np.empty((count, LUT_SIZE), dtype=np.float32)
+
+        def resolve(value):
+            return float(constants[value] if isinstance(value, str) else value)
+
+        for row, entry in enumerate(spec):
+            self.targets.append(entry["target"])
+            if "constant" in entry:
+                constant[row] = float(entry["constant"])
+                lut[row] = 0.0
+                continue
+
+            source = entry["input"]
+            if isinstance(source, str):
+                source = {source: 1.0}
+            for name, weight in source.items():
+                if name not in self.inputs:
+                    self.inputs.append(name)
+                weights.append((row, self.inputs.index(name), float(weight)))
+
+            lut[row] = bake_curve(entry.get("curve", "linear"), entry.get("gamma", 1.0))
+            if "range" in entry:
+                r_lo, r_hi = (resolve(v) for v in entry["range"])
+                lo[row] = r_lo
+                span[row] = r_hi - r_lo if r_hi != r_lo else np.inf
+                o_lo, o_hi = (resolve(v) for v in entry.get("output", (0.0, 1.0)))
+                out_lo[row] = o_lo
+                out_span[row] = o_hi - o_lo
+            else:
+                shaping = sorted({"curve", "gamma", "output"} & entry.keys())
+                if shaping:
+                    raise ValueError(
+                        f"Mapping to {entry['target']!r} sets {', '.join(shaping)} "
+                        "without a range"
+                    )
+                passthrough[row] = True
+
+            if "clamp" in entry:
+                clamp_lo[row], clamp_hi[row] = (resolve(v) for v in entry["clamp"])
+            step[row] = float(entry.get("step", 0.0))
+
+        self._weights = np.zeros((count, len(self.inputs)), dtype=np.float32)
+        for row, column, weight in weights:
+            self._weights[row, column] += weight
+        self._x = np.zeros(count, dtype=np.float32)
+        self._rows = np.arange(count)
+        self._lo = lo
+        self._inv_span = (1.0 / span).astype(np.float32)
+        self._out_lo = out_lo
+        self._out_span = out_span
+        self._clamp_lo = clamp_lo
+        self._clamp_hi = clamp_hi
+        self._step = step
+        self._quantized = step > 0
+        self._safe_step = np.where(self._quantized, step, 1.0).astype(np.float32)
+        self._passthrough = passthrough
+        self._constant = constant
+        self._has_constant = ~np.isnan(constant)
+        self._lut = lut
+
+        self.input_values = np.zeros(len(self.inputs), dtype=np.float32)
+        self._clean = np.zeros(len(self.inputs), dtype=np.float32)
+        self.output = np.zeros(count, dtype=np.float32)
+        self._array_keys = None
+
+    def evaluate(self, inputs: np.ndarray = None) -> np.ndarray:
+        """
+        Evaluate every mapping in one vectorized pass.
+        :param inputs: Values ordered as `self.inputs` (defaults to `input_values`).
+        :return: Output array ordered as `self.targets`.
+        """
+        if inputs is None:
+            inputs = self.input_values
+        # The weight matrix is dense: one NaN input would reach every row
+        np.copyto(self._clean, inputs)
+        np.nan_to_num(self._clean, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+        x = np.dot(self._weights, self._clean, out=self._x)
+
+        t = np.clip((x - self._lo) * self._inv_span, 0.0, 1.0)
+        pos = t * (LUT_SIZE - 1)
+        i0 = np.minimum(pos.astype(np.intp), LUT_SIZE - 2)
+        frac = pos - i0
+        v = (
+            self._lut[self._rows, i0] * (1 - frac)
+            + self._lut[self._rows, i0 + 1] * frac
+        )
+
+        out = self.output
+        np.multiply(v, self._out_span, out=out)
+        out += self._out_lo
+        np.copyto(out, x, where=self._passthrough)
+        np.clip(out, self._clamp_lo, self._clamp_hi, out=out)
+        if self._quantized.any():
+            q = np.round(out / self._safe_step) * self._safe_step
+            np.copyto(out, q, where=self._quantized)
+        np.copyto(out, self._constant, where=self._has_constant)
+        return out
+
+    def bounds(self) -> tuple:
+        """
+        Lowest and highest value each row can output, ordered as
+        `self.targets` (infinite for unclamped passthrough rows).
+        :return: (lo, hi) float64 arrays.
+        """
+        lut_lo = self._lut.min(axis=1).astype(np.float64)
+        lut_hi = self._lut.max(axis=1).astype(np.float64)
+        a = self._out_lo + lut_lo * self._out_span
+        b = self._out_lo + lut_hi * self._out_span
+        lo = np.where(self._passthrough, -np.inf, np.minimum(a, b))
+        hi = np.where(self._passthrough, np.inf, np.maximum(a, b))
+        lo = np.maximum(lo, self._clamp_lo)
+        hi = np.minimum(hi, self._clamp_hi)
+        lo = np.where(self._has_constant, self._constant, lo)
+        hi = np.where(self._has_constant, self._constant, hi)
+        return lo, hi
+
+    def load(self, values: dict) -> None:
+        """Fill `input_values` from a name -> value mapping."""
+        self.input_values[:] = [values.get(k, 0.0) for k in self.inputs]
+
+    def load_attrs(self, obj) -> None:
+        """Fill `input_values` from attributes of `obj`."""
+        self.input_values[:] = [getattr(obj, k, 0.0) for k in self.inputs]
+
+    def load_array(self, values: np.ndarray, keys: list) -> None:
+        """
+        Fill `input_values` from an array ordered as `keys` (e.g.
+        Params.values with Params.PARAMETER_KEYS). The gather index is
+        built once per `keys` list; inputs missing from it stay 0.
+        """
+        if self._array_keys is not keys:
+            pairs = [(i, keys.index(k)) for i, k in enumerate(self.inputs) if k in keys]
+            self._array_dst = np.array([d for d, _ in pairs], dtype=np.intp)
+            self._array_src = np.array([s for _, s in pairs], dtype=np.intp)
+            self._array_keys = keys
+            self.input_values[:] = 0.0
+        self.input_values[self._array_dst] = values[self._array_src]
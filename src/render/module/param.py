@@ -1,9 +1,19 @@
+import numpy as np
+import threading
+
+
 class Params:
     """
     Facial tracking parameters with smoothing:
     - Supports exponential or linear smoothing
     - Bust smoothing (separate factor)
-    - Calibration for narrow eye opening range
+    - Optional render-time extrapolation of timestamped tracking samples
+
+    Tracked values land in `target` (capture thread); `values` holds the
+    smoothed values shown by the renderer, also readable as attributes
+    (params.AngleX). Exponential smoothing runs in place on preallocated
+    arrays, so a steady-state update allocates no Python containers.
+    Range calibration happens upstream in the MAPPINGS pipeline.
     """
 
     PARAMETER_KEYS = [
@@ -18,32 +28,228 @@ class Params:
         "BodyAngleY",
         "BodyAngleZ",
         "EyeBallX",
+        "EyeBallY",
+        "BrowLY",
+        "BrowRY",
+        "Cheek",
         "BustX",
         "BustY",
+        "HandL",
+        "HandR",
     ]
 
+    # Number of timestamped samples used to estimate velocity
+    HISTORY = 4
+
     def __init__(
         self,
         smooth_factor: float = 0.5,
         linear_steps: int = 0,
         bust_smooth: float = 0.7,
-        eye_open_min: float = 0.05,
-        eye_open_max: float = 0.8,
+        predict: bool = False,
+        horizon: float = 0.1,
+        damping: float = 0.8,
     ):
         """
-        Initialize Params object with smoothing and calibration settings.
+        Initialize Params object with smoothing and prediction settings.
+        """
+        keys = self.PARAMETER_KEYS
+        self.values = np.array(
+            [1.0 if k in ("EyeLOpen", "EyeROpen") else 0.0 for k in keys]
+        )
+        self._linear_counters = {k: 0 for k in keys}
+        self._linear_deltas = {k: 0.0 for k in keys}
+
+        self._key_index = {k: i for i, k in enumerate(keys)}
+        self._bust = tuple(
+            (self._key_index[b], self._key_index[a])
+            for b, a in (("BustX", "AngleX"), ("BustY", "AngleY"))
+        )
+        self._factors = np.empty(len(keys))
+        self.set_smoothing(smooth_factor, bust_smooth, linear_steps)
+        self._predicted = np.empty(len(keys))
+        self._work = np.empty(len(keys))
+
+        self._target_index = {}
+        # Range each key's extrapolated target stays in (see set_limits)
+        self._lo = np.full(len(keys), -np.inf)
+        self._hi = np.full(len(keys), np.inf)
+        self._owners = [None] * len(keys)
+        self.target = self.values.copy()
+        # Second source mixed into the targets once per frame (see set_blend)
+        self._blend = np.zeros(len(keys))
+        self._blend_weight = np.zeros(len(keys))
+        self._lock = threading.Lock()
+        self._history = np.zeros((self.HISTORY, len(self.PARAMETER_KEYS)))
+        self._history_t = np.zeros(self.HISTORY)
+        self._samples = 0
+        self.sample_id = -1  # latest pushed LatencyTracker sample
+        self.set_prediction(predict, horizon, damping)
+
+    def set_smoothing(
+        self, factor: float = 0.5, bust: float = 0.7, linear_steps: int = 0
+    ) -> None:
         """
-        for key in self.PARAMETER_KEYS:
-            setattr(self, key, 1.0 if key in ("EyeLOpen", "EyeROpen") else 0.0)
+        Change smoothing; takes effect on the next update_params().
 
-        self.prev = {k: getattr(self, k) for k in self.PARAMETER_KEYS}
-        self.smooth_factor = smooth_factor
+        :param factor: Exponential factor (0 follows targets immediately).
+        :param bust: Factor for BustX/BustY following the head angles.
+        :param linear_steps: Frames per linear transition ('linear' mode).
+        """
+        self.smooth_factor = factor
+        self.bust_smooth = bust
         self.linear_steps = linear_steps
-        self.bust_smooth = bust_smooth
-        self.eye_open_min = eye_open_min
-        self.eye_open_max = eye_open_max
-        self._linear_counters = {k: 0 for k in self.PARAMETER_KEYS}
-        self._linear_deltas = {k: 0.0 for k in self.PARAMETER_KEYS}
+        self._factors.fill(factor)
+        for index, _ in self._bust:
+            self._factors[index] = bust
+
+    def set_prediction(
+        self, enabled: bool = False, horizon: float = 0.1, damping: float = 0.8
+    ) -> None:
+        """
+        Configure render-time extrapolation.
+
+        :param enabled: Extrapolate targets to the expected display time.
+        :param horizon: Maximum extrapolation in seconds.
+        :param damping: Fraction of the estimated velocity applied (0..1).
+        """
+        self.predict = enabled
+        self.horizon = horizon
+        self.damping = damping
+
+    def set_limits(self, keys: list, lo, hi) -> None:
+        """
+        Bound extrapolated targets, usually to a mapping's output range
+        (MappingPipeline.bounds()). Keys outside PARAMETER_KEYS are ignored;
+        a key listed twice gets the union of its ranges.
+        """
+        bounds = {}
+        for key, low, high in zip(keys, lo, hi):
+            if key in self._key_index:
+                old = bounds.get(key)
+                bounds[key] = (
+                    (min(old[0], low), max(old[1], high)) if old else (low, high)
+                )
+        with self._lock:
+            for key, (low, high) in bounds.items():
+                index = self._key_index[key]
+                self._lo[index], self._hi[index] = low, high
+
+    def reserve(self, keys: list, owner: str) -> None:
+        """
+        Reserve parameters for one source; other sources' writes to them
+        are ignored until released with owner=None.
+        """
+        with self._lock:
+            for key in keys:
+                if key in self._key_index:
+                    self._owners[self._key_index[key]] = owner
+            self._target_index.clear()
+
+    def set_targets(
+        self,
+        keys: list,
+        values,
+        timestamp: float = None,
+        weight: float = 1.0,
+        owner: str = None,
+    ) -> None:
+        """
+        Store tracked values (capture side).
+
+        :param keys: Parameter names, matching `values` by position.
+            Names outside PARAMETER_KEYS or reserved by another owner are ignored.
+        :param values: Sequence or array of values.
+        :param timestamp: time.perf_counter() of the frame capture, recorded
+            for extrapolation.
+        :param weight: Blend factor towards `values` (1.0 replaces).
+        :param owner: Name of the writing source, checked against reserve().
+        """
+        dst, src = self._target_indices(keys, owner)
+        with self._lock:
+            if weight >= 1.0:
+                self.target[dst] = np.take(values, src)
+            else:
+                current = self.target[dst]
+                self.target[dst] = current + (np.take(values, src) - current) * weight
+            if timestamp is not None:
+                row = self._samples % self.HISTORY
+                self._history[row] = self.target
+                self._history_t[row] = timestamp
+                self._samples += 1
+
+    def set_blend(self, keys: list, values, weight: float) -> None:
+        """
+        Store values of a secondary source (audio) kept apart from the tracked
+        targets; update_params() mixes them in once per frame, so the mix does
+        not depend on how often either source writes.
+
+        :param keys: Parameter names, matching `values` by position.
+        :param values: Sequence or array of values.
+        :param weight: Share of `values` in the mix (0 turns the keys off).
+        """
+        dst, src = self._target_indices(keys, None)
+        with self._lock:
+            self._blend[dst] = np.take(values, src)
+            self._blend_weight[dst] = min(max(weight, 0.0), 1.0)
+
+    def _target_indices(self, keys: list, owner: str) -> tuple:
+        # (destination, source) index arrays of the keys `owner` may write
+        cache_key = (tuple(keys), owner)
+        cached = self._target_index.get(cache_key)
+        if cached is None:
+            writable = [
+                (self._key_index[k], i)
+                for i, k in enumerate(keys)
+                if k in self._key_index
+                and self._owners[self._key_index[k]] in (None, owner)
+            ]
+            dst = np.array([d for d, _ in writable], dtype=np.intp)
+            src = np.array([i for _, i in writable], dtype=np.intp)
+            if len(self._target_index) >= 64:
+                self._target_index.clear()  # callers building new key lists
+            cached = (dst, src)
+            self._target_index[cache_key] = cached
+        return cached
+
+    @property
+    def samples(self) -> int:
+        """Timestamped tracking samples received so far."""
+        return self._samples
+
+    def predict_targets(
+        self, display_time: float = None, out: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Return targets extrapolated to `display_time`.
+
+        Velocity is the least-squares slope over the last HISTORY samples;
+        the lead time is clamped to [0, horizon] and scaled by damping, and
+        the result to each key's set_limits() range.
+
+        :param out: Array to write into (a new one when None).
+        """
+        if out is None:
+            out = np.empty_like(self.target)
+        with self._lock:
+            np.copyto(out, self.target)
+            count = min(self._samples, self.HISTORY)
+            if not self.predict or display_time is None or count < 2:
+                return out
+
+            latest = (self._samples - 1) % self.HISTORY
+            t = self._history_t[:count]
+            x = self._history[:count]
+            dt = t - t.mean()
+            denom = dt @ dt
+            if denom <= 0.0:
+                return out
+            slope = dt @ (x - x.mean(axis=0)) / denom
+            lead = min(max(display_time - t[latest], 0.0), self.horizon)
+            slope *= lead * self.damping
+            out += slope
+            np.clip(out, self._lo, self._hi, out=out)
+            return out
 
     @staticmethod
     def _clamp(val: float, lo: float = 0.0, hi: float = 1.0) -> float:
@@ -86,35 +292,68 @@ class Params:
             return True
         return False
 
-    def update_params(self, new_params: "Params", mode: str = "exp") -> None:
+    def update_params(
+        self,
+        new_params: "Params" = None,
+        mode: str = "exp",
+        display_time: float = None,
+    ) -> None:
         """
         Update all parameters, applying smoothing.
 
         :param new_params: Another Params instance containing new target values.
+            Defaults to this instance's own (optionally extrapolated) targets.
         :param mode: Smoothing mode ('exp' for exponential, 'linear' for linear).
+        :param display_time: Expected time.perf_counter() of the next flip.
         """
-        for key in self.PARAMETER_KEYS:
-            if key == "BustX":
-                target = getattr(self, "AngleX")
-                factor = self.bust_smooth
-            elif key == "BustY":
-                target = getattr(self, "AngleY")
-                factor = self.bust_smooth
-            else:
-                target = getattr(new_params, key, 0.0)
-                factor = self.smooth_factor
-                if key in ("EyeLOpen", "EyeROpen"):
-                    mapped = (target - self.eye_open_min) / (
-                        self.eye_open_max - self.eye_open_min
-                    )
-                    target = self._clamp(mapped)
-
-            if mode == "linear":
-                if target != self.prev.get(key, 0.0):
-                    self.start_linear(key, target)
-                if not self.smooth_linear(key):
-                    setattr(self, key, target)
+        targets = self._predicted
+        if new_params is None or new_params is self:
+            self.predict_targets(display_time, out=targets)
+        else:
+            for index, key in enumerate(self.PARAMETER_KEYS):
+                targets[index] = getattr(new_params, key, 0.0)
+        with self._lock:
+            if self._blend_weight.any():
+                # targets += (blend - targets) * weight
+                np.subtract(self._blend, targets, out=self._work)
+                self._work *= self._blend_weight
+                targets += self._work
+
+        if mode == "linear":
+            self._update_linear(targets)
+            return
+
+        # values = target + (values - target) * factor, bust after the head
+        values, work = self.values, self._work
+        np.subtract(values, targets, out=work)
+        work *= self._factors
+        work += targets
+        for bust, angle in self._bust:
+            target = work[angle]
+            work[bust] = target + (values[bust] - target) * self.bust_smooth
+        np.copyto(values, work)
+
+    def _update_linear(self, targets: np.ndarray) -> None:
+        for index, key in enumerate(self.PARAMETER_KEYS):
+            if key == "BustX" or key == "BustY":
+                target = float(self.values[self._bust[key == "BustY"][1]])
             else:
-                new_val = self.smooth_exp(target, self.prev.get(key, 0.0), factor)
-                setattr(self, key, new_val)
-            self.prev[key] = getattr(self, key)
+                target = float(targets[index])
+            if target != self.values[index]:
+                self.start_linear(key, target)
+            if not self.smooth_linear(key):
+                self.values[index] = target
+
+
+def _parameter(index: int) -> property:
+    def get(self) -> float:
+        return float(self.values[index])
+
+    def set(self, value: float) -> None:
+        self.values[index] = value
+
+    return property(get, set)
+
+
+for _index, _key in enumerate(Params.PARAMETER_KEYS):
+    setattr(Params, _key, _parameter(_index))
@@ -0,0 +1,491 @@
+# multicam.py
+from .loader import Loader
+from .landmarker import LandmarkerManager
+from .parameter import ParameterManager
+from .preprocess import FramePreprocessor, mirror_indices
+from .module.param import Params
+from .vmc import VMCSender
+from ..utils import Logger, resource_path
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+import mediapipe as mp
+import numpy as np
+import multiprocessing, threading, time, cv2, os
+
+try:
+    import psutil
+except ImportError:  # optional: affinity falls back to os.sched_setaffinity
+    psutil = None
+
+# Shared slot header, followed by Params.target (Params.PARAMETER_KEYS order)
+SEQ, TIME, FACE, CPU, FRAMES, FACES = range(6)
+HEADER = 6
+ROUTES = ("model", "vmc")
+FUSIONS = ("frontal", "priority")
+
+
+def available_cores() -> list:
+    """CPUs this process may run on."""
+    if psutil is not None:
+        try:
+            return sorted(psutil.Process().cpu_affinity())
+        except (AttributeError, OSError):
+            pass
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_cores(count: int, cores: list) -> list:
+    """
+    Disjoint core sets for `count` tracker processes. The first core is
+    left to the render thread when there are more cores than trackers;
+    with fewer cores than trackers they share cores round-robin.
+    """
+    cores = list(cores)
+    if len(cores) > count:
+        cores = cores[1:]
+    if count >= len(cores):
+        return [[cores[i % len(cores)]] for i in range(count)]
+    per = len(cores) // count
+    return [cores[i * per : (i + 1) * per] for i in range(count)]
+
+
+def pin_cores(cores: list) -> bool:
+    """Restrict the calling process (and threads it starts later) to `cores`."""
+    try:
+        if psutil is not None:
+            psutil.Process().cpu_affinity(list(cores))
+            return True
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, set(cores))
+            return True
+    except (AttributeError, OSError, ValueError):
+        pass
+    return False
+
+
+def parse_source(entry) -> dict:
+    """
+    Normalize a MultiCamera "sources" entry: a camera index, a video path,
+    or {"source", "route", "port", "yaw_offset"}.
+    """
+    if not isinstance(entry, dict):
+        entry = {"source": entry}
+    source = entry.get("source", 0)
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    route = entry.get("route", "model")
+    if route not in ROUTES:
+        raise ValueError(f"Unknown route {route!r} for source {source!r}")
+    return {
+        "source": source,
+        "route": route,
+        "port": entry.get("port"),
+        "yaw_offset": float(entry.get("yaw_offset", 0.0)),
+    }
+
+
+def _publish(slot: np.ndarray, timestamp, face, frames, faces, values) -> None:
+    # Seqlock: odd while writing, the reader retries on a changed count
+    slot[SEQ] += 1
+    slot[TIME] = timestamp
+    slot[FACE] = face
+    slot[CPU] = time.process_time()
+    slot[FRAMES] = frames
+    slot[FACES] = faces
+    slot[HEADER:] = values
+    slot[SEQ] += 1
+
+
+def track_source(
+    index: int, source, data: dict, settings: dict, slot_name: str, stop, cores
+):
+    """
+    Tracker process: read one camera or video, run a face landmarker of
+    its own and publish Params targets to the shared slot `slot_name`.
+    :param source: Camera number (nth enumerated camera) or video path.
+    :param settings: "camera" mode, "input_width", "loop" and "realtime".
+    :param stop: multiprocessing.Event ending the process.
+    :param cores: CPUs to pin to, or None.
+    """
+    app = SimpleNamespace(running=True)
+    logger = Logger(f"Tracker{index}")
+    if cores:
+        pin_cores(cores)
+    cv2.setNumThreads(1)  # one process per source already spreads the load
+    memory = shared_memory.SharedMemory(name=slot_name)
+    slot = np.ndarray((HEADER + len(Params.PARAMETER_KEYS),), np.float64, memory.buf)
+    cap = landmarker = None
+    try:
+        manager = ParameterManager(app)
+        manager.compile_mappings(data)
+        mirror = data.get("MIRROR", "pixels")
+        if mirror == "landmarks" and manager.blendshapes:
+            mirror = "pixels"
+        preprocessor = FramePreprocessor(mirror, int(settings.get("input_width", 0)))
+        if preprocessor.mirror == "landmarks":
+            data = mirror_indices(data)
+            manager.mirror_landmarks(True)
+
+        tracker = LandmarkerManager(app)
+        options = tracker.load_model_options(
+            resource_path("src/render/model/face_landmarker.task"),
+            blendshapes=manager.blendshapes is not None,
+        )
+        landmarker = tracker.create_face_landmarker(options)
+        loader = Loader(app)
+        video = isinstance(source, str)
+        if video:
+            cap = loader.open_video(source)
+        else:
+            cap = loader.open_camera(settings.get("camera"), source)
+        if cap is None or landmarker is None:
+            logger.LogExit("track_source", f"Cannot open {source!r}", custom=True)
+            return
+
+        out = Params()
+        video_fps = cap.get(cv2.CAP_PROP_FPS) if settings.get("realtime", True) else 0
+        loop = video and settings.get("loop", True)
+        start = time.perf_counter()
+        frames = faces = played = 0
+        last_ms = -1
+        while not stop.is_set():
+            if video and video_fps:
+                due = start + cap.get(cv2.CAP_PROP_POS_FRAMES) / video_fps
+                time.sleep(max(0.0, due - time.perf_counter()))
+            ret, frame = cap.read(preprocessor.capture)
+            if not ret:
+                if loop and played:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    start, played = time.perf_counter(), 0
+                    continue
+                break
+            # perf_counter is system-wide, so the app can compare timestamps
+            timestamp = time.perf_counter()
+            played += 1
+            frames += 1
+            rgb = preprocessor.process(frame)
+            image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+            last_ms = max(last_ms + 1, int(timestamp * 1000))
+            results = landmarker.detect_for_video(image, last_ms)
+
+            face = False
+            if manager.blendshapes is not None:
+                face = bool(results and manager.process_blendshape_values(results))
+                if face:
+                    manager.update_params(out)
+            elif results and results.face_landmarks:
+                values = manager.process_tracking_values(
+                    results.face_landmarks[0], data
+                )
+                if values:
+                    manager.update_params(out, values, data)
+                    face = True
+            faces += face
+            _publish(slot, timestamp, face, frames, faces, out.target)
+    except Exception as e:
+        logger.LogExit("track_source", e)
+    finally:
+        if cap:
+            cap.release()
+        if landmarker:
+            landmarker.close()
+        del slot
+        memory.close()
+
+
+class SourceSlot:
+    """App-side view of one tracker process and its shared slot."""
+
+    def __init__(self, index: int, entry: dict, vmc: dict = None):
+        self.index = index
+        self.source = entry["source"]
+        self.route = entry["route"]
+        self.yaw_offset = entry["yaw_offset"]
+        self.label = (
+            os.path.basename(self.source)
+            if isinstance(self.source, str)
+            else f"camera {self.source}"
+        )
+        width = HEADER + len(Params.PARAMETER_KEYS)
+        self.memory = shared_memory.SharedMemory(create=True, size=width * 8)
+        self.view = np.ndarray((width,), np.float64, self.memory.buf)
+        self.view[:] = 0.0
+        self.sample = np.zeros(width)
+        self.values = self.sample[HEADER:]
+        self.sender = None
+        if self.route == "vmc":
+            port = entry["port"] or (vmc or {}).get("port")
+            self.sender = VMCSender({**(vmc or {}), "port": port})
+        self.process = None
+        self.cores = None
+        self.seq = 0.0
+        self.first = None  # (wall, cpu, frames, faces) at the first sample
+        self.last = None
+        self.driven = 0
+        self.exited = False
+
+    @property
+    def timestamp(self) -> float:
+        return self.sample[TIME]
+
+    @property
+    def face(self) -> bool:
+        return bool(self.sample[FACE])
+
+    def read(self, now: float) -> bool:
+        """Copy a new sample out of the slot; False when there is none."""
+        seq = self.view[SEQ]
+        if seq == self.seq or seq % 2:
+            return False
+        np.copyto(self.sample, self.view)
+        if self.view[SEQ] != seq or self.sample[SEQ] != seq:
+            return False  # written meanwhile; the next poll picks it up
+        self.seq = seq
+        counters = (now, *self.sample[CPU : FACES + 1].tolist())
+        if self.first is None:
+            self.first = counters
+        self.last = counters
+        return True
+
+    def stats(self) -> dict:
+        report = {"route": self.route, "cores": self.cores, "driven": self.driven}
+        if self.first and self.last and self.last[0] > self.first[0]:
+            wall = self.last[0] - self.first[0]
+            frames = self.last[2] - self.first[2]
+            report.update(
+                fps=round(frames / wall, 1),
+                cpu_pct=round((self.last[1] - self.first[1]) / wall * 100, 1),
+                face_pct=round(
+                    (self.last[3] - self.first[3]) / max(frames, 1) * 100, 1
+                ),
+            )
+        report["frames"] = int(self.sample[FRAMES])
+        return report
+
+    def close(self) -> None:
+        del self.view
+        self.memory.close()
+        self.memory.unlink()
+
+
+class MultiCapture:
+    """
+    Face tracking from several cameras or videos, one process per source.
+
+    Each tracker process owns its capture, face landmarker and mappings,
+    is pinned to its own cores (see plan_cores) and publishes Params
+    targets through a seqlocked shared-memory slot, so trackers never
+    contend for one interpreter lock. A fusion thread in the app reads
+    the slots:
+
+    - "model" sources drive the avatar; with several, fusion "frontal"
+      picks the face seen most head-on (smallest |AngleX|, with
+      `hysteresis` degrees before switching) and "priority" the first
+      listed source that sees a face
+    - "vmc" sources are streamed by their own VMCSender (own port)
+
+    Body models, power-saving frame rates and latency tracking stay with
+    the single-camera Capture.
+    """
+
+    def __init__(
+        self,
+        sources: list,
+        data: dict,
+        settings: dict = None,
+        tracking: dict = None,
+        vmc: dict = None,
+    ):
+        """
+        :param sources: "sources" entries (see parse_source).
+        :param data: parameter.json as a plain dict (sent to each process).
+        :param settings: The "MultiCamera" block of config.json.
+        :param tracking: The "Tracking" block (camera mode, input width).
+        :param vmc: The "VMC" block, for "vmc" routed sources.
+        """
+        settings = settings or {}
+        tracking = tracking or {}
+        self.logger = Logger("MultiCamera")
+        self.data = data
+        self.fusion = settings.get("fusion", "frontal")
+        if self.fusion not in FUSIONS:
+            raise ValueError(f"Unknown fusion {self.fusion!r}")
+        self.hysteresis = float(settings.get("hysteresis", 5.0))
+        self.stale = settings.get("stale_ms", 250) / 1000
+        self.affinity = settings.get("affinity", True)
+        self.process_settings = {
+            "camera": tracking.get("camera"),
+            "input_width": int(tracking.get("input_width", 0)),
+            "loop": settings.get("loop", True),
+            "realtime": settings.get("realtime", True),
+        }
+        self.slots = [
+            SourceSlot(i, parse_source(entry), vmc) for i, entry in enumerate(sources)
+        ]
+        self.models = [slot for slot in self.slots if slot.route == "model"]
+
+        manager = ParameterManager(SimpleNamespace(running=True))
+        manager.compile_mappings(data)
+        mapped = set(manager.mapping.targets)
+        self.limits = (manager.mapping.targets, *manager.mapping.bounds())
+        # Unmapped keys are left to other writers (expressions, audio)
+        self.keys = [k if k in mapped else None for k in Params.PARAMETER_KEYS]
+        keys = Params.PARAMETER_KEYS
+        self.yaw = keys.index("AngleX") if "AngleX" in mapped else None
+        if self.yaw is None and self.fusion == "frontal":
+            self.fusion = "priority"
+        self.active = None
+        self.switches = 0
+        self._push = np.zeros(len(keys))
+        self._context = multiprocessing.get_context("spawn")
+        self._stop = self._context.Event()
+        self._halt = threading.Event()
+
+    def start(self) -> None:
+        """Start one tracker process per source."""
+        plan = (
+            plan_cores(len(self.slots), available_cores())
+            if self.affinity
+            else [None] * len(self.slots)
+        )
+        for slot, cores in zip(self.slots, plan):
+            slot.cores = cores
+            slot.process = self._context.Process(
+                target=track_source,
+                args=(
+                    slot.index,
+                    slot.source,
+                    self.data,
+                    self.process_settings,
+                    slot.memory.name,
+                    self._stop,
+                    cores,
+                ),
+                name=f"Tracker{slot.index}",
+                daemon=True,
+            )
+            slot.process.start()
+            self.logger.logging.info(
+                "Tracker %d: %s -> %s, cores %s",
+                slot.index,
+                slot.label,
+                slot.route,
+                cores or "any",
+            )
+
+    @property
+    def alive(self) -> int:
+        """Tracker processes still running."""
+        return sum(
+            bool(slot.process and slot.process.is_alive()) for slot in self.slots
+        )
+
+    def _choose(self, now: float):
+        """Model source driving the avatar, or None when none sees a face."""
+        seen = [
+            slot
+            for slot in self.models
+            if slot.face and now - slot.timestamp < self.stale
+        ]
+        if not seen:
+            return None
+        if self.fusion == "priority" or len(seen) == 1:
+            return seen[0]
+        best = min(seen, key=lambda slot: abs(slot.values[self.yaw]))
+        current = self.active
+        if (
+            current in seen
+            and abs(current.values[self.yaw])
+            <= abs(best.values[self.yaw]) + self.hysteresis
+        ):
+            return current
+        return best
+
+    def run(
+        self, params: Params, sender: VMCSender = None, power=None, supervisor=None
+    ) -> None:
+        """
+        Fusion loop: push the chosen source's samples into `params` (and
+        `sender`) and stream "vmc" sources, until stop().
+        :param power: PowerManager told about faces, as by Capture.
+        :param supervisor: Supervisor told when every tracker has exited.
+        """
+        params.set_limits(*self.limits)
+        next_check = 0.0
+        while not self._halt.wait(0.002):
+            now = time.perf_counter()
+            fresh = set()
+            for slot in self.slots:
+                if not slot.read(now):
+                    continue
+                fresh.add(slot)
+                if slot.sender and slot.face:
+                    slot.sender.send(slot.values, slot.timestamp)
+
+            chosen = self._choose(now)
+            if chosen is not None and chosen is not self.active:
+                if self.active is not None:
+                    self.switches += 1
+                self.active = chosen
+                fresh.add(chosen)  # push the new view right away
+            if chosen is not None and chosen in fresh:
+                np.copyto(self._push, chosen.values)
+                if self.yaw is not None:
+                    self._push[self.yaw] += chosen.yaw_offset
+                params.set_targets(self.keys, self._push, chosen.timestamp)
+                if sender:
+                    sender.send(params.target, chosen.timestamp)
+                if power:
+                    power.on_face(True, chosen.timestamp)
+                chosen.driven += 1
+
+            if now >= next_check:
+                next_check = now + 1.0
+                self._check_processes(supervisor)
+
+    def _check_processes(self, supervisor=None) -> None:
+        exited = False
+        for slot in self.slots:
+            if slot.exited or slot.process is None or slot.process.is_alive():
+                continue
+            slot.exited = exited = True
+            code = slot.process.exitcode
+            log = self.logger.logging.error if code else self.logger.logging.info
+            log(
+                "Tracker %d (%s) exited with code %s after %d frames",
+                slot.index,
+                slot.label,
+                code,
+                int(slot.view[FRAMES]),
+            )
+        if exited and supervisor and not self.alive:
+            supervisor.fail(
+                threading.current_thread().name, "All tracker processes exited"
+            )
+
+    def stop(self) -> None:
+        self._halt.set()
+        self._stop.set()
+
+    def stats(self) -> dict:
+        """Per-source frame rate, CPU use, cores and times chosen."""
+        report = {"fusion": self.fusion, "switches": self.switches}
+        for slot in self.slots:
+            report[f"{slot.index}:{slot.label}"] = slot.stats()
+        return report
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Stop and join the tracker processes and free the shared slots."""
+        self.stop()
+        deadline = time.perf_counter() + timeout
+        for slot in self.slots:
+            if slot.process is None:
+                continue
+            slot.process.join(max(0.0, deadline - time.perf_counter()))
+            if slot.process.is_alive():
+                slot.process.terminate()
+                slot.process.join(0.5)
+        for slot in self.slots:
+            slot.close()
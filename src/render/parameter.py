@@ -1,20 +1,88 @@
 from .module.calculation import Calculation
-from .module.math import *
+from ..utils import Logger
+from .module.mapping import MappingPipeline, DEFAULT_MAPPINGS
+from .module.blendshape import BlendshapeFeatures, DEFAULT_BLENDSHAPE_MAPPINGS
+from .module.body import BodyFeatures, DEFAULT_BODY_MAPPINGS, DEFAULT_HAND_MAPPINGS
+from .preprocess import mirror_indices
+from types import SimpleNamespace
+
+# Params keys derived inside Params rather than written by a mapping
+DERIVED_KEYS = ("BustX", "BustY")
+
+
+def tracked_model_mappings(spec: list, data: dict) -> list:
+    """
+    MODEL_MAPPINGS rows with at least one input the active FEATURE_SOURCE
+    (or the body and hand models) produces. A row fed by nothing would
+    write 0 every frame over the model's motions and expressions.
+    :param spec: MODEL_MAPPINGS entries.
+    :param data: parameter.json contents.
+    """
+    if data.get("FEATURE_SOURCE", "landmarks") == "blendshapes":
+        face = data.get("BLENDSHAPE_MAPPINGS", DEFAULT_BLENDSHAPE_MAPPINGS)
+    else:
+        face = data.get("MAPPINGS", DEFAULT_MAPPINGS)
+    body = data.get("BODY_MAPPINGS", DEFAULT_BODY_MAPPINGS)
+    hands = data.get("HAND_MAPPINGS", DEFAULT_HAND_MAPPINGS)
+    produced = {entry["target"] for entry in (*face, *body, *hands)}
+    produced.update(DERIVED_KEYS)
+    rows = []
+    for entry in spec:
+        source = entry.get("input", {})
+        names = [source] if isinstance(source, str) else list(source)
+        if "constant" in entry or produced.intersection(names):
+            rows.append(entry)
+    return rows
+
+
+def compile_parameter(data: dict, mirror: bool = False) -> tuple:
+    """
+    Compile parameter.json on a throwaway ParameterManager, leaving the
+    running app untouched.
+    :param mirror: Landmarks are mirrored downstream (MIRROR "landmarks").
+    :return: (manager, data with landmark indices mirrored if needed).
+    :raises ValueError: When a mapping spec or landmark index list is invalid.
+    """
+    app = SimpleNamespace(running=True)
+    manager = ParameterManager(app)
+    manager.compile_mappings(data)
+    manager.compile_body_mappings(data, mirror)
+    if not app.running:
+        raise ValueError("MAPPINGS, BODY_MAPPINGS or HAND_MAPPINGS do not compile")
+    return manager, mirror_indices(data) if mirror else data
 
 
 class ParameterManager:
+    # x -> offset + sign * x; (1, -1) mirrors landmarks horizontally
+    _x_offset = 0.0
+    _x_sign = 1.0
+    calculation = None
+    body = None
+
     def __init__(self, app):
         self.app = app
+        self.logger = Logger("Parameter")
+
+    def mirror_landmarks(self, enabled: bool):
+        """
+        Mirror landmark x-coordinates instead of frame pixels.
+        """
+        self._x_offset, self._x_sign = (1.0, -1.0) if enabled else (0.0, 1.0)
 
     def get_landmark_values(self, landmarks, indices):
-        return [(landmarks[i].x, landmarks[i].y) for i in indices]
+        ox, sx = self._x_offset, self._x_sign
+        return [(ox + sx * landmarks[i].x, landmarks[i].y) for i in indices]
 
     def get_head_values(self, landmarks, indices):
-        return [(landmarks[i].x, landmarks[i].y, landmarks[i].z) for i in indices]
+        ox, sx = self._x_offset, self._x_sign
+        return [
+            (ox + sx * landmarks[i].x, landmarks[i].y, landmarks[i].z) for i in indices
+        ]
 
     def process_tracking_values(self, landmarks, data):
         try:
-            self.calculation = Calculation()
+            if self.calculation is None:
+                self.calculation = Calculation()
             left_eye = self.get_landmark_values(landmarks, data["LEFT_EYE"])
             right_eye = self.get_landmark_values(landmarks, data["RIGHT_EYE"])
             mouth = self.get_landmark_values(landmarks, data["LIP"])
@@ -39,37 +107,89 @@ class ParameterManager:
             self.app.running = False
             return None
 
-    def update_params(self, params, values, data):
+    def process_blendshape_values(self, results):
+        """
+        Load blendshape scores and head pose of `results` into the mapping.
+        """
         try:
-            params.EyeLOpen = round(
-                linearScale01(
-                    values["lEyeOpenRatio"],
-                    data["EYE_OPENNESS_MIN"],
-                    data["EYE_OPENNESS_MAX"],
-                ),
-                1,
-            )
-            params.EyeROpen = round(
-                linearScale01(
-                    values["rEyeOpenRatio"],
-                    data["EYE_OPENNESS_MIN"],
-                    data["EYE_OPENNESS_MAX"],
-                ),
-                1,
-            )
-            params.MouthOpenY = round(
-                linearScale01(
-                    values["mouthOpenRatio"],
-                    data["MOUTH_OPENNESS_MIN"],
-                    data["MOUTH_OPENNESS_MAX"],
-                ),
-                1,
+            return self.blendshapes.read(results)
+        except Exception as e:
+            self.logger.LogExit("process_blendshape_values", e)
+            self.app.running = False
+            return False
+
+    def compile_mappings(self, data):
+        """
+        Compile the mapping spec for the configured FEATURE_SOURCE.
+        "landmarks" uses MAPPINGS, "blendshapes" uses BLENDSHAPE_MAPPINGS.
+        """
+        try:
+            self.feature_source = data.get("FEATURE_SOURCE", "landmarks")
+            if self.feature_source == "blendshapes":
+                spec = data.get("BLENDSHAPE_MAPPINGS", DEFAULT_BLENDSHAPE_MAPPINGS)
+                self.mapping = MappingPipeline(spec, data)
+                self.blendshapes = BlendshapeFeatures(self.mapping)
+            else:
+                self.mapping = MappingPipeline(
+                    data.get("MAPPINGS", DEFAULT_MAPPINGS), data
+                )
+                self.blendshapes = None
+            return self.mapping
+        except Exception as e:
+            self.logger.LogExit("compile_mappings", e)
+            self.app.running = False
+
+    def apply_limits(self, params):
+        """
+        Bound the extrapolated targets of `params` to the output ranges of
+        the compiled face, body and hand mappings.
+        """
+        try:
+            if params is None:
+                return
+            mappings = [self.mapping]
+            if self.body is not None:
+                mappings += [self.body.body, self.body.hands]
+            for mapping in mappings:
+                params.set_limits(mapping.targets, *mapping.bounds())
+        except Exception as e:
+            self.logger.LogExit("apply_limits", e)
+            self.app.running = False
+
+    def compile_body_mappings(self, data, mirror: bool = False):
+        """
+        Compile BODY_MAPPINGS and HAND_MAPPINGS for the pose and hand models.
+        :param mirror: Landmarks are mirrored downstream (MIRROR "landmarks").
+        """
+        try:
+            self.body = BodyFeatures(
+                MappingPipeline(data.get("BODY_MAPPINGS", DEFAULT_BODY_MAPPINGS), data),
+                MappingPipeline(data.get("HAND_MAPPINGS", DEFAULT_HAND_MAPPINGS), data),
+                mirror,
             )
-            params.MouthForm = linearScale01(values["mouthForm"], 0.08, 0.14)
-            params.AngleX = clipValue(values["yaw"], -30, 30)
-            params.AngleY = clipValue(values["pitch"], -30, 30)
-            params.AngleZ = clipValue(values["roll"], -30, 30)
-            params.EyeBallX = linearScale_11(values["eyeBallX"], -0.18, 0.18)
+            return self.body
+        except Exception as e:
+            self.logger.LogExit("compile_body_mappings", e)
+            self.app.running = False
+
+    def update_body_params(self, params, mapping):
+        """
+        Push pose or hand targets. No timestamp: prediction history follows
+        the face samples only.
+        """
+        try:
+            if params:
+                params.set_targets(mapping.targets, mapping.evaluate())
+        except Exception as e:
+            self.logger.LogExit("update_body_params", e)
+            self.app.running = False
+
+    def update_params(self, params, values=None, data=None, timestamp=None):
+        try:
+            mapping = self.mapping
+            if values is not None:
+                mapping.load(values)
+            params.set_targets(mapping.targets, mapping.evaluate(), timestamp)
         except Exception as e:
             self.logger.LogExit("update_params", e)
             self.app.running = False
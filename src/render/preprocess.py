@@ -0,0 +1,131 @@
+# preprocess.py
+from ..utils import Logger
+import numpy as np
+import cv2
+
+# Left/right symmetric partners in the MediaPipe face mesh for the indices
+# used by parameter.json. Landmark i of a mirrored image is landmark
+# MIRROR_PAIRS[i] of the original image with x -> 1 - x.
+MIRROR_PAIRS = {
+    33: 263,
+    133: 362,
+    144: 373,
+    153: 380,
+    158: 385,
+    160: 387,
+    61: 291,
+    78: 308,
+    82: 312,
+    87: 317,
+    234: 454,
+    468: 473,
+    1: 1,
+    10: 10,
+    152: 152,
+}
+MIRROR_PAIRS.update({v: k for k, v in MIRROR_PAIRS.items()})
+
+INDEX_KEYS = (
+    "LEFT_EYE",
+    "RIGHT_EYE",
+    "LIP",
+    "LIP_CORNER",
+    "HEAD",
+    "LEFT_EYE_BALL",
+    "RIGHT_EYE_BALL",
+)
+
+
+def mirror_indices(data: dict) -> dict:
+    """
+    Return a copy of parameter.json data whose landmark index lists select
+    the same facial features on an unmirrored frame.
+    """
+    mirrored = dict(data)
+    for key in INDEX_KEYS:
+        if key in data:
+            missing = [i for i in data[key] if i not in MIRROR_PAIRS]
+            if missing:
+                raise ValueError(f"No mirror partner for {key} landmarks {missing}")
+            mirrored[key] = [MIRROR_PAIRS[i] for i in data[key]]
+    return mirrored
+
+
+class FramePreprocessor:
+    """
+    Converts camera frames (BGR) into the RGB buffer fed to MediaPipe.
+
+    Destination buffers are allocated once per frame size and reused, so
+    the steady state allocates nothing. With mirror="pixels", flip and
+    channel swap happen in a single strided copy. With "landmarks" or
+    "none" only the channel swap runs; "landmarks" mirrors x-coordinates
+    downstream instead. With `width`, wider frames are first downscaled
+    into a reusable buffer (landmarks are normalized, so nothing else
+    changes).
+    """
+
+    MODES = ("pixels", "landmarks", "none")
+
+    def __init__(self, mirror: str = "pixels", width: int = 0):
+        """
+        :param mirror: One of MODES.
+        :param width: Landmarker input width; 0 keeps the camera size.
+        """
+        self.logger = Logger("Preprocess")
+        if mirror not in self.MODES:
+            self.logger.LogExit(
+                "FramePreprocessor", f"Unknown MIRROR mode {mirror!r}", custom=True
+            )
+            mirror = "pixels"
+        self.mirror = mirror
+        self.width = width
+        self.capture = None  # reusable cap.read() destination
+        self._rgb = None
+        self._small = None
+        self.allocations = 0
+        self.bytes_allocated = 0
+        self.frames = 0
+
+    def _ensure(self, frame: np.ndarray) -> None:
+        if self._rgb is None or self._rgb.shape != frame.shape:
+            self._rgb = np.empty(frame.shape, dtype=np.uint8)
+            self.allocations += 1
+            self.bytes_allocated += self._rgb.nbytes
+
+    def _scaled(self, frame: np.ndarray) -> np.ndarray:
+        height, width = frame.shape[:2]
+        if not self.width or width <= self.width:
+            return frame
+        size = (self.width, round(height * self.width / width))
+        if self._small is None or self._small.shape[1::-1] != size:
+            self._small = np.empty((size[1], size[0], frame.shape[2]), np.uint8)
+            self.allocations += 1
+            self.bytes_allocated += self._small.nbytes
+        cv2.resize(frame, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        return self._small
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Convert a BGR frame into the reusable RGB buffer.
+        :return: C-contiguous RGB array, valid until the next call.
+        """
+        self.capture = frame
+        self.frames += 1
+        source = self._scaled(frame)
+        self._ensure(source)
+        if self.mirror == "pixels":
+            np.copyto(self._rgb, source[:, ::-1, ::-1])
+        else:
+            np.copyto(self._rgb, source[:, :, ::-1])
+        return self._rgb
+
+    def stats(self) -> dict:
+        """Buffer allocations made so far; stays constant in steady state."""
+        return {
+            "frames": self.frames,
+            "allocations": self.allocations,
+            "bytes_allocated": self.bytes_allocated,
+            "amortized_bytes_per_frame": (
+                self.bytes_allocated / self.frames if self.frames else 0.0
+            ),
+        }
@@ -0,0 +1,304 @@
+# recording.py
+from ..utils import Logger, resource_path
+from .landmarker import LandmarkerManager
+from .parameter import ParameterManager
+from .preprocess import FramePreprocessor, mirror_indices
+from .module.param import Params
+from types import SimpleNamespace
+import mediapipe as mp
+import numpy as np
+import multiprocessing, threading, time, cv2, os
+
+
+class ParameterRecorder:
+    """
+    Records the smoothed Params vector shown each frame (render thread).
+
+    Rows go into preallocated chunks, so recording a long session does
+    not reallocate. save() writes an .npz that `--export` can replay.
+    """
+
+    CHUNK = 4096
+
+    def __init__(self, path: str):
+        self.logger = Logger("Recorder")
+        self.path = path
+        self.count = 0
+        self._times = []
+        self._values = []
+
+    def record(self, values: np.ndarray, now: float) -> None:
+        row = self.count % self.CHUNK
+        if row == 0:
+            self._times.append(np.empty(self.CHUNK))
+            self._values.append(np.empty((self.CHUNK, len(values))))
+        self._times[-1][row] = now
+        self._values[-1][row] = values
+        self.count += 1
+
+    def save(self) -> None:
+        if not self.count:
+            return
+        t = np.concatenate(self._times)[: self.count]
+        values = np.concatenate(self._values)[: self.count]
+        try:
+            np.savez_compressed(
+                self.path,
+                t=t - t[0],
+                values=values,
+                keys=np.array(Params.PARAMETER_KEYS),
+                smoothed=True,
+            )
+            self.logger.logging.info("Recorded %d frames to %s", self.count, self.path)
+        except OSError as e:
+            self.logger.LogExit("save", e, custom=True)
+
+
+class _Landmarker(LandmarkerManager):
+    def __init__(self, app):
+        super().__init__(app)
+        self.lock = threading.Lock()
+
+
+def track_video(
+    video_path: str,
+    blendshapes: bool = True,
+    max_frames: int = 0,
+    start: int = 0,
+    stop: int = 0,
+    mirror: str = "pixels",
+):
+    """
+    Run the face landmarker over a video file as fast as it decodes.
+    :param mirror: MIRROR mode (FramePreprocessor.MODES), as in live capture.
+    :param start: First frame to track (seeks the video).
+    :param stop: Frame to stop before (0: end of the video).
+    :return: Generator of (timestamp_s, inference_s, results) per frame.
+    """
+    app = SimpleNamespace(running=True)
+    tracker = _Landmarker(app)
+    options = tracker.load_model_options(
+        resource_path("src/render/model/face_landmarker.task"), blendshapes=blendshapes
+    )
+    landmarker = tracker.create_face_landmarker(options)
+    preprocessor = FramePreprocessor(mirror)
+
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    frame_index = int(cap.get(cv2.CAP_PROP_POS_FRAMES)) if start else 0
+    tracked = 0
+    try:
+        while cap.isOpened() and (not max_frames or tracked < max_frames):
+            if stop and frame_index >= stop:
+                break
+            ret, frame = cap.read()
+            if not ret:
+                break
+            timestamp = frame_index / fps
+            frame_index += 1
+            tracked += 1
+
+            begin = time.perf_counter()
+            frame = preprocessor.process(frame)
+            image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame)
+            results = landmarker.detect_for_video(image, int(timestamp * 1000))
+            yield timestamp, time.perf_counter() - begin, results
+    finally:
+        cap.release()
+        landmarker.close()
+
+
+def _mirror_mode(data: dict, blendshapes: bool) -> str:
+    mirror = data.get("MIRROR", "pixels")
+    if mirror == "landmarks" and blendshapes:
+        # Blendshape names and pose are side-specific: mirror pixels
+        mirror = "pixels"
+    return mirror
+
+
+def _stream_rows(data: dict, tracked):
+    """
+    Raw parameter rows for track_video() output, using the FEATURE_SOURCE,
+    MAPPINGS and MIRROR from parameter.json. Frames without a face hold the
+    previous values.
+    :return: Generator of (timestamp_s, values) with values reused in place.
+    """
+    manager = ParameterManager(SimpleNamespace(running=True))
+    manager.compile_mappings(data)
+    out = Params()
+    blendshapes = manager.blendshapes is not None
+    if _mirror_mode(data, blendshapes) == "landmarks":
+        data = mirror_indices(data)
+        manager.mirror_landmarks(True)
+    for timestamp, _, results in tracked:
+        if blendshapes:
+            if results and manager.process_blendshape_values(results):
+                manager.update_params(out)
+        elif results and results.face_landmarks:
+            values = manager.process_tracking_values(results.face_landmarks[0], data)
+            if values:
+                manager.update_params(out, values, data)
+        yield timestamp, out.target
+
+
+def _track_options(data: dict) -> dict:
+    # track_video() arguments matching parameter.json
+    manager = ParameterManager(SimpleNamespace(running=True))
+    manager.compile_mappings(data)
+    blendshapes = manager.blendshapes is not None
+    return {"blendshapes": blendshapes, "mirror": _mirror_mode(data, blendshapes)}
+
+
+def _stream(times: list, rows: list, smoothed: bool = False) -> dict:
+    return {
+        "t": np.asarray(times, dtype=np.float64),
+        "values": np.asarray(rows).reshape(len(rows), len(Params.PARAMETER_KEYS)),
+        "keys": list(Params.PARAMETER_KEYS),
+        "smoothed": smoothed,
+    }
+
+
+def track_stream(video_path: str, data: dict) -> dict:
+    """
+    Turn a video into a raw (unsmoothed) parameter stream, one frame
+    after another. track_parallel() gives the same stream faster.
+    """
+    tracked = track_video(video_path, **_track_options(data))
+    times, rows = [], []
+    for timestamp, values in _stream_rows(data, tracked):
+        times.append(timestamp)
+        rows.append(values.copy())
+    return _stream(times, rows)
+
+
+def _track_segment(job: tuple) -> tuple:
+    """
+    Pool worker: track frames [start, stop) of one video, beginning
+    `warmup` frames early so the VIDEO-mode landmarker and the MAPPINGS
+    blending have settled by the first kept frame.
+    :return: (video_path, start, times, rows, seconds)
+    """
+    video_path, data, start, stop, warmup, fps = job
+    cv2.setNumThreads(1)  # the pool already fills the cores
+    begin = time.perf_counter()
+    first = max(0, start - warmup)
+    tracked = track_video(video_path, start=first, stop=stop, **_track_options(data))
+    times, rows = [], []
+    for timestamp, values in _stream_rows(data, tracked):
+        if timestamp * fps + 0.5 >= start:
+            times.append(timestamp)
+            rows.append(values.copy())
+    return video_path, start, times, rows, time.perf_counter() - begin
+
+
+def segments(frames: int, length: int) -> list:
+    """
+    Split `frames` frames into [start, stop) ranges of `length` frames; the
+    last range runs to the end of the video (stop 0).
+    """
+    if frames <= 0 or length <= 0 or frames <= length:
+        return [(0, 0)]
+    starts = list(range(0, frames, length))
+    if frames - starts[-1] < length // 4:
+        starts.pop()  # fold a short tail into the previous segment
+    return [(a, b) for a, b in zip(starts, starts[1:] + [0])]
+
+
+def track_parallel(
+    videos,
+    data: dict,
+    workers: int = 0,
+    segment_seconds: float = 60.0,
+    warmup_seconds: float = 2.0,
+) -> dict:
+    """
+    Track one or more videos into raw parameter streams on a process pool.
+
+    Each video is cut into `segment_seconds` pieces tracked independently
+    with `warmup_seconds` of overlap before each cut; the warm-up rows are
+    dropped and the pieces are joined in order.
+    :param workers: Pool size (0: one per CPU core).
+    :return: {video_path: stream} in the format of load_stream().
+    """
+    logger = Logger("OfflineTracking")
+    videos = [videos] if isinstance(videos, str) else list(videos)
+    jobs = []
+    for video in videos:
+        cap = cv2.VideoCapture(video)
+        if not cap.isOpened():
+            raise FileNotFoundError(f"Cannot open video {video}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        warmup = int(round(warmup_seconds * fps))
+        for start, stop in segments(frames, int(segment_seconds * fps)):
+            jobs.append((video, data, start, stop, warmup, fps))
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    pieces = {video: [] for video in videos}
+    begin = time.perf_counter()
+    busy = 0.0
+    if workers == 1:
+        results = map(_track_segment, jobs)
+        for video, start, times, rows, seconds in results:
+            pieces[video].append((start, times, rows))
+            busy += seconds
+    else:
+        # spawn: forking would copy the parent's MediaPipe and OpenGL state
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            for video, start, times, rows, seconds in pool.imap_unordered(
+                _track_segment, jobs
+            ):
+                pieces[video].append((start, times, rows))
+                busy += seconds
+    elapsed = time.perf_counter() - begin
+
+    streams = {}
+    for video, parts in pieces.items():
+        parts.sort(key=lambda part: part[0])
+        times = [t for _, part_times, _ in parts for t in part_times]
+        rows = [row for _, _, part_rows in parts for row in part_rows]
+        streams[video] = _stream(times, rows)
+    tracked = sum(len(stream["t"]) for stream in streams.values())
+    duration = sum(stream["t"][-1] for stream in streams.values() if len(stream["t"]))
+    logger.logging.info(
+        "Tracked %d frames (%.0f s of video) in %.1f s with %d workers: "
+        "%.0f frames/sec, %.1fx real time, %.1f%% warm-up overhead",
+        tracked,
+        duration,
+        elapsed,
+        workers,
+        tracked / max(elapsed, 1e-6),
+        duration / max(elapsed, 1e-6),
+        (sum(min(job[2], job[4]) for job in jobs)) / max(tracked, 1) * 100,
+    )
+    return streams
+
+
+def save_stream(stream: dict, path: str) -> None:
+    """Write a parameter stream as an .npz readable by load_stream()."""
+    np.savez_compressed(
+        path,
+        t=stream["t"],
+        values=stream["values"],
+        keys=np.array(stream["keys"]),
+        smoothed=stream["smoothed"],
+    )
+
+
+def load_stream(path: str, data: dict) -> dict:
+    """
+    Load a parameter stream: an .npz from ParameterRecorder or --track,
+    or a video file tracked with track_parallel().
+    """
+    if str(path).lower().endswith(".npz"):
+        with np.load(path) as recording:
+            return {
+                "t": recording["t"],
+                "values": recording["values"],
+                "keys": [str(k) for k in recording["keys"]],
+                "smoothed": bool(recording["smoothed"]),
+            }
+    return track_parallel(path, data)[path]
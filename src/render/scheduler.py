@@ -0,0 +1,119 @@
+# scheduler.py
+from ..utils import Logger
+import time
+
+
+class ScheduledModel:
+    def __init__(self, name: str, landmarker, every: int, phase: int):
+        self.name = name
+        self.landmarker = landmarker
+        self.every = max(1, int(every))
+        self.next_frame = phase
+        self.result = None  # latest result, carried forward between runs
+        self.cost = 0.0  # running estimate of one run, seconds
+        self.runs = 0
+        self.deferred = 0
+        self.forced = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+
+class InferenceScheduler:
+    """
+    Interleaves MediaPipe landmarkers (face, pose, hands) on one frame
+    stream under a per-frame time budget.
+
+    Each model runs every `every` frames, with phases staggered so models
+    sharing a rate do not land on the same frame. A due model whose
+    estimated cost would push the frame over `budget_ms` waits for the
+    next frame, unless it has already waited a whole interval. Models run
+    in the order they were added (face first) on the same mp.Image, and
+    every model's latest result stays readable between its runs.
+    """
+
+    def __init__(self, budget_ms: float = 20.0):
+        """
+        :param budget_ms: Inference time allowed per camera frame.
+        """
+        self.logger = Logger("Scheduler")
+        self.budget = budget_ms / 1000
+        self.models = []
+        self.frames = 0
+        self.over_budget = 0
+        self._start = None
+
+    def add(self, name: str, landmarker, every: int = 1) -> ScheduledModel:
+        """
+        :param every: Run on every n-th frame.
+        """
+        model = ScheduledModel(
+            name, landmarker, every, len(self.models) % max(every, 1)
+        )
+        self.models.append(model)
+        return model
+
+    def run(self, image, timestamp_ms: int) -> list:
+        """
+        Run the models due on this frame.
+        :return: Names of the models that produced a fresh result.
+        """
+        frame = self.frames
+        self.frames += 1
+        if self._start is None:
+            self._start = time.perf_counter()
+        fresh = []
+        spent = 0.0
+        for model in self.models:
+            if frame < model.next_frame:
+                continue
+            overdue = frame - model.next_frame >= model.every
+            if spent and spent + model.cost > self.budget:
+                if not overdue:
+                    model.deferred += 1
+                    continue
+                model.forced += 1
+            start = time.perf_counter()
+            model.result = model.landmarker.detect_for_video(image, timestamp_ms)
+            elapsed = time.perf_counter() - start
+            spent += elapsed
+            model.cost += (elapsed - model.cost) * (0.2 if model.runs else 1.0)
+            model.runs += 1
+            model.total += elapsed
+            model.worst = max(model.worst, elapsed)
+            model.next_frame = frame + model.every
+            fresh.append(model.name)
+        if spent > self.budget:
+            self.over_budget += 1
+        return fresh
+
+    def result(self, name: str):
+        """Latest result of `name` (None before its first run)."""
+        for model in self.models:
+            if model.name == name:
+                return model.result
+        return None
+
+    def close(self, keep: tuple = ()) -> None:
+        """Close the landmarkers, except those named in `keep`."""
+        for model in self.models:
+            if model.name not in keep:
+                try:
+                    model.landmarker.close()
+                except Exception as e:
+                    self.logger.LogExit(f"close {model.name}", e)
+
+    def stats(self) -> dict:
+        """Achieved rate and cost per model."""
+        elapsed = time.perf_counter() - self._start if self._start else 0.0
+        report = {"frames": self.frames, "over_budget_frames": self.over_budget}
+        for model in self.models:
+            report[model.name] = {
+                "every": model.every,
+                "runs": model.runs,
+                "rate_hz": round(model.runs / elapsed, 1) if elapsed else 0.0,
+                "mean_ms": round(model.total / max(model.runs, 1) * 1000, 2),
+                "max_ms": round(model.worst * 1000, 2),
+                "deferred": model.deferred,
+                "forced": model.forced,
+            }
+        return report
@@ -0,0 +1,321 @@
+# vmc.py
+from ..utils import Logger
+from ..utils.osc import encode_message, encode_bundle, encode_string, decode_packet
+from .module.blendshape import FEATURE_NAMES, DEFAULT_BLENDSHAPE_MAPPINGS
+from .module.mapping import MappingPipeline
+from .module.param import Params
+import numpy as np
+import heapq, math, socket, struct, threading, time
+
+VMC_PORT = 39539
+# Sender time restarts from zero after this many seconds, keeping it precise
+# as a float32; receivers treat a backwards jump past RESTART_GAP as a restart
+EPOCH_SECONDS = 3600.0
+RESTART_GAP = 1.0
+
+# VRM preset blendshapes: name -> (Params key, inverted)
+VRM_BLENDS = {
+    "Blink_L": ("EyeLOpen", True),
+    "Blink_R": ("EyeROpen", True),
+    "A": ("MouthOpenY", False),
+}
+
+
+def _qmul(a, b):
+    ax, ay, az, aw = a
+    bx, by, bz, bw = b
+    return (
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+        aw * bw - ax * bx - ay * by - az * bz,
+    )
+
+
+def euler_to_quaternion(yaw: float, pitch: float, roll: float) -> tuple:
+    """
+    Degrees -> (x, y, z, w) for the rotation Ry(yaw) * Rx(pitch) * Rz(roll).
+    """
+    y, p, r = (math.radians(v) / 2 for v in (yaw, pitch, roll))
+    qy = (0.0, math.sin(y), 0.0, math.cos(y))
+    qx = (math.sin(p), 0.0, 0.0, math.cos(p))
+    qz = (0.0, 0.0, math.sin(r), math.cos(r))
+    return _qmul(_qmul(qy, qx), qz)
+
+
+def quaternion_to_euler(x: float, y: float, z: float, w: float) -> tuple:
+    """
+    Inverse of euler_to_quaternion.
+    :return: (roll, yaw, pitch) in degrees, the Calculation.calculate_head_pose order.
+    """
+    r02 = 2 * (x * z + w * y)
+    r22 = 1 - 2 * (x * x + y * y)
+    r12 = 2 * (y * z - w * x)
+    r10 = 2 * (x * y + w * z)
+    r11 = 1 - 2 * (x * x + z * z)
+    pitch = math.asin(max(-1.0, min(1.0, -r12)))
+    return (
+        math.degrees(math.atan2(r10, r11)),
+        math.degrees(math.atan2(r02, r22)),
+        math.degrees(pitch),
+    )
+
+
+class VMCSender:
+    """
+    Streams Params targets as one VMC bundle per tracked frame:
+    Blend/Val per parameter, the Head bone, a sender time and Blend/Apply.
+    """
+
+    def __init__(self, settings: dict):
+        self.logger = Logger("VMC")
+        self.address = (
+            settings.get("host", "127.0.0.1"),
+            int(settings.get("port", VMC_PORT)),
+        )
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        keys = Params.PARAMETER_KEYS
+        self._prefixes = [
+            encode_string("/VMC/Ext/Blend/Val")
+            + encode_string(",sf")
+            + encode_string(k)
+            for k in keys
+        ]
+        self._angles = [keys.index(k) for k in ("AngleX", "AngleY", "AngleZ")]
+        self._apply = encode_message("/VMC/Ext/Blend/Apply")
+        self._ok = encode_message("/VMC/Ext/OK", 1)
+        self.frames = 0
+        self.bytes = 0
+        self._epoch = None
+
+    def send(self, values: np.ndarray, timestamp: float) -> None:
+        """
+        :param values: Params.target, ordered as Params.PARAMETER_KEYS.
+        :param timestamp: Capture time of the frame.
+        """
+        if self._epoch is None or timestamp - self._epoch >= EPOCH_SECONDS:
+            self._epoch = timestamp
+        try:
+            flat = values.tolist()
+            messages = [self._ok]
+            messages.extend(
+                p + struct.pack(">f", v) for p, v in zip(self._prefixes, flat)
+            )
+            yaw, pitch, roll = (flat[i] for i in self._angles)
+            qx, qy, qz, qw = euler_to_quaternion(yaw, pitch, roll)
+            messages.append(
+                encode_message(
+                    "/VMC/Ext/Bone/Pos", "Head", 0.0, 0.0, 0.0, qx, qy, qz, qw
+                )
+            )
+            messages.append(
+                encode_message("/VMC/Ext/T", float(timestamp - self._epoch))
+            )
+            messages.append(self._apply)
+            datagram = encode_bundle(messages)
+            self.socket.sendto(datagram, self.address)
+            self.frames += 1
+            self.bytes += len(datagram)
+        except OSError as e:
+            self.logger.LogExit("send", e)
+
+
+class VMCReceiver:
+    """
+    VMC endpoint driving Params from a remote tracker.
+
+    Accepted input:
+    - Blend/Val with Params keys (LunaStudio senders) or VRM presets
+    - Blend/Val with ARKit blendshape names, mapped through BLENDSHAPE_MAPPINGS
+    - the Head bone quaternion as roll/yaw/pitch
+    - /VMC/Ext/T sender time, seconds since the sender's epoch; Blend/Apply
+      closes a frame
+
+    Frames go through a jitter buffer. Each is played out at its sender
+    time plus the lowest observed transit offset plus `delay`. Late and
+    out-of-order frames are dropped, and gaps in sender time count as loss.
+    """
+
+    def __init__(self, app, settings: dict, data: dict):
+        self.app = app
+        self.logger = Logger("VMC")
+        self.host = settings.get("listen", "0.0.0.0")
+        self.port = int(settings.get("port", VMC_PORT))
+        self.delay = float(settings.get("delay", 0.05))
+
+        self.mapping = MappingPipeline(
+            data.get("BLENDSHAPE_MAPPINGS", DEFAULT_BLENDSHAPE_MAPPINGS), data
+        )
+        self._feature_index = {name: i for i, name in enumerate(FEATURE_NAMES)}
+        self._mapping_src = np.array(
+            [FEATURE_NAMES.index(n) for n in self.mapping.inputs if n in FEATURE_NAMES],
+            dtype=np.intp,
+        )
+        self._param_keys = set(Params.PARAMETER_KEYS)
+        self._key_lists = {}
+        self._buffer = []
+        self._sequence = 0
+        self.sources = {}
+
+    def _source(self, address) -> dict:
+        source = self.sources.get(address)
+        if source is None:
+            source = self.sources[address] = {
+                "packets": 0,
+                "frames": 0,
+                "bytes": 0,
+                "lost": 0,
+                "late": 0,
+                "errors": 0,
+                "rate_hz": 0.0,
+                "offset": None,
+                "interval": None,
+                "last_time": None,
+                "first_arrival": None,
+                "scores": np.zeros(len(FEATURE_NAMES), dtype=np.float32),
+                "blendshapes": False,
+                "pose": False,
+                "direct": {},
+                "sender_time": None,
+            }
+        return source
+
+    def _handle(self, datagram: bytes, address, now: float) -> None:
+        source = self._source(address)
+        source["packets"] += 1
+        source["bytes"] += len(datagram)
+        try:
+            messages = decode_packet(datagram)
+        except Exception:
+            source["errors"] += 1
+            return
+
+        for path, args in messages:
+            if path == "/VMC/Ext/Blend/Val" and len(args) >= 2:
+                name, value = args[0], float(args[1])
+                if name in self._param_keys:
+                    source["direct"][name] = value
+                elif name in VRM_BLENDS:
+                    key, inverted = VRM_BLENDS[name]
+                    source["direct"][key] = 1.0 - value if inverted else value
+                elif name in self._feature_index:
+                    source["scores"][self._feature_index[name]] = value
+                    source["blendshapes"] = True
+            elif path == "/VMC/Ext/Bone/Pos" and len(args) >= 8 and args[0] == "Head":
+                pose = quaternion_to_euler(*args[4:8])
+                source["scores"][-3:] = pose
+                source["pose"] = True
+            elif path == "/VMC/Ext/T" and args:
+                source["sender_time"] = float(args[0])
+            elif path == "/VMC/Ext/Blend/Apply":
+                self._commit(source, now)
+
+    def _commit(self, source: dict, now: float) -> None:
+        sender_time = (
+            source["sender_time"] if source["sender_time"] is not None else now
+        )
+        source["sender_time"] = None
+
+        last = source["last_time"]
+        if last is not None:
+            gap = sender_time - last
+            if gap < -RESTART_GAP:
+                # Sender restarted or rebased its epoch: start over
+                source["interval"] = source["offset"] = None
+                last = None
+            elif gap <= 0:
+                source["late"] += 1
+                source["direct"].clear()
+                return
+        if last is not None:
+            interval = source["interval"]
+            if interval is not None and gap > 1.5 * interval:
+                source["lost"] += int(round(gap / interval)) - 1
+            source["interval"] = (
+                gap if interval is None else interval + (gap - interval) * 0.1
+            )
+        source["last_time"] = sender_time
+
+        if source["first_arrival"] is None:
+            source["first_arrival"] = now
+        elif now > source["first_arrival"]:
+            source["rate_hz"] = source["frames"] / (now - source["first_arrival"])
+        source["frames"] += 1
+
+        # Lowest transit offset seen, drifting up slowly to follow clock skew
+        offset = now - sender_time
+        if source["offset"] is None or offset < source["offset"]:
+            source["offset"] = offset
+        else:
+            source["offset"] += (offset - source["offset"]) * 0.001
+        playout = sender_time + source["offset"] + self.delay
+
+        values = {}
+        if source["blendshapes"] or (
+            source["pose"] and "AngleX" not in source["direct"]
+        ):
+            np.take(source["scores"], self._mapping_src, out=self.mapping.input_values)
+            values.update(zip(self.mapping.targets, self.mapping.evaluate().tolist()))
+            if not source["blendshapes"]:
+                values = {
+                    k: values[k] for k in ("AngleX", "AngleY", "AngleZ") if k in values
+                }
+        values.update(source["direct"])
+        source["direct"].clear()
+        source["pose"] = False
+        if not values:
+            return
+
+        key_tuple = tuple(values)
+        keys = self._key_lists.setdefault(key_tuple, list(key_tuple))
+        self._sequence += 1
+        heapq.heappush(
+            self._buffer,
+            (playout, self._sequence, keys, np.fromiter(values.values(), float)),
+        )
+
+    def _playout(self, params, now: float) -> None:
+        while self._buffer and self._buffer[0][0] <= now:
+            playout, _, keys, values = heapq.heappop(self._buffer)
+            params.set_targets(keys, values, timestamp=playout, owner="vmc")
+            power = getattr(self.app, "power", None)
+            if power:
+                power.on_face(True, now)
+
+    def run(self, params) -> None:
+        """Thread target: receive and play out frames until the app stops."""
+        sock = None
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind((self.host, self.port))
+            sock.settimeout(0.004)
+            self.logger.logging.info("VMC receiver on %s:%d", self.host, self.port)
+            params.set_limits(self.mapping.targets, *self.mapping.bounds())
+            while self.app.running:
+                try:
+                    datagram, address = sock.recvfrom(65535)
+                    self._handle(datagram, address, time.perf_counter())
+                except socket.timeout:
+                    pass
+                self._playout(params, time.perf_counter())
+        except Exception as e:
+            self.logger.LogExit("run", e)
+            supervisor = getattr(self.app, "supervisor", None)
+            if supervisor:
+                supervisor.fail(threading.current_thread().name, e)
+            self.app.running = False
+        finally:
+            if sock:
+                sock.close()
+            self.logger.logging.info("VMC sources: %s", self.stats())
+
+    def stats(self) -> dict:
+        """Per-source packet, frame, loss and rate counters."""
+        keys = ("packets", "frames", "bytes", "lost", "late", "errors")
+        return {
+            f"{addr[0]}:{addr[1]}": {
+                **{k: s[k] for k in keys},
+                "rate_hz": round(s["rate_hz"], 1),
+            }
+            for addr, s in self.sources.items()
+        }
@@ -1,7 +1,6 @@
-from .config import Config, resource_path
+from .config import Config
 from .log import Logger
 from pathlib import Path
-import json
 
 
 class Constract:
@@ -13,17 +12,11 @@ class Constract:
     def start(self):
         """
         Initialize assets and model data.
+        Expressions and motions are cached at model load (ExpressionLibrary),
+        so model3.json is no longer rewritten here.
         """
         try:
             self.model3Json()
-
-            data = self.config.recv()
-            model_list = data.get("ModelList", {})
-            if model_list:
-                first_model = next(iter(model_list.values()))
-                expressions = first_model.get("extensions", {}).get("expressions", [])
-                if expressions:
-                    self.prepareModel3Json(expressions)
         except Exception as e:
             self.logger.LogExit("start", e)
             raise
@@ -37,49 +30,6 @@ class Constract:
             any(model_path.glob("**/*.model3.json")) if model_path.is_dir() else False
         )
 
-    def prepareModel3Json(self, expressions_list: list):
-        """
-        Ensure model3.json includes given expression files under FileReferences.Expressions
-        """
-        try:
-            config_data = self.config.recv()
-            model_list = config_data.get("ModelList", {})
-            if not model_list:
-                return
-
-            key = next(iter(model_list))
-            full_path = model_list[key].get("FullPath")
-            if not full_path:
-                return
-
-            json_path = Path(self.dir) / full_path
-            if not json_path.is_file():
-                return
-
-            with json_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            file_refs = data.setdefault("FileReferences", {})
-            expressions = file_refs.setdefault("Expressions", [])
-            existing_names = {expr.get("Name") for expr in expressions}
-
-            new_entries = []
-            for filepath in expressions_list:
-                if filepath.endswith(".exp3.json"):
-                    name = Path(filepath).stem.replace(".exp3", "")
-                    if name not in existing_names:
-                        new_entries.append({"Name": name, "File": filepath})
-                        existing_names.add(name)
-
-            if new_entries:
-                expressions.extend(new_entries)
-                with json_path.open("w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=4, ensure_ascii=False)
-
-        except Exception as e:
-            self.logger.LogExit("prepareModel3Json", e)
-            raise
-
     def model3Json(self):
         """
         Scan media/model, rebuild ModelList in config with related files.
@@ -99,14 +49,7 @@ class Constract:
                     "extensions": self.find_related_files(json_file.parent),
                 }
 
-            cfg_path = resource_path("config/usercfg.json")
-            with open(cfg_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            data["ModelList"] = new_model_list
-
-            with open(cfg_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4)
+            self.config.update(new_model_list, "ModelList", merge=False)
             return True
 
         except Exception as e:
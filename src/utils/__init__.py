@@ -1,5 +1,11 @@
-from .config import Config, resource_path
+from .config import Config, ConfigWatcher, ConfigSnapshot, PROFILE, resource_path
 from .Constractor import Constract
 from .log import Logger
 from .nontify import Notification
 from .layermanager import Layer, LayerManager
+from .latency import LatencyTracker
+from .power import PowerManager
+from .memory import MemoryTracker
+from .gctune import GCTuner
+from .supervisor import Supervisor
+from .profiler import Profiler
@@ -1,6 +1,23 @@
-import os, threading, json, sys
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+import os, threading, json, sys, copy, time, atexit
 from .log import Logger
 
+USER_CONFIG = "Media/Config/config.json"
+# Written by the auto-tuner; its "settings" take precedence over config.json
+PROFILE = "Media/Config/profile.json"
+# Landmark index lists in parameter.json (MediaPipe face mesh: 478 points)
+LANDMARK_KEYS = (
+    "LEFT_EYE",
+    "RIGHT_EYE",
+    "LIP",
+    "LIP_CORNER",
+    "HEAD",
+    "LEFT_EYE_BALL",
+    "RIGHT_EYE_BALL",
+)
+LANDMARK_COUNT = 478
+
 
 def resource_path(relative_path):
     """
@@ -13,20 +30,302 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+def freeze(value):
+    """
+    Deep read-only copy of parsed JSON: dicts become MappingProxyType,
+    lists become tuples.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class CapFPS(NamedTuple):
+    enabled: bool
+    value: int
+
+
+class Smoothing(NamedTuple):
+    factor: float
+    bust: float
+    linear_steps: int
+
+
+class ConfigSnapshot(NamedTuple):
+    """
+    Immutable, validated view of config.json, usercfg.json and
+    parameter.json. Hot paths read the typed fields; `user`, `internal`
+    and `parameter` are the frozen raw files.
+    """
+
+    version: int
+    user: Mapping
+    internal: Mapping
+    parameter: Mapping
+    cap_fps: CapFPS
+    smoothing: Smoothing
+    prediction: Mapping
+    background: str
+    auto_breath: bool
+    auto_blink: bool
+
+
+def _number(value, name: str, lo: float = None, hi: float = None) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} must be a number, got {value!r}")
+    if (lo is not None and value < lo) or (hi is not None and value > hi):
+        raise ValueError(f"{name} must be within [{lo}, {hi}], got {value!r}")
+    return value
+
+
+def build_snapshot(user: dict, internal: dict, parameter: dict, version: int = 0):
+    """
+    Validate parsed config files and build a ConfigSnapshot.
+    :raises ValueError: On a missing or malformed setting.
+    """
+    cap = user.get("CapFPS", {})
+    cap_fps = CapFPS(
+        bool(cap.get("capFps", True)),
+        int(_number(cap.get("CapFpsValue", 30), "CapFpsValue", 1, 1000)),
+    )
+    smooth = user.get("Smoothing", {})
+    smoothing = Smoothing(
+        float(_number(smooth.get("factor", 0.5), "Smoothing.factor", 0.0, 0.99)),
+        float(_number(smooth.get("bust", 0.7), "Smoothing.bust", 0.0, 0.99)),
+        int(_number(smooth.get("linear_steps", 0), "Smoothing.linear_steps", 0)),
+    )
+    tracking = user.get("Tracking", {})
+    for key in ("input_width", "threads"):
+        if key in tracking:
+            _number(tracking[key], f"Tracking.{key}", 0)
+    prediction = user.get("Prediction", {})
+    for key in ("horizon", "damping"):
+        if key in prediction:
+            _number(prediction[key], f"Prediction.{key}", 0.0, 1.0)
+
+    background = user.get("background")
+    if not isinstance(background, str):
+        raise ValueError(f"background must be a file name, got {background!r}")
+    if not os.path.isfile(os.path.join("Media/Assets", background)):
+        raise ValueError(f"background Media/Assets/{background} does not exist")
+    display = user.get("display")
+    if not (isinstance(display, list) and len(display) == 2):
+        raise ValueError(f"display must be [width, height], got {display!r}")
+    if not isinstance(internal.get("ModelList", {}), dict):
+        raise ValueError("ModelList must be an object")
+
+    for key in LANDMARK_KEYS:
+        indices = parameter.get(key)
+        if not isinstance(indices, list) or not all(
+            isinstance(i, int) and 0 <= i < LANDMARK_COUNT for i in indices
+        ):
+            raise ValueError(f"{key} must list landmark indices, got {indices!r}")
+
+    # Dry-run what the capture thread compiles on reload, so a bad mapping
+    # is rejected here instead of failing mid-stream
+    from ..render.parameter import compile_parameter
+
+    compile_parameter(parameter, parameter.get("MIRROR") == "landmarks")
+
+    return ConfigSnapshot(
+        version=version,
+        user=freeze(user),
+        internal=freeze(internal),
+        parameter=freeze(parameter),
+        cap_fps=cap_fps,
+        smoothing=smoothing,
+        prediction=freeze(prediction),
+        background=background,
+        auto_breath=bool(user.get("Auto Breath", True)),
+        auto_blink=bool(user.get("Auto Blink", True)),
+    )
+
+
+class JSONStore:
+    """
+    In-memory authoritative copy of one JSON file with write-behind.
+
+    Reads are served from memory (reloaded only when the file was edited
+    externally and nothing is pending). Updates change memory and wake a
+    writer thread, which waits until no update arrived for `debounce`
+    seconds (at most `max_delay` after the first) and writes the file
+    once, atomically through a temp file and os.replace.
+    """
+
+    def __init__(self, path: str, debounce: float = 0.25, max_delay: float = 2.0):
+        self.path = path
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.logger = Logger("Config")
+        self.updates = 0
+        self.writes = 0
+        self._data = None
+        self._signature = None
+        self._dirty_since = None
+        self._last_update = 0.0
+        self._version = 0
+        self._written = 0
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _load(self, missing_ok: bool = False) -> None:
+        signature = self._stat()
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                self._data = json.load(file)
+        except FileNotFoundError:
+            if not missing_ok:
+                raise
+            self._data = {}
+        self._signature = signature
+
+    def read(self) -> dict:
+        """Return a private copy of the current contents."""
+        with self._cond:
+            if self._data is None or (
+                self._dirty_since is None and self._stat() != self._signature
+            ):
+                self._load()
+            return copy.deepcopy(self._data)
+
+    def modify(self, change) -> None:
+        """
+        Apply `change(data)` to the in-memory contents and schedule a write.
+        A change returning False made no difference and schedules nothing.
+        """
+        with self._cond:
+            if self._data is None:
+                self._load(missing_ok=True)
+            if change(self._data) is False:
+                return
+            self.updates += 1
+            self._version += 1
+            self._last_update = time.monotonic()
+            if self._dirty_since is None:
+                self._dirty_since = self._last_update
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ConfigWriter", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _take(self):
+        # Caller holds _cond
+        self._dirty_since = None
+        return self._version, json.dumps(self._data, indent=4)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._dirty_since is None:
+                    self._cond.wait()
+                while self._dirty_since is not None:
+                    deadline = min(
+                        self._last_update + self.debounce,
+                        self._dirty_since + self.max_delay,
+                    )
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._dirty_since is None:
+                    continue  # flushed meanwhile
+                version, text = self._take()
+            self._write(version, text)
+
+    def _write(self, version: int, text: str) -> None:
+        with self._write_lock:
+            if version <= self._written:
+                return  # a newer state is already on disk
+            tmp = f"{self.path}.tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as file:
+                    file.write(text)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(tmp, self.path)
+            except OSError as e:
+                self.logger.LogExit("write", e)
+                with self._cond:
+                    if self._dirty_since is None:
+                        # Retry with the next update or flush
+                        self._dirty_since = self._last_update = time.monotonic()
+                return
+            self._written = version
+            self.writes += 1
+            with self._cond:
+                self._signature = self._stat()
+
+    def flush(self) -> None:
+        """Write pending updates now (called at exit)."""
+        with self._cond:
+            if self._dirty_since is None:
+                return
+            version, text = self._take()
+        self._write(version, text)
+
+    @property
+    def version(self) -> int:
+        """Incremented by every update, before it reaches the disk."""
+        return self._version
+
+    def stats(self) -> dict:
+        return {
+            "updates": self.updates,
+            "writes": self.writes,
+            "coalesced": max(self.updates - self.writes, 0),
+        }
+
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _store(path: str) -> JSONStore:
+    """One store per file, shared by every Config instance."""
+    with _STORES_LOCK:
+        if path not in _STORES:
+            _STORES[path] = JSONStore(path)
+        return _STORES[path]
+
+
 class Config:
     """
     Config handler for usercfg.json and parameter.json.
+
+    Both files are held by shared JSONStores: reads come from memory and
+    updates are written behind, coalesced and atomic.
     """
 
     def __init__(self):
         self.logger = Logger("Config")
-        self._lock = threading.Lock()
 
-    def user(self):
-        """Load user config safely."""
+    def user(self, profile: bool = True):
+        """
+        Load user config safely.
+        :param profile: Apply the auto-tuned settings from profile.json.
+        """
         try:
-            with open("Media/Config/config.json", "r", encoding="utf-8") as file:
-                return json.load(file)
+            with open(USER_CONFIG, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if profile:
+                for key, value in self.profile().get("settings", {}).items():
+                    if isinstance(value, dict) and isinstance(data.get(key), dict):
+                        value = {**data[key], **value}
+                    data[key] = value
+            return data
         except FileNotFoundError as e:
             self.logger.LogExit("recv", e)
             raise
@@ -37,10 +336,7 @@ class Config:
     def recv(self):
         """Load user config internal safely."""
         try:
-            with open(
-                resource_path("config/usercfg.json"), "r", encoding="utf-8"
-            ) as file:
-                return json.load(file)
+            return _store(resource_path("config/usercfg.json")).read()
         except FileNotFoundError as e:
             self.logger.LogExit("recv", e)
             raise
@@ -48,51 +344,150 @@ class Config:
             self.logger.LogExit("recv", e)
             raise
 
-    def update(self, new_data, key):
+    def parameter(self):
+        """Load parameter.json safely."""
+        try:
+            return _store(resource_path("config/parameter.json")).read()
+        except Exception as e:
+            self.logger.LogExit("parameter", e)
+            raise
+
+    def profile(self) -> dict:
+        """The auto-tuner's profile.json, or {} before the first tuning."""
+        if not os.path.exists(PROFILE):
+            return {}
+        return _store(PROFILE).read()
+
+    def save_profile(self, profile: dict) -> None:
+        """Replace profile.json atomically and write it now."""
+        store = _store(PROFILE)
+        store.modify(lambda data: (data.clear(), data.update(copy.deepcopy(profile))))
+        store.flush()
+
+    def paths(self) -> tuple:
+        """Files that make up a ConfigSnapshot."""
+        return (
+            USER_CONFIG,
+            PROFILE,
+            resource_path("config/usercfg.json"),
+            resource_path("config/parameter.json"),
+        )
+
+    def snapshot(self, version: int = 0) -> ConfigSnapshot:
+        """
+        Read and validate all three files.
+        :raises ValueError: On malformed JSON or settings.
+        """
+        return build_snapshot(self.user(), self.recv(), self.parameter(), version)
+
+    def update(self, new_data, key, merge: bool = True):
         """
         Update data[key] with new_data (dict merge).
         Creates key if it doesn't exist.
+        :param merge: Replace data[key] instead of merging when False.
         """
-        with self._lock:
-            try:
-                path = resource_path("config/usercfg.json")
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as file:
-                        data = json.load(file)
-                else:
-                    data = {}
-
-                if isinstance(data.get(key), dict) and isinstance(new_data, dict):
-                    data[key].update(new_data)
-                else:
-                    data[key] = new_data
 
-                with open(path, "w", encoding="utf-8") as file:
-                    json.dump(data, file, indent=4)
+        def change(data):
+            value = new_data
+            if merge and isinstance(data.get(key), dict) and isinstance(new_data, dict):
+                value = {**data[key], **new_data}
+            if key in data and data[key] == value:
+                return False
+            data[key] = copy.deepcopy(value)
 
-            except Exception as e:
-                self.logger.LogExit("update", e)
-                raise
+        try:
+            _store(resource_path("config/usercfg.json")).modify(change)
+        except Exception as e:
+            self.logger.LogExit("update", e)
+            raise
 
     def updateParameter(self, new_data):
         """Update parameter.json (top-level merge)."""
-        with self._lock:
-            try:
-                path = resource_path("config/parameter.json")
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as file:
-                        data = json.load(file)
-                else:
-                    data = {}
+        if not isinstance(new_data, dict):
+            return
+        try:
+            _store(resource_path("config/parameter.json")).modify(
+                lambda data: data.update(copy.deepcopy(new_data))
+            )
+        except Exception as e:
+            self.logger.LogExit("updateParameter", e)
+            raise
+
+    def flush(self):
+        """Write every pending update now."""
+        for store in list(_STORES.values()):
+            store.flush()
+
+    def stats(self) -> dict:
+        """Updates versus file writes per store."""
+        return {os.path.basename(path): s.stats() for path, s in _STORES.items()}
+
+
+class ConfigWatcher:
+    """
+    Polls the config files' mtime and size and, on a change, parses and
+    validates them into a new ConfigSnapshot on this thread.
+
+    `snapshot` is swapped by a single reference assignment, so readers
+    (render and capture loops) compare it by identity and never block.
+    A file that fails to parse or validate is logged and the previous
+    snapshot stays active. Listeners run on the watcher thread with
+    (new, old) before the swap, to prepare expensive work off the hot path.
+    """
 
-                if isinstance(new_data, dict):
-                    data.update(new_data)
-                else:
-                    return
+    def __init__(self, config: Config, interval: float = 0.5):
+        self.logger = Logger("ConfigWatcher")
+        self.config = config
+        self.interval = interval
+        self.listeners = []
+        self.reloads = 0
+        self.rejected = 0
+        self.snapshot = config.snapshot()
+        self._signature = self._stat()
+        self._stop = threading.Event()
 
-                with open(path, "w", encoding="utf-8") as file:
-                    json.dump(data, file, indent=4)
+    def _stat(self) -> tuple:
+        signature = []
+        for path in self.config.paths():
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        # Updates pending in a JSONStore count as changes before they hit disk
+        signature.append(tuple(store.version for store in list(_STORES.values())))
+        return tuple(signature)
 
+    def poll(self) -> bool:
+        """
+        Reload when any file changed.
+        :return: True when a new snapshot was swapped in.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        old = self.snapshot
+        try:
+            new = self.config.snapshot(old.version + 1)
+        except (OSError, ValueError) as e:
+            # JSONDecodeError is a ValueError; half-written files land here
+            self.rejected += 1
+            self.logger.LogExit("poll", f"Config not applied: {e}", custom=True)
+            return False
+        for listener in self.listeners:
+            listener(new, old)
+        self.snapshot = new
+        self.reloads += 1
+        self.logger.logging.info("Config reloaded (version %d)", new.version)
+        return True
+
+    def run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
             except Exception as e:
-                self.logger.LogExit("updateParameter", e)
-                raise
+                self.logger.LogExit("run", e)
+
+    def stop(self) -> None:
+        self._stop.set()
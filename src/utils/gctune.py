@@ -0,0 +1,98 @@
+from .log import Logger
+import gc, threading, time
+
+
+class GCTuner:
+    """
+    Garbage collector policy for the render loop.
+
+    - freeze(): full collection, then every survivor (modules, models,
+      MediaPipe graph, config) moves to the permanent generation and is
+      never scanned again
+    - request_freeze(): lets worker threads ask for a freeze, which the
+      render thread runs in its next idle() instead of stalling mid-frame
+    - higher thresholds make young collections rarer
+    - idle(): runs a young collection in the slack after a flip once it is
+      half due, so automatic collections rarely start mid-frame
+    - every collection is timed through gc.callbacks; pauses above
+      `pause_ms` are counted
+    """
+
+    DEFAULT_THRESHOLDS = (10000, 50, 100)
+
+    def __init__(self, settings: dict = None):
+        settings = settings or {}
+        self.logger = Logger("GC")
+        self.enabled = settings.get("enabled", True)
+        self.thresholds = tuple(settings.get("thresholds", self.DEFAULT_THRESHOLDS))
+        self.pause_ms = float(settings.get("pause_ms", 2.0))
+
+        self.collections = [0, 0, 0]
+        self.idle_collections = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.long_pauses = 0
+        self._start = 0.0
+        self._freezing = None
+        self._lock = threading.Lock()
+        self._requests = []
+        gc.callbacks.append(self._on_gc)
+        if self.enabled:
+            gc.set_threshold(*self.thresholds)
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+            return
+        if self._freezing == threading.get_ident():
+            return  # deliberate loading-time collection, not a frame pause
+        ms = (time.perf_counter() - self._start) * 1000
+        self.collections[info["generation"]] += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        if ms > self.pause_ms:
+            self.long_pauses += 1
+
+    def freeze(self, label: str) -> None:
+        """Collect and freeze everything alive; call after a loading stage."""
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        self._freezing = threading.get_ident()
+        try:
+            gc.collect()
+        finally:
+            self._freezing = None
+        gc.freeze()
+        self.logger.logging.info(
+            "Froze %d objects after %s in %.1f ms",
+            gc.get_freeze_count(),
+            label,
+            (time.perf_counter() - start) * 1000,
+        )
+
+    def request_freeze(self, label: str) -> None:
+        """Ask the render thread to freeze on its next idle(); thread-safe."""
+        with self._lock:
+            self._requests.append(label)
+
+    def idle(self) -> None:
+        """Run a requested freeze or a due young collection (call in frame slack)."""
+        if self._requests:
+            with self._lock:
+                labels, self._requests = self._requests, []
+            self.freeze(", ".join(labels))
+        elif self.enabled and gc.get_count()[0] > self.thresholds[0] // 2:
+            gc.collect(0)
+            self.idle_collections += 1
+
+    def stats(self) -> dict:
+        return {
+            "collections": list(self.collections),
+            "idle_collections": self.idle_collections,
+            "frozen": gc.get_freeze_count(),
+            "total_ms": round(self.total_ms, 1),
+            "max_ms": round(self.max_ms, 2),
+            f"over_{self.pause_ms:g}ms": self.long_pauses,
+        }
@@ -0,0 +1,148 @@
+from .log import Logger
+import numpy as np
+import json, time
+
+
+class LatencyTracker:
+    """
+    Motion-to-photon latency recorder.
+
+    Every camera frame gets a sample id at capture; each pipeline stage
+    stamps time.perf_counter() into a preallocated ring. The render thread
+    stamps when it applies the sample and when the following
+    pygame.display.flip() completes.
+
+    With known motion onsets (video time in seconds) it also reports the
+    delay from the onset frame's capture until the displayed parameter
+    first moves by more than `threshold`.
+    """
+
+    STAGES = ("capture", "inference", "features", "push", "apply", "flip")
+
+    def __init__(
+        self,
+        capacity: int = 1 << 14,
+        onsets: list = None,
+        parameter: str = "AngleX",
+        threshold: float = 2.0,
+    ):
+        self.logger = Logger("Latency")
+        self.capacity = capacity
+        self.onsets = sorted(onsets or [])
+        self.parameter = parameter
+        self.threshold = threshold
+
+        self._stage = {name: i for i, name in enumerate(self.STAGES)}
+        self.samples = np.full((capacity, len(self.STAGES)), np.nan)
+        self.video_time = np.full(capacity, np.nan)
+        self.flips = np.full((capacity, 2), np.nan)  # flip time, displayed value
+        self._next_id = 0
+        self._flip_count = 0
+        self._last_flipped = -1
+
+    def begin(self, timestamp: float, video_time: float = None) -> int:
+        """Register a captured frame and return its sample id."""
+        sample_id = self._next_id
+        row = sample_id % self.capacity
+        self.samples[row] = np.nan
+        self.samples[row, 0] = timestamp
+        self.video_time[row] = np.nan if video_time is None else video_time
+        self._next_id += 1
+        return sample_id
+
+    def mark(self, sample_id: int, stage: str, now: float = None) -> None:
+        """Stamp `stage` for a sample, keeping the first stamp."""
+        if sample_id < 0:
+            return
+        cell = (sample_id % self.capacity, self._stage[stage])
+        if np.isnan(self.samples[cell]):
+            self.samples[cell] = time.perf_counter() if now is None else now
+
+    def flipped(self, sample_id: int, value: float, now: float = None) -> None:
+        """Record a completed flip showing `sample_id` and the displayed value."""
+        if now is None:
+            now = time.perf_counter()
+        self.flips[self._flip_count % self.capacity] = (now, value)
+        self._flip_count += 1
+        if sample_id >= 0 and sample_id != self._last_flipped:
+            self.samples[sample_id % self.capacity, -1] = now
+            self._last_flipped = sample_id
+
+    @staticmethod
+    def _summary(values_s: np.ndarray) -> dict:
+        values = values_s[~np.isnan(values_s)] * 1000
+        if not len(values):
+            return {"count": 0}
+        return {
+            "count": int(len(values)),
+            "mean_ms": round(float(values.mean()), 2),
+            "p50_ms": round(float(np.percentile(values, 50)), 2),
+            "p95_ms": round(float(np.percentile(values, 95)), 2),
+            "p99_ms": round(float(np.percentile(values, 99)), 2),
+            "max_ms": round(float(values.max()), 2),
+        }
+
+    def _onset_latencies(self, samples: np.ndarray, video_time: np.ndarray) -> list:
+        count = min(self._flip_count, self.capacity)
+        flips = self.flips[:count]
+        flips = flips[np.argsort(flips[:, 0])]
+        results = []
+        for onset in self.onsets:
+            hits = np.nonzero(video_time >= onset)[0]
+            if not len(hits):
+                continue
+            t0 = samples[hits[np.argmin(video_time[hits])], 0]
+            before = flips[flips[:, 0] <= t0]
+            after = flips[flips[:, 0] > t0]
+            if not len(before) or not len(after):
+                continue
+            moved = np.nonzero(np.abs(after[:, 1] - before[-1, 1]) > self.threshold)[0]
+            latency = after[moved[0], 0] - t0 if len(moved) else None
+            results.append(
+                {
+                    "onset_s": onset,
+                    "latency_ms": None if latency is None else round(latency * 1000, 2),
+                }
+            )
+        return results
+
+    def report(self, path: str = "LunaStudio-latency.json") -> dict:
+        """
+        Summarise end-to-end and per-stage latency and write it as JSON.
+        """
+        try:
+            count = min(self._next_id, self.capacity)
+            samples = self.samples[:count]
+            video_time = self.video_time[:count]
+            shown = samples[~np.isnan(samples[:, -1])]
+
+            stages = {}
+            for i in range(1, len(self.STAGES)):
+                stages[self.STAGES[i]] = self._summary(shown[:, i] - shown[:, i - 1])
+
+            onsets = self._onset_latencies(samples, video_time)
+            measured = [o["latency_ms"] for o in onsets if o["latency_ms"] is not None]
+            report = {
+                "frames_captured": int(self._next_id),
+                "frames_shown": int(len(shown)),
+                "end_to_end": self._summary(shown[:, -1] - shown[:, 0]),
+                "stages": stages,
+                "onsets": onsets,
+                "motion_to_photon": self._summary(np.asarray(measured) / 1000),
+            }
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=4)
+
+            e2e = report["end_to_end"]
+            if e2e["count"]:
+                self.logger.logging.info(
+                    "End-to-end latency p50 %.1f ms, p95 %.1f ms over %d frames (%s)",
+                    e2e["p50_ms"],
+                    e2e["p95_ms"],
+                    e2e["count"],
+                    path,
+                )
+            return report
+        except Exception as e:
+            self.logger.LogExit("report", e)
+            return {}
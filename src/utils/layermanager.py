@@ -1,4 +1,7 @@
 # Simple Layer Draw
+from .log import Logger
+
+logger = Logger("LayerManager").logging
 
 
 class Layer:
@@ -8,7 +11,7 @@ class Layer:
         self.objects = []
 
     def add(self, obj):
-        print("Add Obj: ", obj)
+        logger.debug("Add Obj: %s", obj)
         self.objects.append(obj)
 
     def remove(self, obj):
@@ -26,8 +29,7 @@ class LayerManager:
         self.layer = []
 
     def addLayer(self, layer, index=None):
-        print("Add Layer: ", layer)
-        print("Add Layer Index: ", index)
+        logger.debug("Add Layer: %s at index %s", layer, index)
         if index is None:
             self.layer.append(layer)
         else:
@@ -35,9 +37,8 @@ class LayerManager:
 
     def removeLayer(self, layerName):
         self.layer = [layer for layer in self.layer if layer.name != layerName]
-        print("Add Layer Removed: ", layerName)
+        logger.debug("Layer Removed: %s", layerName)
 
     def draw(self, surface):
-        print("drawing surface here")
         for layer in self.layer:
             layer.draw(surface)
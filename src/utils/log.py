@@ -1,9 +1,87 @@
-from logging.handlers import RotatingFileHandler
-import traceback, logging
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import threading, logging, atexit, queue, time, os
+
+
+class _BannerFormatter(logging.Formatter):
+    """
+    Formatter that wraps tracebacks in the LunaStudio banner.
+    Runs on the listener thread, so hot threads never format tracebacks.
+    """
+
+    def formatException(self, ei):
+        tb_str = super().formatException(ei)
+        return (
+            "==============================================================\n"
+            f"more Information:\n{tb_str}\n"
+            "=============================================================="
+        )
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves exception formatting to the listener thread.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _RepeatFilter(logging.Filter):
+    """
+    Rate-limit identical records.
+
+    The first occurrence of a message is emitted, identical ones within
+    `window` seconds are dropped and counted. The next emitted copy
+    reports how many were suppressed; counts of bursts that never recur
+    are reported by drain() at shutdown.
+    """
+
+    def __init__(self, window: float = 5.0):
+        super().__init__()
+        self.window = window
+        self._lock = threading.Lock()
+        self._seen = {}
+        self.emitted = 0
+        self.suppressed = 0
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+        key = (record.name, record.levelno, record.msg, str(record.args))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now - entry[0] < self.window:
+                entry[1] += 1
+                self.suppressed += 1
+                return False
+            repeats = entry[1] if entry is not None else 0
+            if len(self._seen) >= 1024:
+                self._seen.clear()
+            self._seen[key] = [now, 0, record]
+            self.emitted += 1
+        if repeats:
+            record.msg = f"{record.msg} (suppressed {repeats} identical)"
+        return True
+
+    def drain(self) -> list:
+        """
+        Take the suppressed counts not reported yet.
+        :return: [(first record, count)] for messages that did not recur.
+        """
+        with self._lock:
+            pending = [
+                (entry[2], entry[1]) for entry in self._seen.values() if entry[1]
+            ]
+            for entry in self._seen.values():
+                entry[1] = 0
+        return pending
 
 
 class Logger:
-    _formatter = logging.Formatter(
+    _formatter = _BannerFormatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
     _file_handler = RotatingFileHandler(
@@ -13,26 +91,68 @@ class Logger:
     _console_handler = logging.StreamHandler()
     _console_handler.setFormatter(_formatter)
 
+    _level = getattr(
+        logging, os.environ.get("LUNASTUDIO_LOG_LEVEL", "INFO").upper(), logging.INFO
+    )
+    _queue = queue.SimpleQueue()
+    _repeat_filter = _RepeatFilter()
+    _queue_handler = _DeferredQueueHandler(_queue)
+    _queue_handler.addFilter(_repeat_filter)
+    _listener = QueueListener(
+        _queue, _console_handler, _file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    _started = True
+
     def __init__(self, HandlerName: str):
         self.logging = self.setup_logger(HandlerName)
 
     def LogExit(self, context: str, e, custom: bool = False):
         if custom:
-            tb_str = str(e)
+            self.logging.error("[%s] Exception: %s", context, e)
         else:
-            tb_str = traceback.format_exc()
-        self.logging.error(
-            "[%s] Exception: %s\n%s",
-            context,
-            e,
-            f"==============================================================\nmore Information:\n{tb_str}\n==============================================================",
-        )
+            self.logging.error("[%s] Exception: %s", context, e, exc_info=True)
 
     @classmethod
     def setup_logger(cls, name: str) -> logging.Logger:
         logger = logging.getLogger(name)
-        logger.setLevel(logging.DEBUG)
+        logger.setLevel(cls._level)
+        logger.propagate = False
         if not logger.handlers:
-            logger.addHandler(cls._console_handler)
-            logger.addHandler(cls._file_handler)
+            logger.addHandler(cls._queue_handler)
         return logger
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Return counters of emitted and suppressed repeated records."""
+        return {
+            "emitted": cls._repeat_filter.emitted,
+            "suppressed": cls._repeat_filter.suppressed,
+        }
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Report suppressed repeats, flush pending records and stop the
+        listener thread.
+        """
+        if not cls._started:
+            return
+        for record, count in cls._repeat_filter.drain():
+            # Straight onto the queue: the filter would drop it as a repeat
+            cls._queue.put(
+                logging.LogRecord(
+                    record.name,
+                    record.levelno,
+                    record.pathname,
+                    record.lineno,
+                    f"{record.getMessage()} (suppressed {count} identical)",
+                    None,
+                    None,
+                )
+            )
+        cls._listener.stop()
+        cls._started = False
+
+
+atexit.register(Logger.shutdown)
@@ -0,0 +1,259 @@
+from .log import Logger
+from pathlib import Path
+import json, os, sys, threading, time, tracemalloc
+
+try:
+    import psutil
+except ImportError:  # optional: RSS falls back to /proc or the Win32 API
+    psutil = None
+
+MB = 1024 * 1024
+
+# OpenGL textures created by this process: id -> (width, height, bytes, label)
+GPU_TEXTURES = {}
+
+# Heap attribution of tracemalloc frames by file path
+SUBSYSTEMS = (
+    ("mediapipe", "mediapipe"),
+    ("opencv", "cv2"),
+    ("live2d", "live2d"),
+    ("pygame", "pygame"),
+    ("numpy", "numpy"),
+    ("lunastudio", "src"),
+)
+
+
+def track_texture(
+    texture: int, width: int, height: int, label: str, mipmaps: bool = False
+) -> None:
+    """Record an RGBA8 texture allocation for the GPU memory estimate."""
+    size = width * height * 4
+    if mipmaps:
+        size = size * 4 // 3
+    GPU_TEXTURES[int(texture)] = (width, height, size, label)
+
+
+def untrack_texture(texture: int) -> None:
+    """Forget a deleted texture."""
+    GPU_TEXTURES.pop(int(texture), None)
+
+
+def rss() -> int:
+    """Resident set size of this process in bytes (0 when unavailable)."""
+    if psutil:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        pass
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t)
+                for name in (
+                    "PeakWorkingSetSize",
+                    "WorkingSetSize",
+                    "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage",
+                    "QuotaNonPagedPoolUsage",
+                    "PagefileUsage",
+                    "PeakPagefileUsage",
+                )
+            ]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb
+        ):
+            return counters.WorkingSetSize
+    return 0
+
+
+class MemoryTracker:
+    """
+    Process memory accounting.
+
+    - RSS, Python heap (tracemalloc) and the GPU texture estimate are
+      sampled every `interval` seconds from the render loop.
+    - checkpoint() records the RSS growth of each subsystem as it loads
+      (imports, pygame, Live2D model, OpenCV capture, MediaPipe).
+      Capture-side checkpoints run on the capture thread, so they are
+      estimates.
+    - top() lists the largest Python allocation sites on demand.
+    - report() writes everything to a JSON file on exit.
+    """
+
+    def __init__(
+        self,
+        interval: float = 5.0,
+        warmup: float = 20.0,
+        trace: bool = True,
+        path: str = "LunaStudio-memory.json",
+    ):
+        self.logger = Logger("Memory")
+        self.interval = interval
+        self.warmup = warmup
+        self.path = path
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start(8)
+
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self._next = self.started
+        self._last_rss = rss()
+        self.checkpoints = [
+            {
+                "name": "interpreter+imports",
+                "rss": self._last_rss,
+                "delta": self._last_rss,
+            }
+        ]
+        self.accounted = {}
+        self.model_textures = []
+        self.samples = []  # (seconds, rss, heap, gpu)
+
+    def checkpoint(self, name: str) -> None:
+        """Attribute RSS growth since the previous checkpoint to `name`."""
+        with self._lock:
+            now = rss()
+            self.checkpoints.append(
+                {"name": name, "rss": now, "delta": now - self._last_rss}
+            )
+            self._last_rss = now
+
+    def account(self, name: str, nbytes: int) -> None:
+        """Record a known allocation size (e.g. reused frame buffers)."""
+        self.accounted[name] = int(nbytes)
+
+    def track_model(self, model_json: Path) -> None:
+        """Estimate the loaded Live2D model's textures from model3.json."""
+        from PIL import Image
+
+        model_json = Path(model_json)
+        with open(model_json, "r", encoding="utf-8") as file:
+            textures = json.load(file).get("FileReferences", {}).get("Textures", [])
+        self.model_textures = []
+        for rel in textures:
+            try:
+                with Image.open(model_json.parent / rel) as image:  # header only
+                    width, height = image.size
+                self.model_textures.append(
+                    (rel, width, height, width * height * 4 * 4 // 3)
+                )
+            except OSError as e:
+                self.logger.LogExit("track_model", e, custom=True)
+
+    def gpu_bytes(self) -> int:
+        own = sum(entry[2] for entry in GPU_TEXTURES.values())
+        return own + sum(entry[3] for entry in self.model_textures)
+
+    def sample(self, now: float = None) -> None:
+        """Take a sample when the interval has elapsed (render thread)."""
+        now = now if now is not None else time.perf_counter()
+        if now < self._next:
+            return
+        self._next = now + self.interval
+        heap = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        self.samples.append((now - self.started, rss(), heap, self.gpu_bytes()))
+
+    def top(self, limit: int = 15) -> list:
+        """Largest Python allocation sites: [(location, bytes, blocks)]."""
+        if not tracemalloc.is_tracing():
+            return []
+        stats = tracemalloc.take_snapshot().statistics("lineno")
+        return [
+            (f"{s.traceback[0].filename}:{s.traceback[0].lineno}", s.size, s.count)
+            for s in stats[:limit]
+        ]
+
+    def log_top(self, limit: int = 15) -> None:
+        for location, size, count in self.top(limit):
+            self.logger.logging.info(
+                "%8.1f KiB %6d blocks  %s", size / 1024, count, location
+            )
+
+    def _heap_by_subsystem(self) -> dict:
+        if not tracemalloc.is_tracing():
+            return {}
+        totals = {}
+        for stat in tracemalloc.take_snapshot().statistics("filename"):
+            path = stat.traceback[0].filename.replace("\\", "/")
+            name = next(
+                (name for name, part in SUBSYSTEMS if f"/{part}/" in path), "other"
+            )
+            totals[name] = totals.get(name, 0) + stat.size
+        return {
+            k: round(v / MB, 2)
+            for k, v in sorted(totals.items(), key=lambda kv: -kv[1])
+        }
+
+    def steady_rss(self) -> float:
+        """Median RSS in MB after the warm-up period (None without samples)."""
+        steady = sorted(s[1] for s in self.samples if s[0] >= self.warmup)
+        if not steady:
+            return None
+        return steady[len(steady) // 2] / MB
+
+    def summary(self) -> dict:
+        rss_values = [s[1] for s in self.samples] or [rss()]
+        steady = self.steady_rss()
+        return {
+            "rss_mb": round(rss() / MB, 1),
+            "peak_rss_mb": round(max(rss_values) / MB, 1),
+            "steady_rss_mb": round(steady, 1) if steady else None,
+            "gpu_texture_mb": round(self.gpu_bytes() / MB, 1),
+        }
+
+    def report(self, path: str = None) -> dict:
+        """Write the memory report as JSON and return it."""
+        path = path or self.path
+        report = {
+            "summary": self.summary(),
+            "checkpoints_mb": [
+                {
+                    "name": c["name"],
+                    "rss": round(c["rss"] / MB, 1),
+                    "delta": round(c["delta"] / MB, 1),
+                }
+                for c in self.checkpoints
+            ],
+            "accounted_mb": {k: round(v / MB, 2) for k, v in self.accounted.items()},
+            "gpu_textures": [
+                {"label": label, "size": [w, h], "mb": round(b / MB, 2)}
+                for w, h, b, label in GPU_TEXTURES.values()
+            ]
+            + [
+                {"label": f"model:{rel}", "size": [w, h], "mb": round(b / MB, 2)}
+                for rel, w, h, b in self.model_textures
+            ],
+            "python_heap_mb": self._heap_by_subsystem(),
+            "top_allocations": [
+                {"location": loc, "kb": round(size / 1024, 1), "blocks": count}
+                for loc, size, count in self.top()
+            ],
+            "samples": [
+                {
+                    "t": round(t, 1),
+                    "rss_mb": round(r / MB, 1),
+                    "heap_mb": None if h is None else round(h / MB, 2),
+                    "gpu_mb": round(g / MB, 1),
+                }
+                for t, r, h, g in self.samples
+            ],
+        }
+        try:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+            self.logger.logging.info(
+                "Memory report written to %s: %s", path, report["summary"]
+            )
+        except OSError as e:
+            self.logger.LogExit("report", e, custom=True)
+        return report
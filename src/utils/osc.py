@@ -0,0 +1,98 @@
+import struct
+
+BUNDLE_TAG = b"#bundle\0"
+IMMEDIATE = b"\0\0\0\0\0\0\0\1"
+
+
+def _pad(data: bytes) -> bytes:
+    """Null-terminate and pad to a multiple of 4 bytes."""
+    return data + b"\0" * (4 - len(data) % 4)
+
+
+def encode_string(value: str) -> bytes:
+    return _pad(value.encode("utf-8"))
+
+
+def encode_message(address: str, *args) -> bytes:
+    """
+    Encode an OSC message. Supported argument types: float (f), int (i),
+    str (s), bool (T/F) and bytes (b).
+    """
+    tags, payload = [","], []
+    for arg in args:
+        if isinstance(arg, bool):
+            tags.append("T" if arg else "F")
+        elif isinstance(arg, float):
+            tags.append("f")
+            payload.append(struct.pack(">f", arg))
+        elif isinstance(arg, int):
+            tags.append("i")
+            payload.append(struct.pack(">i", arg))
+        elif isinstance(arg, str):
+            tags.append("s")
+            payload.append(encode_string(arg))
+        elif isinstance(arg, bytes):
+            tags.append("b")
+            payload.append(struct.pack(">i", len(arg)) + arg + b"\0" * (-len(arg) % 4))
+        else:
+            raise TypeError(f"Unsupported OSC argument {arg!r}")
+    return encode_string(address) + encode_string("".join(tags)) + b"".join(payload)
+
+
+def encode_bundle(messages: list, timetag: bytes = IMMEDIATE) -> bytes:
+    """Wrap encoded messages into one OSC bundle."""
+    parts = [BUNDLE_TAG, timetag]
+    for message in messages:
+        parts.append(struct.pack(">i", len(message)))
+        parts.append(message)
+    return b"".join(parts)
+
+
+def _read_string(data: bytes, offset: int):
+    end = data.index(b"\0", offset)
+    return data[offset:end].decode("utf-8"), (end + 4) & ~3
+
+
+def decode_message(data: bytes):
+    """
+    Decode one OSC message.
+    :return: (address, [args])
+    """
+    address, offset = _read_string(data, 0)
+    if offset >= len(data):
+        return address, []
+    tags, offset = _read_string(data, offset)
+    args = []
+    for tag in tags[1:]:
+        if tag == "f":
+            args.append(struct.unpack_from(">f", data, offset)[0])
+            offset += 4
+        elif tag == "i":
+            args.append(struct.unpack_from(">i", data, offset)[0])
+            offset += 4
+        elif tag == "s":
+            value, offset = _read_string(data, offset)
+            args.append(value)
+        elif tag == "b":
+            size = struct.unpack_from(">i", data, offset)[0]
+            args.append(data[offset + 4 : offset + 4 + size])
+            offset += 4 + size + (-size % 4)
+        elif tag in "TF":
+            args.append(tag == "T")
+        else:
+            raise ValueError(f"Unsupported OSC type tag {tag!r}")
+    return address, args
+
+
+def decode_packet(data: bytes) -> list:
+    """
+    Decode a datagram into a flat list of (address, args), expanding bundles.
+    """
+    if not data.startswith(BUNDLE_TAG):
+        return [decode_message(data)]
+    messages, offset = [], 16
+    while offset < len(data):
+        size = struct.unpack_from(">i", data, offset)[0]
+        messages.extend(decode_packet(data[offset + 4 : offset + 4 + size]))
+        offset += 4 + size
+    return messages
@@ -0,0 +1,96 @@
+from .log import Logger
+import threading, time
+
+
+class PowerManager:
+    """
+    Power state machine for tracking and rendering.
+
+    - active: full render rate and inference
+    - idle: no face for `face_timeout` seconds; idle animation at a low rate
+    - hidden: window minimized or hidden; drawing paused
+
+    Inputs come from window events (render thread) and presence reports:
+    faces from the trackers, speech from the audio source. Transitions are
+    evaluated on the render thread in update(). `wake` is called from the
+    reporting thread when a face returns, so a sleeping render loop can
+    react on its next frame.
+    """
+
+    ACTIVE, IDLE, HIDDEN = "active", "idle", "hidden"
+
+    DEFAULT_PROFILES = {
+        ACTIVE: {},
+        IDLE: {"render_fps": 15, "inference_fps": 4, "camera_fps": 15},
+        HIDDEN: {"render_fps": 4, "inference_fps": 2, "camera_fps": 10},
+    }
+
+    def __init__(self, settings: dict = None):
+        settings = settings or {}
+        self.logger = Logger("Power")
+        self.enabled = settings.get("enabled", True)
+        self.face_timeout = float(settings.get("face_timeout", 60.0))
+        self.profiles = {
+            state: {**defaults, **settings.get(state, {})}
+            for state, defaults in self.DEFAULT_PROFILES.items()
+        }
+        self.wake = None
+
+        now = time.perf_counter()
+        self._lock = threading.Lock()
+        self.state = self.ACTIVE
+        self.visible = True
+        self.face_time = now
+        self._since = now
+        self.durations = {state: 0.0 for state in self.DEFAULT_PROFILES}
+        self.transitions = 0
+
+    def on_face(self, present: bool, now: float = None) -> None:
+        """Report a face or voice (tracking and audio threads)."""
+        if not present:
+            return
+        self.face_time = now if now is not None else time.perf_counter()
+        if self.state == self.IDLE and self.wake:
+            self.wake()
+
+    def on_visibility(self, visible: bool) -> None:
+        """Report window visibility (render thread)."""
+        self.visible = visible
+
+    def update(self, now: float = None) -> str:
+        """
+        Evaluate the state machine.
+        :return: Current state.
+        """
+        if not self.enabled:
+            return self.state
+        now = now if now is not None else time.perf_counter()
+        if not self.visible:
+            desired = self.HIDDEN
+        elif now - self.face_time > self.face_timeout:
+            desired = self.IDLE
+        else:
+            desired = self.ACTIVE
+
+        if desired != self.state:
+            with self._lock:
+                self.durations[self.state] += now - self._since
+                self.logger.logging.info("Power state %s -> %s", self.state, desired)
+                self.state = desired
+                self._since = now
+                self.transitions += 1
+        return self.state
+
+    def profile(self) -> dict:
+        """Rate limits of the current state (empty when unthrottled)."""
+        return self.profiles[self.state]
+
+    def stats(self) -> dict:
+        """Seconds spent in each state so far."""
+        with self._lock:
+            durations = dict(self.durations)
+            durations[self.state] += time.perf_counter() - self._since
+        return {
+            "seconds": {k: round(v, 1) for k, v in durations.items()},
+            "transitions": self.transitions,
+        }
@@ -0,0 +1,219 @@
+from .log import Logger
+import cProfile, pstats, json, os, sys, threading, time
+
+MODES = ("sample", "cprofile")
+
+
+class Profiler:
+    """
+    On-demand, time-boxed profile captures for stutter reports.
+
+    - "sample": a thread reads every other thread's stack through
+      sys._current_frames() each `interval_ms` and writes collapsed
+      stacks (flamegraph.pl, speedscope) and a speedscope JSON with one
+      profile per thread name
+    - "cprofile": deterministic cProfile of the thread that called
+      start() (the render thread for the hotkey and API), written as
+      .prof plus a cumulative-time summary
+
+    Files go next to LunaStudio.log, and their paths are logged. Nothing
+    is installed between captures, so an idle profiler costs nothing.
+    """
+
+    def __init__(self, settings: dict = None):
+        """
+        :param settings: The "Profiler" block of config.json.
+        """
+        settings = settings or {}
+        self.logger = Logger("Profiler")
+        self.seconds = float(settings.get("seconds", 10))
+        self.interval = settings.get("interval_ms", 5) / 1000
+        self.mode = settings.get("mode", "sample")
+        self.directory = os.path.dirname(Logger._file_handler.baseFilename)
+        self.captures = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._profile = None
+        self._base = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None or bool(
+            self._thread and self._thread.is_alive()
+        )
+
+    def start(self, seconds: float = None, mode: str = None, on_done=None):
+        """
+        Begin a capture unless one is running.
+        :param on_done: cprofile mode: called from a timer thread when the
+            time is up; must get finish() called on the profiled thread.
+        :return: Base path of the output files, or None when busy.
+        """
+        seconds = seconds or self.seconds
+        mode = mode or self.mode
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiler mode {mode!r}")
+        with self._lock:
+            if self.active:
+                return None
+            self._stop.clear()
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            self._base = os.path.join(self.directory, f"LunaStudio-profile-{stamp}")
+            if mode == "sample":
+                target, args = self._sample, (seconds, self._base)
+            else:
+                self._profile = cProfile.Profile()
+                self._profile_thread = threading.current_thread().name
+                self._profile.enable()
+                target, args = self._timer, (seconds, on_done)
+            self._thread = threading.Thread(
+                target=target, args=args, name="Profiler", daemon=True
+            )
+            self._thread.start()
+        self.logger.logging.info("%s capture started for %.1f s", mode, seconds)
+        return self._base
+
+    def stop(self) -> None:
+        """End a running capture early and write what was collected."""
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self.finish()
+
+    # ---------- cProfile ----------
+
+    def _timer(self, seconds: float, on_done) -> None:
+        if not self._stop.wait(seconds) and on_done:
+            on_done()
+
+    def finish(self, base: str = None) -> None:
+        """
+        Stop and write a cprofile capture (on the profiled thread).
+        :param base: Only finish the capture start() returned this path for.
+        """
+        with self._lock:
+            if base is not None and base != self._base:
+                return
+            profile, self._profile = self._profile, None
+        if profile is None:
+            return
+        profile.disable()
+        base = f"{self._base}-{self._profile_thread}"
+        try:
+            profile.dump_stats(base + ".prof")
+            with open(base + ".txt", "w", encoding="utf-8") as file:
+                stats = pstats.Stats(profile, stream=file)
+                stats.sort_stats("cumulative").print_stats(60)
+            self.captures += 1
+            self.logger.logging.info("Profile written: %s.prof / .txt", base)
+        except OSError as e:
+            self.logger.LogExit("finish", e)
+
+    # ---------- sampling ----------
+
+    def _sample(self, seconds: float, base: str) -> None:
+        me = threading.get_ident()
+        frame_ids, frames = {}, []  # code -> id, [(name, file, line)]
+        stack_ids, stacks = {}, []  # (frame ids root -> leaf) -> id
+        timelines = {}  # thread name -> ([stack ids], [seconds])
+        start = last = time.perf_counter()
+        cost = 0.0
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            if now - start >= seconds:
+                break
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                ids = []
+                for code in reversed(codes):
+                    fid = frame_ids.get(code)
+                    if fid is None:
+                        fid = frame_ids[code] = len(frames)
+                        name = getattr(code, "co_qualname", code.co_name)
+                        frames.append((name, code.co_filename, code.co_firstlineno))
+                    ids.append(fid)
+                key = tuple(ids)
+                sid = stack_ids.get(key)
+                if sid is None:
+                    sid = stack_ids[key] = len(stacks)
+                    stacks.append(key)
+                samples, weights = timelines.setdefault(
+                    names.get(ident, f"Thread-{ident}"), ([], [])
+                )
+                samples.append(sid)
+                weights.append(now - last)
+            last = now
+            cost += time.perf_counter() - now
+        elapsed = time.perf_counter() - start
+        try:
+            self._write_collapsed(base + ".collapsed.txt", frames, stacks, timelines)
+            self._write_speedscope(
+                base + ".speedscope.json", frames, stacks, timelines, elapsed
+            )
+            self.captures += 1
+            count = sum(len(samples) for samples, _ in timelines.values())
+            self.logger.logging.info(
+                "Profile written: %s.speedscope.json / .collapsed.txt "
+                "(%d stacks over %d threads, sampler %.1f%% of %.1f s)",
+                base,
+                count,
+                len(timelines),
+                cost / max(elapsed, 1e-6) * 100,
+                elapsed,
+            )
+        except OSError as e:
+            self.logger.LogExit("_sample", e)
+
+    @staticmethod
+    def _label(frame: tuple) -> str:
+        name, file, line = frame
+        return f"{name} ({os.path.basename(file)}:{line})"
+
+    def _write_collapsed(self, path, frames, stacks, timelines) -> None:
+        """One "thread;root;...;leaf count" line per distinct stack."""
+        labels = [self._label(frame).replace(";", ":") for frame in frames]
+        with open(path, "w", encoding="utf-8") as file:
+            for thread, (samples, _) in timelines.items():
+                counts = {}
+                for sid in samples:
+                    counts[sid] = counts.get(sid, 0) + 1
+                for sid, count in counts.items():
+                    stack = ";".join(labels[fid] for fid in stacks[sid])
+                    file.write(f"{thread};{stack} {count}\n")
+
+    def _write_speedscope(self, path, frames, stacks, timelines, elapsed) -> None:
+        """Sampled profiles per thread, in capture order, for speedscope.app."""
+        profiles = [
+            {
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(elapsed, 6),
+                "samples": [list(stacks[sid]) for sid in samples],
+                "weights": [round(w, 6) for w in weights],
+            }
+            for thread, (samples, weights) in timelines.items()
+        ]
+        document = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": os.path.basename(path),
+            "exporter": "LunaStudio",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [
+                    {"name": name, "file": file, "line": line}
+                    for name, file, line in frames
+                ]
+            },
+            "profiles": profiles,
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(document, file)
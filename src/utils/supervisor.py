@@ -0,0 +1,147 @@
+from .log import Logger
+import threading, time
+
+# Teardown order: workers of a stage are joined, then the stage's cleanups run
+STAGES = ("camera", "landmarker", "workers", "gl", "pygame")
+
+
+class Worker:
+    def __init__(self, name: str, stage: str, timeout: float, stop=None):
+        self.name = name
+        self.stage = stage
+        self.timeout = timeout
+        self.stop = stop
+        self.thread = None
+
+
+class Supervisor:
+    """
+    Owns the app's worker threads and shuts them down in a fixed order.
+
+    - `stopping` is set by the first stop request (window closed, a
+      worker failing, `app.running = False`); workers wait on it instead
+      of polling a flag, and `on_stop` callbacks wake blocking waits
+    - an exception escaping a worker is recorded and stops the app;
+      workers that handle their own errors report them through fail()
+    - shutdown() joins workers stage by stage (camera -> landmarker ->
+      workers -> GL -> pygame) with per-worker timeouts inside one
+      overall budget, and runs each stage's cleanups after its workers
+      have exited
+    """
+
+    def __init__(self, budget: float = 2.0):
+        self.logger = Logger("Supervisor")
+        self.budget = budget
+        self.stopping = threading.Event()
+        self.stopped_by = None
+        self.failure = None
+        self.on_stop = []
+        self._workers = []
+        self._cleanups = []
+        self._lock = threading.Lock()
+
+    def request_stop(self, reason: str) -> None:
+        with self._lock:
+            if self.stopping.is_set():
+                return
+            self.stopped_by = reason
+            self.stopping.set()
+        self.logger.logging.info("Stop requested by %s", reason)
+        for callback in self.on_stop:
+            try:
+                callback()
+            except Exception as e:
+                self.logger.LogExit("on_stop", e, custom=True)
+
+    def fail(self, name: str, error) -> None:
+        """
+        Record a worker failure (the first one sets the exit code) and stop.
+        :param error: Exception or message; the caller has already logged it.
+        """
+        with self._lock:
+            if self.failure is None:
+                self.failure = (name, error)
+        self.request_stop(name)
+
+    def start(
+        self,
+        name: str,
+        target,
+        *args,
+        stage: str = "workers",
+        timeout: float = 1.0,
+        stop=None,
+    ) -> Worker:
+        """
+        Start `target(*args)` on a daemon thread.
+        :param stage: Teardown stage the worker belongs to (see STAGES).
+        :param timeout: Longest join wait at shutdown.
+        :param stop: Callable that unblocks the worker at shutdown.
+        """
+        worker = Worker(name, stage, timeout, stop)
+
+        def run():
+            try:
+                target(*args)
+            except Exception as e:
+                self.logger.LogExit(name, e)
+                self.fail(name, e)
+
+        worker.thread = threading.Thread(target=run, name=name, daemon=True)
+        self._workers.append(worker)
+        worker.thread.start()
+        return worker
+
+    def at_teardown(self, stage: str, cleanup, after: Worker = None) -> None:
+        """
+        Run `cleanup()` during shutdown once `stage` is reached.
+        :param after: Skip the cleanup if this worker is still running (its
+            resources are still in use).
+        """
+        self._cleanups.append((stage, cleanup, after))
+
+    def shutdown(self) -> dict:
+        """
+        Stop everything within the budget.
+        :return: Milliseconds per stage and names of workers that did not exit.
+        """
+        self.request_stop("shutdown")
+        for worker in self._workers:
+            if worker.stop:
+                try:
+                    worker.stop()
+                except Exception as e:
+                    self.logger.LogExit(f"stop {worker.name}", e, custom=True)
+
+        start = time.perf_counter()
+        deadline = start + self.budget
+        report, late = {}, []
+        for stage in STAGES:
+            stage_start = time.perf_counter()
+            for worker in self._workers:
+                if worker.stage != stage:
+                    continue
+                remaining = deadline - time.perf_counter()
+                worker.thread.join(max(0.0, min(worker.timeout, remaining)))
+                if worker.thread.is_alive():
+                    late.append(worker.name)
+            for cleanup_stage, cleanup, after in self._cleanups:
+                if cleanup_stage != stage:
+                    continue
+                if after and after.thread.is_alive():
+                    self.logger.LogExit(
+                        "shutdown",
+                        f"{after.name} still running, skipped {stage}",
+                        custom=True,
+                    )
+                    continue
+                try:
+                    cleanup()
+                except Exception as e:
+                    self.logger.LogExit(f"teardown {stage}", e)
+            report[stage] = round((time.perf_counter() - stage_start) * 1000, 1)
+
+        report["total"] = round((time.perf_counter() - start) * 1000, 1)
+        report["late"] = late
+        self.logger.logging.info("Shutdown (ms): %s", report)
+        return report
@@ -0,0 +1,84 @@
+import threading, types, wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+audio = pytest.importorskip("src.render.audio", reason="LunaStudio dependencies")
+param = pytest.importorskip("src.render.module.param", reason="LunaStudio dependencies")
+Params = param.Params
+
+MOUTH = Params.PARAMETER_KEYS.index("MouthOpenY")
+RATE = 16000
+
+
+def _wav(path, seconds, amplitude=0.5, freq=220.0):
+    """Write a mono 16-bit sine (silence for amplitude 0)."""
+    t = np.arange(int(RATE * seconds)) / RATE
+    pcm = (amplitude * 32767 * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(pcm.tobytes())
+    return str(path)
+
+
+def _source(path, mode="override", loop=False, **settings):
+    app = types.SimpleNamespace(running=True)
+    settings = {"source": path, "mode": mode, "loop": loop, **settings}
+    return audio.AudioSource(app, settings)
+
+
+def test_tone_opens_mouth(tmp_path):
+    source = _source(_wav(tmp_path / "tone.wav", 0.2))
+    params = Params()
+    source.run(params)
+    assert params.target[MOUTH] > 0.5
+
+
+def test_silence_keeps_mouth_closed(tmp_path):
+    source = _source(_wav(tmp_path / "silence.wav", 0.2, amplitude=0.0))
+    params = Params()
+    source.run(params)
+    assert params.target[MOUTH] == 0.0
+
+
+def test_partial_last_block_is_pushed(tmp_path):
+    # 1.5 blocks: one full block and a zero-padded remainder
+    source = _source(_wav(tmp_path / "short.wav", 768 / RATE), block=512)
+    source.run(Params())
+    assert source.blocks == 2
+
+
+def test_short_looped_file_is_paced(tmp_path):
+    # Shorter than one block: every pass must still wait for its duration
+    source = _source(_wav(tmp_path / "blip.wav", 100 / RATE), loop=True, block=512)
+    timer = threading.Timer(0.1, setattr, (source.app, "running", False))
+    timer.start()
+    source.run(Params())
+    timer.join()
+    # 0.1 s of 100-frame passes at 16 kHz is 16 blocks, not thousands
+    assert 0 < source.blocks <= 20
+
+
+def test_blend_mixes_once_per_frame(tmp_path):
+    source = _source(_wav(tmp_path / "tone.wav", 0.2), mode="blend", weight=0.5)
+    params = Params(smooth_factor=0.0)
+    params.set_targets(["MouthOpenY"], [0.0])
+    source.run(params)
+    # Audio blocks leave the camera target alone...
+    assert params.target[MOUTH] == 0.0
+    audio_open = params._blend[MOUTH]
+    # ...and however many were pushed, the frame is an even mix
+    params.update_params()
+    assert params.values[MOUTH] == pytest.approx(0.5 * audio_open)
+    params.update_params()
+    assert params.values[MOUTH] == pytest.approx(0.5 * audio_open)
+
+
+def test_set_blend_weight_zero_is_off():
+    params = Params(smooth_factor=0.0)
+    params.set_targets(["MouthOpenY"], [0.4])
+    params.set_blend(["MouthOpenY"], [1.0], 0.0)
+    params.update_params()
+    assert params.values[MOUTH] == pytest.approx(0.4)
@@ -0,0 +1,84 @@
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+body = pytest.importorskip("src.render.module.body", reason="LunaStudio dependencies")
+
+
+def _mapping(inputs):
+    return types.SimpleNamespace(
+        inputs=list(inputs), input_values=np.zeros(len(inputs), np.float32)
+    )
+
+
+def _features(mirror):
+    return body.BodyFeatures(
+        _mapping(body.BODY_FEATURES), _mapping(body.HAND_FEATURES), mirror
+    )
+
+
+def _point(x, y):
+    return types.SimpleNamespace(x=x, y=y)
+
+
+def _pose(nose, left, right):
+    pose = [_point(0.5, 0.5) for _ in range(33)]
+    pose[body.NOSE] = _point(*nose)
+    pose[body.LEFT_SHOULDER] = _point(*left)
+    pose[body.RIGHT_SHOULDER] = _point(*right)
+    return types.SimpleNamespace(pose_landmarks=[pose])
+
+
+def _flipped(point):
+    return 1.0 - point[0], point[1]
+
+
+def _hands(*hands):
+    return types.SimpleNamespace(
+        hand_landmarks=[[_point(0.5, y)] for _, y in hands],
+        handedness=[[types.SimpleNamespace(category_name=side)] for side, _ in hands],
+    )
+
+
+NOSE, LEFT, RIGHT = (0.52, 0.3), (0.35, 0.55), (0.7, 0.6)
+
+
+def test_read_pose():
+    features = _features(mirror=False)
+    assert features.read_pose(_pose(NOSE, LEFT, RIGHT))
+    yaw, lean, roll = features.body.input_values
+    assert yaw == pytest.approx(np.degrees(np.arcsin((0.18 - 0.17) / 0.35)))
+    assert lean == pytest.approx((0.575 - 0.3) / 0.35)
+    assert roll == pytest.approx(np.degrees(np.arctan(0.05 / 0.35)))
+
+
+def test_mirrored_pose_matches_mirrored_pixels():
+    # A flipped frame moves every point to 1 - x, and the shoulder seen as
+    # the person's left is the one that was their right
+    pixels = _features(mirror=False)
+    pixels.read_pose(_pose(_flipped(NOSE), _flipped(RIGHT), _flipped(LEFT)))
+    landmarks = _features(mirror=True)
+    landmarks.read_pose(_pose(NOSE, LEFT, RIGHT))
+    np.testing.assert_allclose(
+        landmarks.body.input_values, pixels.body.input_values, atol=1e-5
+    )
+
+
+def test_pose_without_person_or_width_keeps_values():
+    features = _features(mirror=False)
+    features.read_pose(_pose(NOSE, LEFT, RIGHT))
+    before = features.body.input_values.copy()
+    assert not features.read_pose(types.SimpleNamespace(pose_landmarks=[]))
+    assert not features.read_pose(_pose(NOSE, (0.5, 0.5), (0.5, 0.6)))
+    np.testing.assert_array_equal(features.body.input_values, before)
+
+
+@pytest.mark.parametrize("mirror, left, right", [(False, 0.7, 0.1), (True, 0.1, 0.7)])
+def test_read_hands(mirror, left, right):
+    features = _features(mirror)
+    features.read_hands(_hands(("Left", 0.3), ("Right", 0.9)))
+    assert features.hands.input_values.tolist() == pytest.approx([left, right])
+
+    features.read_hands(None)
+    assert features.hands.input_values.tolist() == [0.0, 0.0]
@@ -0,0 +1,144 @@
+from pathlib import Path
+from types import SimpleNamespace
+import copy, json, os
+import pytest
+
+config = pytest.importorskip("src.utils.config", reason="LunaStudio dependencies")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def files(tmp_path, monkeypatch):
+    """Parsed config.json, usercfg.json and parameter.json, run from tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "Media/Assets").mkdir(parents=True)
+    (tmp_path / "Media/Assets/background.jpg").touch()
+    load = lambda path: json.loads((ROOT / path).read_text(encoding="utf-8"))
+    return (
+        load("Assets/config.json"),
+        load("config/usercfg.json"),
+        load("config/parameter.json"),
+    )
+
+
+def test_snapshot_of_shipped_config(files):
+    snapshot = config.build_snapshot(*files, version=3)
+    assert snapshot.version == 3
+    assert snapshot.cap_fps == config.CapFPS(True, 30)
+    with pytest.raises(TypeError):
+        snapshot.user["display"] = [1, 1]
+
+
+def test_snapshot_rejects_mapping_that_does_not_compile(files):
+    user, internal, parameter = files
+    parameter["MAPPINGS"][0] = {"input": "yaw", "target": "AngleX", "curve": "ease"}
+    with pytest.raises(ValueError):
+        config.build_snapshot(user, internal, parameter)
+
+
+def test_snapshot_rejects_unmirrorable_indices(files):
+    user, internal, parameter = files
+    parameter["MIRROR"] = "landmarks"
+    parameter["LIP"] = parameter["LIP"] + [2]
+    with pytest.raises(ValueError, match="mirror partner"):
+        config.build_snapshot(user, internal, parameter)
+    parameter["MIRROR"] = "pixels"
+    config.build_snapshot(user, internal, parameter)
+
+
+def test_reload_keeps_previous_mappings(files):
+    from src.render.capture import Capture
+    from src.render.parameter import ParameterManager
+
+    parameter = files[2]
+    app = SimpleNamespace(running=True)
+    manager = ParameterManager(app)
+    manager.compile_mappings(parameter)
+    manager.compile_body_mappings(parameter)
+    mapping, body = manager.mapping, manager.body
+
+    broken = copy.deepcopy(parameter)
+    broken["BODY_MAPPINGS"] = [{"input": "yaw", "target": "BodyAngleX", "gamma": 2}]
+    assert Capture._reload_parameter(manager, broken, "pixels", parameter) is parameter
+    assert app.running
+    assert manager.mapping is mapping and manager.body is body
+
+    assert Capture._reload_parameter(manager, parameter, "pixels", None) is parameter
+    assert manager.mapping is not mapping
+
+
+def _wait(predicate, timeout=2.0):
+    import time
+
+    end = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < end:
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "usercfg.json"
+    path.write_text('{"a": 0}', encoding="utf-8")
+    return config.JSONStore(str(path), debounce=0.05, max_delay=0.5)
+
+
+def _on_disk(store):
+    with open(store.path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_store_serves_updates_before_the_write(store):
+    store.modify(lambda data: data.update(a=1))
+    assert store.read() == {"a": 1}
+    assert _on_disk(store) == {"a": 0}
+    assert _wait(lambda: store.writes == 1)
+    assert _on_disk(store) == {"a": 1}
+
+
+def test_store_coalesces_quick_updates(store):
+    for i in range(20):
+        store.modify(lambda data, i=i: data.update(a=i))
+    assert _wait(lambda: store.writes >= 1)
+    assert _wait(lambda: _on_disk(store) == {"a": 19})
+    assert store.updates == 20 and store.writes < 20
+
+
+def test_store_skips_unchanged(store):
+    store.modify(lambda data: False)
+    store.flush()
+    assert store.updates == 0 and store.writes == 0
+
+
+def test_store_flush_writes_now(store):
+    store.debounce = 60.0
+    store.modify(lambda data: data.update(b=[1, 2]))
+    store.flush()
+    assert _on_disk(store) == {"a": 0, "b": [1, 2]}
+    assert not os.path.exists(f"{store.path}.tmp")
+
+
+def test_failed_write_keeps_the_old_file(store, monkeypatch):
+    store.debounce = 60.0
+    store.modify(lambda data: data.update(a=2))
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(config.os, "replace", fail)
+    store.flush()
+    assert _on_disk(store) == {"a": 0}
+    assert store.writes == 0
+
+    monkeypatch.undo()
+    store.flush()
+    assert _on_disk(store) == {"a": 2}
+
+
+def test_store_reloads_external_edits(store):
+    assert store.read() == {"a": 0}
+    with open(store.path, "w", encoding="utf-8") as file:
+        file.write('{"a": 5, "edited": true}')
+    os.utime(store.path, ns=(1, 1))
+    assert store.read() == {"a": 5, "edited": True}
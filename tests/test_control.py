@@ -0,0 +1,116 @@
+import json, types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+control = pytest.importorskip("src.render.control", reason="LunaStudio dependencies")
+
+
+def _server(**settings):
+    app = types.SimpleNamespace(expressions=None, running=True)
+    return control.ControlServer(app, settings)
+
+
+def _request(server, message_type, data=None, **fields):
+    request = {
+        "apiName": control.API_NAME,
+        "apiVersion": control.API_VERSION,
+        "requestID": "r1",
+        "messageType": message_type,
+        "data": data,
+        **fields,
+    }
+    return json.loads(server.handle(json.dumps(request)))
+
+
+def _inject(server, values, mode="set"):
+    data = {"mode": mode, "parameterValues": values}
+    return _request(server, "InjectParameterDataRequest", data)
+
+
+def _mapping(**inputs):
+    return types.SimpleNamespace(
+        inputs=list(inputs), input_values=np.array(list(inputs.values()), float)
+    )
+
+
+def test_set_and_add_overlay_inputs():
+    server = _server()
+    response = _inject(server, [{"id": "AngleX", "value": 10}])
+    assert response["messageType"] == "InjectParameterDataResponse"
+    assert response["requestID"] == "r1"
+    _inject(server, [{"id": "AngleY", "value": 2}], mode="add")
+
+    mapping = _mapping(AngleX=0.0, AngleY=1.0)
+    server.apply_inputs(mapping, now=0.0)
+    assert mapping.input_values.tolist() == [10.0, 3.0]
+
+
+def test_weight_is_clamped():
+    server = _server()
+    _inject(
+        server,
+        [
+            {"id": "AngleX", "value": 10, "weight": 5},
+            {"id": "AngleY", "value": 10, "weight": -1},
+            {"id": "ParamCheek", "value": 1, "weight": 0.5},
+        ],
+    )
+    assert server.inputs["AngleX"][1] == 1.0
+    assert server.inputs["AngleY"][1] == 0.0
+    assert server.overrides["ParamCheek"][1] == 0.5
+
+    mapping = _mapping(AngleX=0.0, AngleY=4.0)
+    server.apply_inputs(mapping, now=0.0)
+    assert mapping.input_values.tolist() == [10.0, 4.0]
+
+
+def test_values_expire_without_refresh():
+    server = _server(hold=0.5)
+    _inject(server, [{"id": "AngleX", "value": 10}, {"id": "ParamA", "value": 1}])
+    expires = server.inputs["AngleX"][3]
+
+    mapping = _mapping(AngleX=0.0)
+    server.apply_inputs(mapping, now=expires + 0.01)
+    assert mapping.input_values.tolist() == [0.0]
+    assert server.inputs == {}
+
+    model = types.SimpleNamespace(SetParameterValue=pytest.fail)
+    server.apply(model, now=expires + 0.01)
+    assert server.overrides == {}
+
+
+@pytest.mark.parametrize(
+    "message, error_id",
+    [
+        ("{not json", 3),
+        (json.dumps({"apiName": "Other", "messageType": "APIStateRequest"}), 1),
+        (json.dumps({"apiName": control.API_NAME, "messageType": "NopeRequest"}), 2),
+    ],
+)
+def test_malformed_messages(message, error_id):
+    server = _server()
+    response = json.loads(server.handle(message))
+    assert response["messageType"] == "APIError"
+    assert response["data"]["errorID"] == error_id
+    assert server.errors == 1
+
+
+@pytest.mark.parametrize(
+    "data, error_id",
+    [
+        ({"parameterValues": [{"id": "AngleX"}]}, 3),
+        ({"parameterValues": [{"id": "AngleX", "value": "x"}]}, 3),
+        ({"parameterValues": [{"id": "AngleX", "value": float("nan")}]}, 3),
+        ({"parameterValues": [{"id": "AngleX", "value": float("inf")}]}, 3),
+        ({"parameterValues": [{"id": "AngleX", "value": 1, "weight": "nan"}]}, 3),
+        ({"parameterValues": [{"id": "AngleX", "value": 1}], "mode": "mul"}, 4),
+        ({}, 3),
+    ],
+)
+def test_malformed_injections_are_rejected(data, error_id):
+    server = _server()
+    response = _request(server, "InjectParameterDataRequest", data)
+    assert response["messageType"] == "APIError"
+    assert response["data"]["errorID"] == error_id
+    assert server.inputs == {} and server.values == 0
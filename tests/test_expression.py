@@ -0,0 +1,133 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+expression = pytest.importorskip(
+    "src.render.expression", reason="LunaStudio dependencies"
+)
+bake_segments = expression.bake_segments
+
+
+def _bake(segments, times):
+    return bake_segments(segments, np.asarray(times, dtype=np.float64)).tolist()
+
+
+def _write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def test_linear_segment():
+    assert _bake([0, 0, 0, 1, 10], [0, 0.25, 0.5, 1]) == pytest.approx([0, 2.5, 5, 10])
+
+
+def test_bezier_segment_meets_its_endpoints():
+    # Control points on the straight line make the bezier linear in value
+    segments = [0, 0, 1, 1 / 3, 1, 2 / 3, 2, 1, 3]
+    assert _bake(segments, [0, 0.5, 1]) == pytest.approx([0, 1.5, 3])
+
+
+def test_stepped_segment_jumps_at_the_end():
+    assert _bake([0, 1, 2, 1, 5], [0, 0.5, 0.99, 1]) == [1, 1, 1, 5]
+
+
+def test_inverse_stepped_segment_jumps_at_the_start():
+    assert _bake([0, 1, 3, 1, 5], [0, 0.01, 0.5, 1]) == [1, 5, 5, 5]
+
+
+def test_values_are_held_before_and_after_the_curve():
+    assert _bake([1, 2, 0, 2, 4], [0, 0.5, 1, 2, 3]) == pytest.approx([2, 2, 2, 4, 4])
+
+
+def test_segments_are_chained():
+    segments = [0, 0, 0, 1, 1, 2, 2, 3]
+    assert _bake(segments, [0, 0.5, 1, 1.5, 2]) == pytest.approx([0, 0.5, 1, 1, 3])
+
+
+def test_unknown_segment_type_is_rejected():
+    with pytest.raises(ValueError):
+        _bake([0, 0, 7, 1, 1], [0])
+
+
+def test_parse_expression(tmp_path):
+    path = _write(
+        tmp_path,
+        "smile.exp3.json",
+        {
+            "FadeInTime": 0.2,
+            "Parameters": [
+                {"Id": "ParamMouthForm", "Value": 1},
+                {"Id": "ParamEyeLSmile", "Value": 0.5, "Blend": "Multiply"},
+            ],
+        },
+    )
+    parsed = expression.parse_expression(path)
+    assert parsed.name == "smile"
+    assert parsed.ids == ("ParamMouthForm", "ParamEyeLSmile")
+    assert parsed.values.tolist() == [1.0, 0.5]
+    assert parsed.blend.tolist() == [expression.BLEND_ADD, expression.BLEND_MULTIPLY]
+    assert parsed.fade_in == pytest.approx(0.2)
+    assert parsed.fade_out == 1.0
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"Parameters": [{"Value": 1}]},
+        {"Parameters": [{"Id": "ParamA", "Blend": "Screen"}]},
+        {"Parameters": [{"Id": "ParamA", "Value": "1"}]},
+        {"FadeInTime": None},
+    ],
+)
+def test_parse_expression_rejects_malformed(tmp_path, data):
+    with pytest.raises(ValueError):
+        expression.parse_expression(_write(tmp_path, "bad.exp3.json", data))
+
+
+def test_parse_motion_bakes_parameter_curves(tmp_path):
+    path = _write(
+        tmp_path,
+        "wave.motion3.json",
+        {
+            "Meta": {"Duration": 1.0, "Loop": True},
+            "Curves": [
+                {"Target": "Parameter", "Id": "ParamA", "Segments": [0, 0, 0, 1, 1]},
+                {"Target": "PartOpacity", "Id": "PartB", "Segments": [0, 1]},
+            ],
+        },
+    )
+    motion = expression.parse_motion(path)
+    assert motion.name == "wave"
+    assert motion.ids == ("ParamA",)
+    assert motion.loop
+    assert motion.table.shape == (expression.BAKE_FPS + 1, 1)
+    assert motion.table[0, 0] == 0.0
+    assert motion.table[-1, 0] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"Meta": {"Duration": 0}},
+        {"Meta": {"Duration": "1"}},
+        {"Meta": {"Duration": 1}, "Curves": [{"Target": "Parameter", "Id": "A"}]},
+        {
+            "Meta": {"Duration": 1},
+            "Curves": [{"Target": "Parameter", "Segments": [0, 1]}],
+        },
+    ],
+)
+def test_parse_motion_rejects_malformed(tmp_path, data):
+    with pytest.raises(ValueError):
+        expression.parse_motion(_write(tmp_path, "bad.motion3.json", data))
+
+
+def test_latencies_are_bounded():
+    player = expression.ExpressionPlayer(expression.ExpressionLibrary())
+    for i in range(player.LATENCY_SAMPLES + 10):
+        player._pending.append(float(i))
+        player.presented(i + 0.01)
+    assert len(player.latencies) == player.LATENCY_SAMPLES
+    assert player.stats()["triggers"] == player.LATENCY_SAMPLES + 10
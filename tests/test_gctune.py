@@ -0,0 +1,38 @@
+import gc, threading
+import pytest
+
+gctune = pytest.importorskip("src.utils.gctune", reason="LunaStudio dependencies")
+
+
+@pytest.fixture
+def tuner():
+    thresholds = gc.get_threshold()
+    tuner = gctune.GCTuner()
+    yield tuner
+    gc.callbacks.remove(tuner._on_gc)
+    gc.set_threshold(*thresholds)
+    gc.unfreeze()
+
+
+def test_requested_freeze_runs_on_idle_thread(tuner, monkeypatch):
+    frozen = []
+    monkeypatch.setattr(
+        tuner, "freeze", lambda label: frozen.append((label, threading.get_ident()))
+    )
+    worker = threading.Thread(target=tuner.request_freeze, args=("landmarker",))
+    worker.start()
+    worker.join()
+    assert frozen == []
+
+    tuner.idle()
+    assert frozen == [("landmarker", threading.get_ident())]
+    tuner.idle()
+    assert len(frozen) == 1
+
+
+def test_freeze_is_not_counted_as_a_pause(tuner):
+    tuner.freeze("test")
+    assert gc.get_freeze_count() > 0
+    assert tuner.collections == [0, 0, 0]
+    gc.collect()
+    assert tuner.collections[2] == 1
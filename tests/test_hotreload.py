@@ -0,0 +1,66 @@
+import json, os
+import pytest
+
+hotreload = pytest.importorskip(
+    "src.render.hotreload", reason="LunaStudio dependencies"
+)
+
+
+@pytest.fixture
+def model(tmp_path):
+    files = {
+        "m.moc3": b"MOC3" + bytes(60),
+        "m.physics3.json": b"{}",
+        "tex/t0.png": bytes(100),
+        "exp/smile.exp3.json": b"{}",
+        "mot/idle.motion3.json": b"{}",
+    }
+    for name, data in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    spec = {
+        "Version": 3,
+        "FileReferences": {
+            "Moc": "m.moc3",
+            "Physics": "m.physics3.json",
+            "Textures": ["tex/t0.png"],
+            "Expressions": [{"Name": "smile", "File": "exp/smile.exp3.json"}],
+            "Motions": {"Idle": [{"File": "mot/idle.motion3.json"}]},
+        },
+    }
+    model_json = tmp_path / "m.model3.json"
+    model_json.write_text(json.dumps(spec), encoding="utf-8")
+    return model_json, files
+
+
+def test_referenced_files(model):
+    model_json, files = model
+    watcher = hotreload.ModelWatcher(model_json)
+    expected = {os.path.normpath(model_json.parent / name) for name in files}
+    assert set(map(str, watcher._referenced_files())) == expected | {str(model_json)}
+
+
+def test_full_reload_is_prefetched(model):
+    model_json, files = model
+    watcher = hotreload.ModelWatcher(model_json, settle=0.01)
+    physics = model_json.parent / "m.physics3.json"
+    physics.write_bytes(b'{"Version": 3}')
+    os.utime(physics, ns=(1, 1))
+
+    assert watcher.poll()
+    change = watcher.pending.popleft()
+    assert change.full and change.kinds == {"physics"}
+    sizes = sum(len(data) for data in files.values()) + len(b'{"Version": 3}') - 2
+    assert change.prefetched == sizes + model_json.stat().st_size
+
+
+def test_broken_file_is_rejected(model):
+    model_json, _ = model
+    watcher = hotreload.ModelWatcher(model_json, settle=0.01)
+    physics = model_json.parent / "m.physics3.json"
+    physics.write_bytes(b'{"Version": ')
+    os.utime(physics, ns=(1, 1))
+
+    assert not watcher.poll()
+    assert watcher.rejected == 1 and not watcher.pending
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+latency = pytest.importorskip("src.utils.latency", reason="LunaStudio dependencies")
+LatencyTracker = latency.LatencyTracker
+
+
+def _frame(tracker, start, video_time, end_to_end, value):
+    """One sample through every stage, 1 ms apart, flipped `end_to_end` later."""
+    sample_id = tracker.begin(start, video_time)
+    for i, stage in enumerate(LatencyTracker.STAGES[1:-1], 1):
+        tracker.mark(sample_id, stage, now=start + i * 0.001)
+    tracker.flipped(sample_id, value, now=start + end_to_end)
+    return sample_id
+
+
+def test_mark_keeps_the_first_stamp():
+    tracker = LatencyTracker(capacity=4)
+    sample_id = tracker.begin(1.0)
+    tracker.mark(sample_id, "inference", now=1.5)
+    tracker.mark(sample_id, "inference", now=2.0)
+    tracker.mark(-1, "inference", now=3.0)  # no sample: ignored
+    assert tracker.samples[sample_id, 1] == 1.5
+
+
+def test_report(tmp_path):
+    tracker = LatencyTracker(capacity=8, onsets=[0.1], threshold=2.0)
+    for i, (e2e, value) in enumerate([(0.02, 0.0), (0.03, 0.0), (0.04, 0.0)]):
+        _frame(tracker, 10.0 + i / 30, i / 30, e2e, value)
+    # The onset frame's motion reaches the screen one flip later
+    onset_id = _frame(tracker, 10.1, 0.1, 0.02, 0.5)
+    tracker.flipped(onset_id, 5.0, now=10.145)
+
+    path = tmp_path / "latency.json"
+    report = tracker.report(str(path))
+    assert json.loads(path.read_text(encoding="utf-8")) == report
+
+    assert report["frames_captured"] == report["frames_shown"] == 4
+    e2e = report["end_to_end"]
+    assert e2e["count"] == 4
+    assert e2e["p50_ms"] == pytest.approx(25.0)
+    assert e2e["max_ms"] == pytest.approx(40.0)
+    assert report["stages"]["inference"]["mean_ms"] == pytest.approx(1.0)
+    assert report["stages"]["flip"]["max_ms"] == pytest.approx(36.0)
+
+    assert report["onsets"] == [{"onset_s": 0.1, "latency_ms": pytest.approx(45.0)}]
+    assert report["motion_to_photon"]["count"] == 1
+
+
+def test_onset_without_motion_has_no_latency(tmp_path):
+    tracker = LatencyTracker(capacity=8, onsets=[0.05, 5.0])
+    for i in range(4):
+        _frame(tracker, 10.0 + i / 30, i / 30, 0.02, 1.0)
+    report = tracker.report(str(tmp_path / "latency.json"))
+    # Onset past the end of the video is dropped; the other never moved
+    assert report["onsets"] == [{"onset_s": 0.05, "latency_ms": None}]
+    assert report["motion_to_photon"] == {"count": 0}
+
+
+def test_ring_wraps_to_capacity(tmp_path):
+    tracker = LatencyTracker(capacity=2)
+    for i in range(5):
+        _frame(tracker, float(i), float(i), 0.01, 0.0)
+    report = tracker.report(str(tmp_path / "latency.json"))
+    assert report["frames_captured"] == 5
+    assert report["end_to_end"]["count"] == 2
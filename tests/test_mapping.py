@@ -0,0 +1,123 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+mapping = pytest.importorskip(
+    "src.render.module.mapping", reason="LunaStudio dependencies"
+)
+MappingPipeline = mapping.MappingPipeline
+
+
+def _evaluate(spec, values, constants=None):
+    pipeline = MappingPipeline(spec, constants)
+    pipeline.load(values)
+    return dict(zip(pipeline.targets, pipeline.evaluate().tolist()))
+
+
+def test_compile_collects_inputs_and_targets():
+    pipeline = MappingPipeline(
+        [
+            {"input": "yaw", "target": "AngleX"},
+            {"input": {"yaw": 0.5, "roll": 0.5}, "target": "BodyAngleX"},
+            {"constant": 1, "target": "Param14"},
+        ]
+    )
+    assert pipeline.inputs == ["yaw", "roll"]
+    assert pipeline.targets == ["AngleX", "BodyAngleX", "Param14"]
+    assert pipeline.output.shape == (3,)
+
+
+def test_range_output_and_passthrough():
+    out = _evaluate(
+        [
+            {"input": "yaw", "target": "AngleX", "range": [-30, 30], "output": [-1, 1]},
+            {"input": "mouth", "target": "MouthOpenY", "range": [0.1, 0.5]},
+            {"input": "yaw", "target": "Raw"},
+        ],
+        {"yaw": 15.0, "mouth": 0.9},
+    )
+    assert out["AngleX"] == pytest.approx(0.5, abs=1e-2)
+    assert out["MouthOpenY"] == pytest.approx(1.0)
+    assert out["Raw"] == pytest.approx(15.0)
+
+
+def test_named_range_bounds():
+    spec = [{"input": "eye", "target": "EyeLOpen", "range": ["MIN", "MAX"]}]
+    out = _evaluate(spec, {"eye": 0.3}, {"MIN": 0.2, "MAX": 0.4})
+    assert out["EyeLOpen"] == pytest.approx(0.5, abs=1e-2)
+
+
+def test_curve_step_clamp_and_constant():
+    out = _evaluate(
+        [
+            {"input": "x", "target": "Curve", "range": [0, 1], "curve": "ease_in"},
+            {"input": "x", "target": "Step", "range": [0, 1], "step": 0.25},
+            {"input": "x", "target": "Clamp", "clamp": [0, 0.4]},
+            {"constant": 2.5, "target": "Constant"},
+        ],
+        {"x": 0.6},
+    )
+    assert out["Curve"] == pytest.approx(0.36, abs=1e-2)
+    assert out["Step"] == pytest.approx(0.5)
+    assert out["Clamp"] == pytest.approx(0.4)
+    assert out["Constant"] == 2.5
+
+
+def test_weighted_inputs():
+    spec = [{"input": {"a": 0.25, "b": 0.75}, "target": "Mix"}]
+    assert _evaluate(spec, {"a": 4.0, "b": 8.0})["Mix"] == pytest.approx(7.0)
+
+
+def test_shaping_without_range_is_rejected():
+    for key, value in (("curve", "smoothstep"), ("gamma", 2.0), ("output", [0, 2])):
+        with pytest.raises(ValueError, match=key):
+            MappingPipeline([{"input": "x", "target": "X", key: value}])
+
+
+def test_unknown_curve_is_rejected():
+    with pytest.raises(ValueError):
+        MappingPipeline([{"input": "x", "target": "X", "range": [0, 1], "curve": "?"}])
+
+
+def test_bounds():
+    pipeline = MappingPipeline(
+        [
+            {"input": "x", "target": "A", "range": [0, 1], "output": [1, -1]},
+            {"input": "x", "target": "B"},
+            {"input": "x", "target": "C", "clamp": [-2, 2]},
+            {"constant": 3, "target": "D"},
+        ]
+    )
+    lo, hi = pipeline.bounds()
+    assert lo.tolist() == [-1.0, -np.inf, -2.0, 3.0]
+    assert hi.tolist() == [1.0, np.inf, 2.0, 3.0]
+
+
+def test_nan_input_does_not_spread():
+    pipeline = MappingPipeline(
+        [
+            {"input": "yaw", "target": "AngleX"},
+            {"input": {"yaw": 0.5, "pitch": 0.5}, "target": "Mix"},
+            {"input": "pitch", "target": "AngleY"},
+        ]
+    )
+    out = pipeline.evaluate(np.array([np.nan, 4.0], dtype=np.float32))
+    assert np.isfinite(out).all()
+    assert out.tolist() == [0.0, 2.0, 4.0]
+    assert np.isnan(pipeline.input_values).sum() == 0
+
+
+def test_tracked_model_mappings_drops_unfed_rows():
+    from src.render.parameter import tracked_model_mappings
+
+    landmarks = {
+        t["target"] for t in tracked_model_mappings(mapping.DEFAULT_MODEL_MAPPINGS, {})
+    }
+    assert {"ParamAngleX", "ParamBustX", "ParamBaseX", "Param14"} <= landmarks
+    assert not {"ParamBrowLY", "ParamCheek", "ParamEyeBallY"} & landmarks
+
+    data = {"FEATURE_SOURCE": "blendshapes"}
+    blendshapes = {
+        t["target"]
+        for t in tracked_model_mappings(mapping.DEFAULT_MODEL_MAPPINGS, data)
+    }
+    assert {"ParamBrowLY", "ParamCheek", "ParamEyeBallY"} <= blendshapes
@@ -0,0 +1,33 @@
+from benchmarks.memory_baseline import compare, load_baseline
+
+
+def test_within_tolerance():
+    ok, message = compare({"steady_rss_mb": 105.0}, {"steady_rss_mb": 100.0})
+    assert ok is True
+    assert message.startswith("OK")
+
+
+def test_regression():
+    ok, message = compare({"steady_rss_mb": 111.0}, {"steady_rss_mb": 100.0})
+    assert ok is False
+    assert message.startswith("REGRESSION")
+
+
+def test_tolerance_override():
+    baseline = {"steady_rss_mb": 100.0, "tolerance": 0.2}
+    assert compare({"steady_rss_mb": 115.0}, baseline)[0] is True
+    assert compare({"steady_rss_mb": 115.0}, baseline, tolerance=0.1)[0] is False
+
+
+def test_report_without_steady_samples_fails():
+    assert compare({"steady_rss_mb": None}, {"steady_rss_mb": 100.0})[0] is False
+
+
+def test_unrecorded_baseline_is_not_a_regression():
+    assert compare({"steady_rss_mb": 500.0}, {"steady_rss_mb": None})[0] is None
+
+
+def test_committed_baseline_is_valid():
+    baseline = load_baseline()
+    assert set(baseline) >= {"steady_rss_mb", "tolerance"}
+    assert 0 < baseline["tolerance"] < 1
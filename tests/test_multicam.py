@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+import pytest
+
+np = pytest.importorskip("numpy")
+multicam = pytest.importorskip("src.render.multicam", reason="LunaStudio dependencies")
+from src.render.module.param import Params
+
+ANGLE_X = Params.PARAMETER_KEYS.index("AngleX")
+PARAMETER = Path(__file__).resolve().parent.parent / "config/parameter.json"
+
+
+def test_plan_cores():
+    assert multicam.plan_cores(2, [0, 1, 2, 3, 4]) == [[1, 2], [3, 4]]
+    assert multicam.plan_cores(3, [0, 1]) == [[0], [1], [0]]
+    assert multicam.plan_cores(1, [0]) == [[0]]
+
+
+def test_parse_source():
+    assert multicam.parse_source("1")["source"] == 1
+    entry = multicam.parse_source({"source": "clip.mp4", "route": "vmc", "port": 9})
+    assert entry == {"source": "clip.mp4", "route": "vmc", "port": 9, "yaw_offset": 0.0}
+    with pytest.raises(ValueError):
+        multicam.parse_source({"source": 0, "route": "avatar"})
+
+
+@pytest.fixture
+def capture():
+    data = json.loads(PARAMETER.read_text(encoding="utf-8"))
+    capture = multicam.MultiCapture([0, 1], data, {"hysteresis": 5.0, "stale_ms": 250})
+    yield capture
+    capture.close()
+
+
+def _publish(slot, now, yaw, face=True):
+    values = np.zeros(len(Params.PARAMETER_KEYS))
+    values[ANGLE_X] = yaw
+    multicam._publish(slot.view, now, face, 1, 1, values)
+    assert slot.read(now)
+
+
+def test_slot_reads_each_sample_once(capture):
+    slot = capture.slots[0]
+    assert not slot.read(0.0)
+    _publish(slot, 1.0, 12.0)
+    assert slot.values[ANGLE_X] == 12.0 and slot.timestamp == 1.0
+    assert not slot.read(1.0)
+
+
+def test_frontal_fusion_with_hysteresis(capture):
+    a, b = capture.slots
+    _publish(a, 10.0, 20.0)
+    _publish(b, 10.0, 2.0)
+    capture.active = capture._choose(10.0)
+    assert capture.active is b
+
+    # a is now more frontal, but not by more than the hysteresis
+    _publish(a, 10.1, 1.0)
+    _publish(b, 10.1, 5.0)
+    assert capture._choose(10.1) is b
+    _publish(b, 10.2, 8.0)
+    assert capture._choose(10.2) is a
+
+
+def test_stale_and_faceless_sources_are_skipped(capture):
+    a, b = capture.slots
+    _publish(a, 10.0, 0.0)
+    _publish(b, 10.3, 10.0)
+    assert capture._choose(10.3) is b
+    _publish(b, 10.4, 10.0, face=False)
+    assert capture._choose(10.4) is None
+
+
+class _Process:
+    def __init__(self, alive, exitcode=None):
+        self.alive, self.exitcode = alive, exitcode
+
+    def is_alive(self):
+        return self.alive
+
+
+def test_supervisor_fails_once_no_tracker_is_alive(capture):
+    failures = []
+    supervisor = type("Supervisor", (), {"fail": lambda self, *a: failures.append(a)})
+    a, b = capture.slots
+    a.process, b.process = _Process(False, 1), _Process(True)
+    capture._check_processes(supervisor())
+    assert a.exited and not b.exited and failures == []
+
+    b.process = _Process(False, 0)
+    capture._check_processes(supervisor())
+    capture._check_processes(supervisor())
+    assert len(failures) == 1
+    a.process = b.process = None
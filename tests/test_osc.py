@@ -0,0 +1,58 @@
+import pytest
+
+osc = pytest.importorskip("src.utils.osc", reason="LunaStudio dependencies")
+
+
+def test_message_round_trip():
+    data = osc.encode_message("/VMC/Ext/Blend/Val", "MouthOpenY", 0.25)
+    assert len(data) % 4 == 0
+    assert osc.decode_message(data) == ("/VMC/Ext/Blend/Val", ["MouthOpenY", 0.25])
+
+
+def test_argument_types_round_trip():
+    data = osc.encode_message("/a", 7, -3, "abc", "abcd", True, False, b"\x01\x02\x03")
+    address, args = osc.decode_message(data)
+    assert address == "/a"
+    assert args == [7, -3, "abc", "abcd", True, False, b"\x01\x02\x03"]
+
+
+def test_float_is_single_precision():
+    _, (value,) = osc.decode_message(osc.encode_message("/t", 0.1))
+    assert value == pytest.approx(0.1, abs=1e-7)
+    assert value != 0.1
+
+
+def test_message_without_arguments():
+    assert osc.decode_message(osc.encode_message("/VMC/Ext/Blend/Apply")) == (
+        "/VMC/Ext/Blend/Apply",
+        [],
+    )
+
+
+def test_bundle_round_trip():
+    messages = [
+        osc.encode_message("/VMC/Ext/OK", 1),
+        osc.encode_message("/VMC/Ext/T", 1.5),
+        osc.encode_message("/VMC/Ext/Blend/Apply"),
+    ]
+    bundle = osc.encode_bundle(messages)
+    assert bundle.startswith(osc.BUNDLE_TAG)
+    assert osc.decode_packet(bundle) == [
+        ("/VMC/Ext/OK", [1]),
+        ("/VMC/Ext/T", [1.5]),
+        ("/VMC/Ext/Blend/Apply", []),
+    ]
+
+
+def test_nested_bundle_is_flattened():
+    inner = osc.encode_bundle([osc.encode_message("/b", 2)])
+    outer = osc.encode_bundle([osc.encode_message("/a", 1), inner])
+    assert osc.decode_packet(outer) == [("/a", [1]), ("/b", [2])]
+
+
+def test_unsupported_types():
+    with pytest.raises(TypeError):
+        osc.encode_message("/a", None)
+    data = osc.encode_string("/a") + osc.encode_string(",d") + b"\0" * 8
+    with pytest.raises(ValueError):
+        osc.decode_message(data)
@@ -0,0 +1,87 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+param = pytest.importorskip("src.render.module.param", reason="LunaStudio dependencies")
+Params = param.Params
+
+ANGLE_X = Params.PARAMETER_KEYS.index("AngleX")
+EYE_L = Params.PARAMETER_KEYS.index("EyeLOpen")
+
+
+def _moving(params, speed=10.0, frames=4, start=0.0):
+    """AngleX moving at `speed` per second, sampled at 30 Hz."""
+    for i in range(frames):
+        t = start + i / 30
+        params.set_targets(["AngleX"], [speed * t], timestamp=t)
+    return start + (frames - 1) / 30
+
+
+def test_prediction_off_returns_targets():
+    params = Params(predict=False)
+    last = _moving(params)
+    out = params.predict_targets(last + 0.05)
+    np.testing.assert_array_equal(out, params.target)
+
+
+def test_linear_motion_is_extrapolated():
+    params = Params(predict=True, horizon=0.1, damping=1.0)
+    last = _moving(params)
+    out = params.predict_targets(last + 0.05)
+    assert out[ANGLE_X] == pytest.approx(10.0 * (last + 0.05))
+    assert out[EYE_L] == params.target[EYE_L]
+
+
+def test_lead_is_damped_and_capped_at_horizon():
+    params = Params(predict=True, horizon=0.1, damping=0.5)
+    last = _moving(params)
+    current = params.target[ANGLE_X]
+    assert params.predict_targets(last + 1.0)[ANGLE_X] == pytest.approx(
+        current + 10.0 * 0.1 * 0.5
+    )
+    assert params.predict_targets(last - 1.0)[ANGLE_X] == pytest.approx(current)
+
+
+def test_needs_two_samples():
+    params = Params(predict=True)
+    params.set_targets(["AngleX"], [5.0], timestamp=0.0)
+    assert params.predict_targets(0.05)[ANGLE_X] == 5.0
+
+
+def test_prediction_is_clipped_to_limits():
+    params = Params(predict=True, horizon=0.1, damping=1.0)
+    params.set_limits(["AngleX", "EyeLOpen"], [-30.0, 0.0], [30.0, 1.0])
+    last = _moving(params, speed=290.0)
+    assert params.predict_targets(last + 0.1)[ANGLE_X] == 30.0
+
+
+def test_reopening_eye_is_not_extrapolated_past_open():
+    params = Params(predict=True, horizon=0.1, damping=1.0)
+    params.set_limits(["EyeLOpen"], [0.0], [1.0])
+    for i, value in enumerate((0.1, 0.4, 0.7, 1.0)):
+        params.set_targets(["EyeLOpen"], [value], timestamp=i / 30)
+    assert params.predict_targets(3 / 30 + 0.1)[EYE_L] == 1.0
+
+
+def test_set_limits_unions_repeated_keys():
+    params = Params(predict=True, horizon=0.1, damping=1.0)
+    params.set_limits(["AngleX", "AngleX", "Unknown"], [-1.0, -5.0, 0], [2.0, 1.0, 0])
+    last = _moving(params, speed=-300.0)
+    assert params.predict_targets(last + 0.1)[ANGLE_X] == -5.0
+
+
+def test_reserved_keys_ignore_other_owners():
+    params = Params()
+    params.reserve(["MouthOpenY"], "audio")
+    params.set_targets(["MouthOpenY", "AngleX"], [0.8, 3.0], owner="vmc")
+    params.set_targets(["MouthOpenY"], [0.5], owner="audio")
+    index = Params.PARAMETER_KEYS.index("MouthOpenY")
+    assert params.target[index] == 0.5
+    assert params.target[ANGLE_X] == 3.0
+
+
+def test_key_list_cache_is_bounded():
+    params = Params()
+    for i in range(200):
+        params.set_targets(["AngleX", f"extra{i}"], [float(i), 0.0])
+    assert len(params._target_index) <= 64
+    assert params.target[ANGLE_X] == 199.0
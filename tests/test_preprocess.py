@@ -0,0 +1,56 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+preprocess = pytest.importorskip(
+    "src.render.preprocess", reason="LunaStudio dependencies"
+)
+FramePreprocessor = preprocess.FramePreprocessor
+
+
+def _frame():
+    """2x3 BGR frame: blue left column, green middle, red right."""
+    frame = np.zeros((2, 3, 3), dtype=np.uint8)
+    frame[:, 0, 0] = 255
+    frame[:, 1, 1] = 255
+    frame[:, 2, 2] = 255
+    return frame
+
+
+@pytest.mark.parametrize(
+    "mirror, columns",
+    [
+        ("pixels", ["red", "green", "blue"]),
+        ("landmarks", ["blue", "green", "red"]),
+        ("none", ["blue", "green", "red"]),
+    ],
+)
+def test_output_is_rgb(mirror, columns):
+    rgb = {"red": [255, 0, 0], "green": [0, 255, 0], "blue": [0, 0, 255]}
+    out = FramePreprocessor(mirror).process(_frame())
+    assert out.flags["C_CONTIGUOUS"]
+    for x, color in enumerate(columns):
+        assert out[:, x].tolist() == [rgb[color]] * 2
+
+
+@pytest.mark.parametrize("mirror", FramePreprocessor.MODES)
+def test_buffers_are_reused(mirror):
+    preprocessor = FramePreprocessor(mirror)
+    first = preprocessor.process(_frame())
+    for _ in range(5):
+        assert preprocessor.process(_frame()) is first
+    stats = preprocessor.stats()
+    assert stats["frames"] == 6 and stats["allocations"] == 1
+
+
+def test_new_frame_size_reallocates_once():
+    preprocessor = FramePreprocessor()
+    preprocessor.process(_frame())
+    bigger = np.zeros((4, 6, 3), dtype=np.uint8)
+    out = preprocessor.process(bigger)
+    assert out.shape == bigger.shape
+    assert preprocessor.process(bigger) is out
+    assert preprocessor.stats()["allocations"] == 2
+
+
+def test_unknown_mode_falls_back_to_pixels():
+    assert FramePreprocessor("sideways").mirror == "pixels"
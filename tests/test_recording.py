@@ -0,0 +1,66 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+recording = pytest.importorskip(
+    "src.render.recording", reason="LunaStudio dependencies"
+)
+segments = recording.segments
+
+
+def _covered(ranges, frames):
+    """Frame indices each range tracks, with stop 0 meaning the end."""
+    return [i for a, b in ranges for i in range(a, b or frames)]
+
+
+@pytest.mark.parametrize("frames, length", [(0, 10), (10, 0), (5, 10), (10, 10)])
+def test_short_or_unknown_video_is_one_segment(frames, length):
+    assert segments(frames, length) == [(0, 0)]
+
+
+def test_even_split():
+    assert segments(30, 10) == [(0, 10), (10, 20), (20, 0)]
+
+
+def test_long_tail_gets_its_own_segment():
+    assert segments(33, 10) == [(0, 10), (10, 20), (20, 30), (30, 0)]
+
+
+def test_short_tail_is_folded_into_the_last_segment():
+    assert segments(31, 10) == [(0, 10), (10, 20), (20, 0)]
+
+
+@pytest.mark.parametrize("frames, length", [(1000, 90), (1801, 1800), (7, 2)])
+def test_segments_cover_every_frame_once(frames, length):
+    ranges = segments(frames, length)
+    assert _covered(ranges, frames) == list(range(frames))
+    assert ranges[-1][1] == 0
+
+
+def test_stream_round_trip(tmp_path):
+    stream = {
+        "t": np.linspace(0, 1, 5),
+        "values": np.arange(10, dtype=float).reshape(5, 2),
+        "keys": ["AngleX", "AngleY"],
+        "smoothed": False,
+    }
+    path = str(tmp_path / "take.npz")
+    recording.save_stream(stream, path)
+    loaded = recording.load_stream(path, {})
+    assert loaded["keys"] == stream["keys"]
+    assert loaded["smoothed"] is False
+    np.testing.assert_array_equal(loaded["t"], stream["t"])
+    np.testing.assert_array_equal(loaded["values"], stream["values"])
+
+
+@pytest.mark.parametrize(
+    "mirror, blendshapes, expected",
+    [
+        ("pixels", False, "pixels"),
+        ("none", False, "none"),
+        ("landmarks", False, "landmarks"),
+        ("landmarks", True, "pixels"),
+    ],
+)
+def test_offline_mirror_matches_live_capture(mirror, blendshapes, expected):
+    assert recording._mirror_mode({"MIRROR": mirror}, blendshapes) == expected
+    assert recording._mirror_mode({}, blendshapes) == "pixels"
@@ -0,0 +1,102 @@
+import types
+
+import pytest
+
+scheduler = pytest.importorskip(
+    "src.render.scheduler", reason="LunaStudio dependencies"
+)
+
+MS = 0.001
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+
+class _Landmarker:
+    """Takes `cost` seconds of fake time per run; results count the runs."""
+
+    def __init__(self, clock, cost):
+        self.clock, self.cost, self.runs = clock, cost, 0
+
+    def detect_for_video(self, image, timestamp_ms):
+        self.clock.now += self.cost
+        self.runs += 1
+        return self.runs
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(
+        scheduler, "time", types.SimpleNamespace(perf_counter=clock.perf_counter)
+    )
+    return clock
+
+
+def _schedule(clock, budget_ms, *models):
+    sched = scheduler.InferenceScheduler(budget_ms)
+    for name, every, cost in models:
+        sched.add(name, _Landmarker(clock, cost * MS), every)
+    return sched
+
+
+def _frames(sched, count):
+    return [sched.run(None, i * 33) for i in range(count)]
+
+
+def test_phases_are_staggered(clock):
+    sched = _schedule(clock, 100, ("face", 1, 5), ("pose", 2, 5), ("hands", 2, 5))
+    assert _frames(sched, 4) == [
+        ["face", "hands"],
+        ["face", "pose"],
+        ["face", "hands"],
+        ["face", "pose"],
+    ]
+
+
+def test_over_budget_model_is_deferred_then_forced(clock):
+    sched = _schedule(clock, 20, ("face", 1, 15), ("pose", 2, 10))
+    # Frame 1 learns the pose cost; frames 3 and 4 would exceed the budget
+    # and wait, frame 5 is a whole interval late and runs anyway
+    assert _frames(sched, 6) == [
+        ["face"],
+        ["face", "pose"],
+        ["face"],
+        ["face"],
+        ["face"],
+        ["face", "pose"],
+    ]
+    pose = sched.models[1]
+    assert (pose.deferred, pose.forced, pose.runs) == (2, 1, 2)
+    assert pose.cost == pytest.approx(10 * MS)
+    assert sched.stats()["over_budget_frames"] == 2
+
+
+def test_first_model_always_runs(clock):
+    # Nothing spent yet: even a model costlier than the budget runs
+    sched = _schedule(clock, 5, ("face", 1, 30))
+    assert _frames(sched, 3) == [["face"]] * 3
+    assert sched.models[0].deferred == 0
+
+
+def test_results_carry_forward(clock):
+    sched = _schedule(clock, 100, ("face", 1, 1), ("pose", 3, 1))
+    assert sched.result("pose") is None
+    seen = []
+    for i in range(5):
+        fresh = sched.run(None, i * 33)
+        seen.append((sched.result("face"), sched.result("pose"), "pose" in fresh))
+    # pose (phase 1) runs on frames 1 and 4 and is held in between
+    assert seen == [
+        (1, None, False),
+        (2, 1, True),
+        (3, 1, False),
+        (4, 1, False),
+        (5, 2, True),
+    ]
+    assert sched.result("unknown") is None
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+import socket
+import pytest
+
+supervisor = pytest.importorskip(
+    "src.utils.supervisor", reason="LunaStudio dependencies"
+)
+
+
+def _app():
+    return SimpleNamespace(running=True, power=None, supervisor=supervisor.Supervisor())
+
+
+def test_escaping_exception_is_recorded():
+    app = _app()
+
+    def crash():
+        raise RuntimeError("boom")
+
+    app.supervisor.start("Crash", crash).thread.join()
+    name, error = app.supervisor.failure
+    assert name == "Crash" and isinstance(error, RuntimeError)
+    assert app.supervisor.stopping.is_set()
+
+
+def test_first_failure_wins():
+    sup = supervisor.Supervisor()
+    sup.fail("A", "first")
+    sup.fail("B", "second")
+    assert sup.failure == ("A", "first")
+    assert sup.stopped_by == "A"
+
+
+def test_clean_stop_is_not_a_failure():
+    sup = supervisor.Supervisor()
+    sup.start("Idle", sup.stopping.wait)
+    sup.shutdown()
+    assert sup.failure is None
+
+
+def test_vmc_bind_failure_reaches_supervisor():
+    from src.render.vmc import VMCReceiver
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as taken:
+        taken.bind(("127.0.0.1", 0))
+        port = taken.getsockname()[1]
+        app = _app()
+        receiver = VMCReceiver(app, {"listen": "127.0.0.1", "port": port}, {})
+        app.supervisor.start("VMCThread", receiver.run, object()).thread.join(2)
+    assert app.supervisor.failure[0] == "VMCThread"
+    assert app.supervisor.stopping.is_set()
+
+
+def test_control_failure_reaches_supervisor():
+    # A taken port, or the websockets package missing
+    from src.render.control import ControlServer
+
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        port = taken.getsockname()[1]
+        app = _app()
+        server = ControlServer(app, {"host": "127.0.0.1", "port": port})
+        app.supervisor.start("ControlThread", server.run).thread.join(2)
+    assert app.supervisor.failure[0] == "ControlThread"
@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+import pytest
+
+np = pytest.importorskip("numpy")
+vmc = pytest.importorskip("src.render.vmc", reason="LunaStudio dependencies")
+from src.render.module.param import Params
+from src.utils.osc import decode_packet
+
+ANGLE_X = Params.PARAMETER_KEYS.index("AngleX")
+SOURCE = ("127.0.0.1", 39539)
+
+
+class _Wire:
+    def __init__(self):
+        self.datagrams = []
+
+    def sendto(self, datagram, address):
+        self.datagrams.append(datagram)
+
+
+class _Targets:
+    def __init__(self):
+        self.frames = []
+
+    def set_targets(self, keys, values, timestamp=None, weight=1.0, owner=None):
+        self.frames.append((timestamp, dict(zip(keys, values))["AngleX"]))
+
+
+@pytest.fixture
+def wire():
+    sender = vmc.VMCSender({})
+    sender.socket.close()
+    sender.socket = _Wire()
+
+    def send(timestamp, angle=0.0):
+        values = np.zeros(len(Params.PARAMETER_KEYS))
+        values[ANGLE_X] = angle
+        sender.send(values, timestamp)
+        return sender.socket.datagrams[-1]
+
+    return send
+
+
+@pytest.fixture
+def receiver():
+    app = SimpleNamespace(running=True, power=None)
+    return vmc.VMCReceiver(app, {"delay": 0.05}, {})
+
+
+def _sender_time(datagram):
+    return next(
+        args[0] for path, args in decode_packet(datagram) if path == "/VMC/Ext/T"
+    )
+
+
+def test_sender_time_keeps_precision_after_long_uptime(wire):
+    start = 3 * 86400.0
+    times = [_sender_time(wire(start + i / 60)) for i in range(4)]
+    assert times[0] == 0.0
+    assert np.diff(times) == pytest.approx([1 / 60] * 3, abs=1e-5)
+
+
+def test_sender_epoch_rebases(wire):
+    wire(0.0)
+    assert _sender_time(wire(vmc.EPOCH_SECONDS + 0.5)) == 0.0
+
+
+def test_jitter_buffer_plays_out_in_sender_order(wire, receiver):
+    frames = [wire(i / 60, angle=float(i)) for i in range(4)]
+    for i, arrival in enumerate([10.0, 10.04, 10.041, 10.06]):
+        receiver._handle(frames[i], SOURCE, arrival)
+    params = _Targets()
+
+    receiver._playout(params, 10.04)
+    assert params.frames == []
+    receiver._playout(params, 10.2)
+    timestamps, angles = zip(*params.frames)
+    assert angles == (0.0, 1.0, 2.0, 3.0)
+    assert list(timestamps) == sorted(timestamps)
+    # Played out one buffer delay after the fastest transit
+    assert timestamps[0] == pytest.approx(10.05)
+    assert timestamps[3] == pytest.approx(10.05 + 3 / 60, abs=1e-3)
+
+
+def test_jitter_buffer_drops_late_frames(wire, receiver):
+    frames = [wire(i / 60, angle=float(i)) for i in range(3)]
+    receiver._handle(frames[0], SOURCE, 10.0)
+    receiver._handle(frames[2], SOURCE, 10.03)
+    receiver._handle(frames[1], SOURCE, 10.031)
+    params = _Targets()
+    receiver._playout(params, 11.0)
+
+    assert [angle for _, angle in params.frames] == [0.0, 2.0]
+    stats = receiver.sources[SOURCE]
+    assert stats["late"] == 1
+    assert stats["frames"] == 2
+
+
+def test_jitter_buffer_counts_loss(wire, receiver):
+    frames = [wire(i / 60, angle=float(i)) for i in range(6)]
+    for i in (0, 1, 2, 5):
+        receiver._handle(frames[i], SOURCE, 10.0 + i / 60)
+    assert receiver.sources[SOURCE]["lost"] == 2
+
+
+def test_sender_restart_is_not_late(wire, receiver):
+    receiver._handle(wire(100.0), SOURCE, 10.0)
+    receiver._handle(wire(110.0, angle=1.0), SOURCE, 20.0)
+    receiver._handle(wire(100.0 + vmc.EPOCH_SECONDS, angle=5.0), SOURCE, 30.0)
+    params = _Targets()
+    receiver._playout(params, 31.0)
+
+    assert [angle for _, angle in params.frames] == [0.0, 1.0, 5.0]
+    assert receiver.sources[SOURCE]["late"] == 0